@@ -0,0 +1,432 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, ClassVar
+
+from chezmoi_mousse.named_tuples import CommandResult
+from chezmoi_mousse.scan_columns import ScanDirColumns
+from chezmoi_mousse.str_enums import LogString, ReadCmd, WriteCmd
+
+if TYPE_CHECKING:
+    from typing import Any, BinaryIO
+
+    from chezmoi_mousse.cm_types import (
+        ArchiveLocation,
+        CachedContents,
+        ContentKey,
+        ScanDirResult,
+        StatKey,
+    )
+
+__all__ = [
+    "CmdArchive",
+    "ContentCache",
+    "DoctorCache",
+    "ScanCache",
+    "SniffCache",
+    "stat_key",
+]
+
+# rough size of a rich Span with its style, to estimate the size of a Text
+SPAN_BYTES = 100
+# output with decrypted or templated file contents is not written to disk, write
+# commands run verbose and print the diff of what they change
+NOT_ARCHIVED_PREFIXES = tuple(
+    f"chezmoi {' '.join(read_cmd.value)} "
+    for read_cmd in (
+        ReadCmd.cat,
+        ReadCmd.diff,
+        ReadCmd.diff_reverse,
+        ReadCmd.template_data,
+    )
+) + tuple(
+    f"chezmoi {dry_run}{' '.join(write_cmd.value)} "
+    for write_cmd in WriteCmd
+    for dry_run in ("", "--dry-run ")
+)
+
+
+def _app_cache_dir() -> Path:
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    base_dir = Path(xdg_cache_home) if xdg_cache_home else Path.home() / ".cache"
+    return base_dir / "chezmoi-mousse"
+
+
+def _result_record(result: CommandResult) -> dict[str, Any]:
+    record = result._asdict()
+    record["path_arg"] = None if result.path_arg is None else str(result.path_arg)
+    return record
+
+
+def _record_result(record: dict[str, Any]) -> CommandResult:
+    if record["path_arg"] is not None:
+        record["path_arg"] = Path(record["path_arg"])
+    return CommandResult(**record)
+
+
+def stat_key(st: os.stat_result) -> StatKey:
+    # identifies the file and its contents without opening it
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class SniffCache:
+    """Binary sniffing results persisted across sessions, keyed by stat_key.
+
+    Least recently used entries are evicted, the app saves the cache periodically
+    so a crash or a killed terminal doesn't lose the session's results. Only added
+    or evicted entries cause a save, the recency order of hits is not persisted.
+    """
+
+    MAX_ENTRIES = 50000
+    FILE_NAME = "sniff_cache.json"
+    SAVE_INTERVAL = 60.0
+
+    _entries: ClassVar[OrderedDict[str, bool]] = OrderedDict()
+    _loaded: bool = False
+    _dirty: bool = False
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _key_str(key: StatKey) -> str:
+        return ":".join(str(part) for part in key)
+
+    @classmethod
+    def _load(cls) -> None:
+        with cls._lock:
+            if cls._loaded:
+                return
+            try:
+                with (_app_cache_dir() / cls.FILE_NAME).open(encoding="utf-8") as f:
+                    loaded: dict[str, bool] = json.load(f)
+                # saved from the least to the most recently used
+                cls._entries.update(loaded)
+            except (OSError, TypeError, ValueError):
+                pass  # a missing or corrupt cache just means sniffing again
+            cls._loaded = True
+
+    @classmethod
+    def get(cls, key: StatKey) -> bool | None:
+        if not cls._loaded:
+            cls._load()
+        key_str = cls._key_str(key)
+        with cls._lock:
+            is_binary = cls._entries.get(key_str)
+            if is_binary is not None:
+                # a hit alone doesn't make the file worth rewriting
+                cls._entries.move_to_end(key_str)
+            return is_binary
+
+    @classmethod
+    def put(cls, key: StatKey, is_binary: bool) -> None:
+        if not cls._loaded:
+            cls._load()
+        key_str = cls._key_str(key)
+        with cls._lock:
+            cls._entries[key_str] = is_binary
+            cls._entries.move_to_end(key_str)
+            while len(cls._entries) > cls.MAX_ENTRIES:
+                cls._entries.popitem(last=False)
+            cls._dirty = True
+
+    @classmethod
+    def save(cls) -> None:
+        with cls._lock:
+            if not cls._dirty:
+                return
+            to_save = dict(cls._entries)
+            cls._dirty = False
+        cache_dir = _app_cache_dir()
+        tmp_path = cache_dir / f"{cls.FILE_NAME}.{threading.get_ident()}.tmp"
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(to_save, f, separators=(",", ":"))
+            # atomic, a save interrupted by exiting leaves the previous file
+            tmp_path.replace(cache_dir / cls.FILE_NAME)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            with cls._lock:
+                cls._dirty = True
+
+
+class ScanCache:
+    """Directory scan results, valid as long as the directory mtime is unchanged.
+
+    A hit costs a single stat of the directory. Writing to a file doesn't change
+    the directory mtime, its size and binary flags stay as scanned until an entry
+    is added, removed or renamed. Other checks sniff through SniffCache, which is
+    keyed by the stat of the file itself.
+
+    Evicts the least recently used directories by the total number of items, so a
+    few large directories don't take the place of many small ones.
+    """
+
+    MAX_ITEMS = 50000
+
+    _entries: ClassVar[OrderedDict[tuple[Path, bool], tuple[int, ScanDirResult]]] = (
+        OrderedDict()
+    )
+    _item_count: int = 0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _size(result: ScanDirResult) -> int:
+        return len(result) if isinstance(result, ScanDirColumns) else 1
+
+    @classmethod
+    def get(cls, key: tuple[Path, bool], mtime_ns: int) -> ScanDirResult | None:
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != mtime_ns:  # entries were added, removed or renamed
+                del cls._entries[key]
+                cls._item_count -= cls._size(entry[1])
+                return None
+            cls._entries.move_to_end(key)
+            return entry[1]
+
+    @classmethod
+    def put(cls, key: tuple[Path, bool], mtime_ns: int, result: ScanDirResult) -> None:
+        size = cls._size(result)
+        if size > cls.MAX_ITEMS:
+            return
+        with cls._lock:
+            previous = cls._entries.pop(key, None)
+            if previous is not None:
+                cls._item_count -= cls._size(previous[1])
+            cls._entries[key] = (mtime_ns, result)
+            cls._item_count += size
+            while cls._item_count > cls.MAX_ITEMS:
+                _, (_, evicted) = cls._entries.popitem(last=False)
+                cls._item_count -= cls._size(evicted)
+
+
+class ContentCache:
+    """Highlighted file contents, evicted by their estimated size in bytes.
+
+    Keys include what makes an entry stale, the mtime and size of a destination
+    file or the SourceState generation for chezmoi cat output.
+    """
+
+    max_bytes: int = 64 * 1024 * 1024
+    hits: int = 0
+    misses: int = 0
+
+    _entries: ClassVar[OrderedDict[ContentKey, tuple[CachedContents, int]]] = (
+        OrderedDict()
+    )
+    _total_bytes: int = 0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _estimate_size(contents: CachedContents) -> int:
+        text, cmd_result = contents
+        size = sys.getsizeof(text.plain) + len(text.spans) * SPAN_BYTES
+        if cmd_result is not None:
+            size += sys.getsizeof(cmd_result.std_out) + sys.getsizeof(
+                cmd_result.std_err
+            )
+        return size
+
+    @classmethod
+    def set_max_bytes(cls, max_bytes: int) -> None:
+        with cls._lock:
+            cls.max_bytes = max_bytes
+            cls._evict()
+
+    @classmethod
+    def get(cls, key: ContentKey) -> CachedContents | None:
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is None:
+                cls.misses += 1
+                return None
+            cls.hits += 1
+            cls._entries.move_to_end(key)
+            return entry[0]
+
+    @classmethod
+    def put(cls, key: ContentKey, contents: CachedContents) -> None:
+        size = cls._estimate_size(contents)
+        with cls._lock:
+            previous = cls._entries.pop(key, None)
+            if previous is not None:
+                cls._total_bytes -= previous[1]
+            if size > cls.max_bytes:
+                return
+            cls._entries[key] = (contents, size)
+            cls._total_bytes += size
+            cls._evict()
+
+    @classmethod
+    def _evict(cls) -> None:
+        while cls._total_bytes > cls.max_bytes:
+            _, (_, evicted_size) = cls._entries.popitem(last=False)
+            cls._total_bytes -= evicted_size
+
+
+class CmdArchive:
+    """Full command results appended as JSON lines to rotating files.
+
+    The command log only keeps the location of a record in memory, the output is
+    read back when the entry is expanded. Output can include template data, the
+    files are only readable by the user and removed on exit unless keep_files is
+    set.
+    """
+
+    DIR_NAME = "cmd_log"
+    MAX_FILE_BYTES = 4 * 1024 * 1024
+    MAX_FILES = 4
+
+    keep_files: bool = False
+
+    _file: BinaryIO | None = None
+    _file_number: int = -1
+    _failed: bool = False
+    _lock = threading.Lock()
+
+    @classmethod
+    def _archive_dir(cls) -> Path:
+        return _app_cache_dir() / cls.DIR_NAME
+
+    @classmethod
+    def _rotate(cls) -> BinaryIO:
+        if cls._file is not None:
+            cls._file.close()
+            cls._file = None
+        archive_dir = cls._archive_dir()
+        archive_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        archive_dir.chmod(0o700)  # mkdir doesn't change an existing directory
+        if cls._file_number == -1 and not cls.keep_files:
+            cls._remove_files()  # left behind by a session which didn't exit
+        # continue after the files of a previous session
+        numbers = [int(p.stem) for p in archive_dir.glob("*.jsonl") if p.stem.isdigit()]
+        cls._file_number = max([cls._file_number, *numbers]) + 1
+        for number in numbers:
+            if number <= cls._file_number - cls.MAX_FILES:
+                (archive_dir / f"{number}.jsonl").unlink(missing_ok=True)
+        fd = os.open(
+            archive_dir / f"{cls._file_number}.jsonl",
+            os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+            0o600,
+        )
+        cls._file = os.fdopen(fd, "ab")
+        return cls._file
+
+    @classmethod
+    def _remove_files(cls) -> None:
+        for archive_path in cls._archive_dir().glob("*.jsonl"):
+            archive_path.unlink(missing_ok=True)
+
+    @classmethod
+    def append(cls, result: CommandResult) -> ArchiveLocation | None:
+        if result.full_cmd.startswith(NOT_ARCHIVED_PREFIXES):
+            result = result._replace(std_out=LogString.cmd_output_not_archived)
+        line = json.dumps(_result_record(result), separators=(",", ":")).encode()
+        line += b"\n"
+        with cls._lock:
+            if cls._failed:
+                return None
+            try:
+                archive_file = cls._file
+                if archive_file is None or (
+                    archive_file.tell()
+                    and archive_file.tell() + len(line) > cls.MAX_FILE_BYTES
+                ):
+                    archive_file = cls._rotate()
+                offset = archive_file.tell()
+                archive_file.write(line)
+                archive_file.flush()
+            except OSError:
+                cls._failed = True  # results are kept in memory from now on
+                return None
+            return (cls._file_number, offset)
+
+    @classmethod
+    def load(cls, location: ArchiveLocation) -> CommandResult | None:
+        """Returns None if the file was rotated out or can't be read."""
+        file_number, offset = location
+        try:
+            with (cls._archive_dir() / f"{file_number}.jsonl").open("rb") as f:
+                f.seek(offset)
+                return _record_result(json.loads(f.readline()))
+        except (OSError, KeyError, TypeError, ValueError):
+            return None
+
+    @classmethod
+    def close(cls) -> None:
+        with cls._lock:
+            if cls._file is not None:
+                cls._file.close()
+                cls._file = None
+            if not cls.keep_files:
+                # otherwise removed at the start of the next session
+                with contextlib.suppress(OSError):
+                    cls._remove_files()
+
+
+class DoctorCache:
+    """The chezmoi doctor result, reused across sessions for ttl_seconds.
+
+    Doctor probes many binaries and can check for a newer version over the
+    network. A changed chezmoi binary also invalidates the result.
+    """
+
+    FILE_NAME = "doctor_result.json"
+
+    ttl_seconds: int = 24 * 60 * 60
+
+    @staticmethod
+    def _binary_key() -> list[str | int]:
+        chezmoi_path = shutil.which("chezmoi")
+        if chezmoi_path is None:
+            return []
+        try:
+            st = Path(chezmoi_path).stat()
+        except OSError:
+            return [chezmoi_path]
+        return [chezmoi_path, st.st_mtime_ns, st.st_size]
+
+    @classmethod
+    def get(cls) -> CommandResult | None:
+        if cls.ttl_seconds <= 0:
+            return None
+        try:
+            with (_app_cache_dir() / cls.FILE_NAME).open(encoding="utf-8") as f:
+                cached: dict[str, Any] = json.load(f)
+            if (
+                cached["key"] != cls._binary_key()
+                or time.time() - cached["saved"] > cls.ttl_seconds
+            ):
+                return None
+            return _record_result(cached["result"])
+        except (OSError, KeyError, TypeError, ValueError):
+            return None
+
+    @classmethod
+    def put(cls, result: CommandResult) -> None:
+        if cls.ttl_seconds <= 0:
+            return
+        to_save = {
+            "key": cls._binary_key(),
+            "saved": time.time(),
+            "result": _result_record(result),
+        }
+        cache_dir = _app_cache_dir()
+        tmp_path = cache_dir / f"{cls.FILE_NAME}.tmp"
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(to_save, f, separators=(",", ":"))
+            tmp_path.replace(cache_dir / cls.FILE_NAME)
+        except OSError:
+            pass  # the doctor command runs again next session
@@ -6,25 +6,37 @@ if TYPE_CHECKING:
     from types import MappingProxyType
     from typing import Any
 
+    from rich.text import Text
     from textual.widgets.tree import TreeNode
 
-    from chezmoi_mousse.named_tuples import AffectedPaths, CommandResult, ScanDirItem
+    from chezmoi_mousse.named_tuples import AffectedPaths, CommandResult
+    from chezmoi_mousse.scan_columns import ScanDirColumns
     from chezmoi_mousse.str_enums import PathKind, StatusCode
 
+    # (file number, byte offset) of a CommandResult in the CmdArchive
+    type ArchiveLocation = tuple[int, int]
+    type CachedContents = tuple[Text, CommandResult | None]
+    # (path, mtime_ns, size) for files, (path, SourceState.generation) for cat output
+    type ContentKey = tuple[Path, int, int] | tuple[Path, int]
     type MinWaitReturn = Callable[..., Awaitable[AffectedPaths | CommandResult | None]]
     type ParsedJson = dict[str, Any]
     type PathKindMap = MappingProxyType[Path, PathKind]
-    type ScanDirResult = list[ScanDirItem] | PathKind
+    type ScanDirResult = ScanDirColumns | PathKind
+    type StatKey = tuple[int, int, int, int]
     type StatusMap = MappingProxyType[Path, StatusCode]
     type StrTuple = tuple[str, ...]
     type TreeNodeDict = dict[Path, TreeNode[Path]]
 
 
 __all__ = [
+    "ArchiveLocation",
+    "CachedContents",
+    "ContentKey",
     "MinWaitReturn",
     "ParsedJson",
     "PathKindMap",
     "ScanDirResult",
+    "StatKey",
     "StatusMap",
     "StrTuple",
     "TreeNodeDict",
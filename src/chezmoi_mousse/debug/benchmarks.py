@@ -0,0 +1,279 @@
+"""Benchmarks of the data model hot paths on synthetic repositories.
+
+Run with `python -m chezmoi_mousse.debug.benchmarks`, the results can be written
+as JSON and compared with the results of a run on another commit.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from textual import events, on
+
+from chezmoi_mousse import store
+from chezmoi_mousse.cm_attributes import CmAttributes, ManagedPaths
+from chezmoi_mousse.debug.synthetic_repo import RepoShape, SyntheticRepo
+from chezmoi_mousse.diff_model import parse_diff
+from chezmoi_mousse.functions import AppLife, CheckPath, Commands
+from chezmoi_mousse.gui import textual_app
+from chezmoi_mousse.gui.common.managed_tree import ManagedTree
+from chezmoi_mousse.gui.textual_app import ChezmoiGui
+from chezmoi_mousse.named_tuples import CommandResult
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_RUNS = 5
+# inserting tree nodes searches the whole tree, larger trees take minutes
+DEFAULT_TREE_MAX_PATHS = 10000
+# part of the status paths changed between the two update_changed_paths snapshots
+CHANGED_STATUS_RATIO = 0.1
+# slotted dataclass fields have no class level defaults
+DEFAULT_SHAPE = RepoShape()
+
+
+class BenchResult(NamedTuple):
+    benchmark: str
+    managed_paths: int
+    best_s: float
+    mean_s: float
+    runs: int
+
+
+def _result(benchmark: str, repo: SyntheticRepo, times: list[float]) -> BenchResult:
+    return BenchResult(
+        benchmark=benchmark,
+        managed_paths=repo.shape.managed_paths,
+        best_s=min(times),
+        mean_s=sum(times) / len(times),
+        runs=len(times),
+    )
+
+
+def _time_runs(func: Callable[[], object], runs: int) -> list[float]:
+    times: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _load_store(repo: SyntheticRepo) -> None:
+    # what the startup commands set, without running chezmoi
+    for read_cmd, std_out in repo.command_outputs().items():
+        result = CommandResult(
+            full_cmd=AppLife.full_cmd(read_cmd, path=None),
+            path_arg=None,
+            pretty_cmd=AppLife.pretty_cmd(read_cmd, path=None),
+            returncode=0,
+            std_err="",
+            std_out=std_out,
+            time_stamp="",
+        )
+        setattr(store, f"{read_cmd.name}_result", result)
+    store.parsed_dump_config = json.loads(store.dump_config_result.std_out)
+    Commands.dest_dir = repo.dest_dir
+
+
+def _bench_managed_paths(repo: SyntheticRepo, runs: int) -> list[BenchResult]:
+    return [_result("ManagedPaths()", repo, _time_runs(ManagedPaths, runs))]
+
+
+def _bench_changed_paths(repo: SyntheticRepo, runs: int) -> list[BenchResult]:
+    status_lines = store.status_files_result.std_out.splitlines()
+    changed_count = int(len(status_lines) * CHANGED_STATUS_RATIO)
+    # the first lines are reported as unchanged, as after chezmoi apply
+    changed_lines = [f"   {line[3:]}" for line in status_lines[:changed_count]]
+    changed_result = store.status_files_result._replace(
+        std_out="\n".join(changed_lines + status_lines[changed_count:])
+    )
+
+    async def time_updates() -> list[float]:
+        times: list[float] = []
+        for _ in range(runs):
+            await store.store_current_snapshot()
+            store.status_files_result = changed_result
+            start = time.perf_counter()
+            await store.update_changed_paths()
+            times.append(time.perf_counter() - start)
+        return times
+
+    original_result = store.status_files_result
+    try:
+        times = asyncio.run(time_updates())
+    finally:
+        store.status_files_result = original_result
+    return [_result("store.update_changed_paths()", repo, times)]
+
+
+def _bench_scan_dirs(repo: SyntheticRepo, runs: int) -> list[BenchResult]:
+    def scan() -> None:
+        for _ in CheckPath.scan_dirs(repo.managed_dirs, managed_dir=True):
+            pass
+
+    # the scan cache is empty for the directories of a new repo
+    cold = _time_runs(scan, 1)
+    warm = _time_runs(scan, runs)
+    return [
+        _result("CheckPath.scan_dirs() cold", repo, cold),
+        _result("CheckPath.scan_dirs() warm", repo, warm),
+    ]
+
+
+def _bench_diff(repo: SyntheticRepo, runs: int) -> list[BenchResult]:
+    diff_result = store.status_files_result._replace(std_out=repo.diff_output())
+
+    def word_spans() -> None:
+        parsed = parse_diff(diff_result)
+        for line_index in range(len(parsed)):
+            parsed.word_spans(line_index)
+
+    return [
+        _result(
+            "parse_diff()", repo, _time_runs(lambda: parse_diff(diff_result), runs)
+        ),
+        _result("parse_diff() and word_spans()", repo, _time_runs(word_spans, runs)),
+    ]
+
+
+class _TreeBenchApp(ChezmoiGui):
+    # relative paths resolve from the module of the subclass
+    CSS_PATH = Path(textual_app.__file__).with_name("gui.tcss")
+
+    @on(events.Mount)
+    def _mount_tree(self, event: events.Mount) -> None:
+        event.prevent_default()  # no splash or main screen, just the tree
+        self.mount(ManagedTree(self.cmattr.apply_id))
+
+
+def _bench_managed_tree(repo: SyntheticRepo, runs: int) -> list[BenchResult]:
+    # dest_dir is a cached property, each repo needs new attributes
+    ChezmoiGui.cmattr = CmAttributes()
+    ChezmoiGui.cmattr.paths = ManagedPaths()
+
+    async def time_tree() -> tuple[list[float], list[float]]:
+        app = _TreeBenchApp()
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            managed_tree = app.query_exactly_one(ManagedTree)
+            update_times = _time_runs(managed_tree.update_tree, runs)
+            unchanged_times: list[float] = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                managed_tree.show_unchanged = True
+                unchanged_times.append(time.perf_counter() - start)
+                managed_tree.show_unchanged = False
+        return update_times, unchanged_times
+
+    update_times, unchanged_times = asyncio.run(time_tree())
+    return [
+        _result("ManagedTree.update_tree()", repo, update_times),
+        _result("ManagedTree show unchanged", repo, unchanged_times),
+    ]
+
+
+BENCHMARKS = (_bench_managed_paths, _bench_changed_paths, _bench_scan_dirs, _bench_diff)
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            cwd=Path(__file__).parent,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def _compare_lines(results: list[BenchResult], previous_path: Path) -> list[str]:
+    previous = json.loads(previous_path.read_text(encoding="utf-8"))
+    previous_best = {
+        (entry["benchmark"], entry["managed_paths"]): entry["best_s"]
+        for entry in previous["results"]
+    }
+    lines = [f"\nCompared with {previous_path} ({previous.get('commit')}):"]
+    for result in results:
+        old_best = previous_best.get((result.benchmark, result.managed_paths))
+        if old_best:
+            lines.append(
+                f"{result.best_s / old_best:6.2f}x  {result.managed_paths:>7}  "
+                f"{result.benchmark}"
+            )
+    return lines
+
+
+def _main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmarks of the data model hot paths on synthetic repositories."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument(
+        "--status-ratio", type=float, default=DEFAULT_SHAPE.status_ratio
+    )
+    parser.add_argument("--depth", type=int, default=DEFAULT_SHAPE.depth)
+    parser.add_argument("--fan-out", type=int, default=DEFAULT_SHAPE.fan_out)
+    parser.add_argument("--tree-max-paths", type=int, default=DEFAULT_TREE_MAX_PATHS)
+    parser.add_argument("--json", type=Path, help="write the results to a file")
+    parser.add_argument("--compare", type=Path, help="JSON results of an earlier run")
+    args = parser.parse_args()
+
+    results: list[BenchResult] = []
+    for size in args.sizes:
+        shape = RepoShape(
+            managed_paths=size,
+            status_ratio=args.status_ratio,
+            depth=args.depth,
+            fan_out=args.fan_out,
+        )
+        with tempfile.TemporaryDirectory(prefix="chezmoi_mousse_bench_") as tmp_dir:
+            repo = SyntheticRepo(shape, Path(tmp_dir))
+            repo.generate()
+            _load_store(repo)
+            benchmarks = list(BENCHMARKS)
+            if size <= args.tree_max_paths:
+                benchmarks.append(_bench_managed_tree)
+            for benchmark in benchmarks:
+                for result in benchmark(repo, args.runs):
+                    results.append(result)
+                    sys.stdout.write(
+                        f"{result.best_s * 1000:10.1f} ms  {size:>7}  "
+                        f"{result.benchmark}\n"
+                    )
+                    sys.stdout.flush()
+
+    if args.compare is not None:
+        sys.stdout.write("\n".join(_compare_lines(results, args.compare)) + "\n")
+    if args.json is not None:
+        report = {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "runs": args.runs,
+            "shape": {
+                "status_ratio": args.status_ratio,
+                "depth": args.depth,
+                "fan_out": args.fan_out,
+            },
+            "results": [result._asdict() for result in results],
+        }
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,359 @@
+"""A chezmoi stand-in serving recorded or generated output from a fixture directory.
+
+Create a fixture directory with `python -m chezmoi_mousse.debug.fake_chezmoi
+generate DIR` for a synthetic repo, or with `record DIR` to capture the output of
+the real chezmoi. Both write DIR/bin/chezmoi, run the app with that directory
+first in PATH.
+
+Fixture files are named after the ReadCmd member, managed_files.out for example.
+DIR/fake_chezmoi.json sets the latency in milliseconds and an output scale per
+ReadCmd or WriteCmd name, or "default". An output scale below 1 keeps that part
+of the lines, above 1 repeats the output.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from chezmoi_mousse.str_enums import GlobalArgs, ReadCmd, WriteCmd
+
+CONFIG_FILE = "fake_chezmoi.json"
+SOURCE_PATHS_FILE = "source_paths.json"
+CAT_DIR = "cat"
+DEFAULT_MAX_CAT = 200
+# paths per chezmoi source-path call when recording
+SOURCE_PATH_CHUNK = 500
+SYNTHETIC_COMMITS = 1000
+RECORD_TIME_OUT = 60
+
+# the verbose dry run output of these write commands is a diff
+WRITE_CMD_DIFFS = {WriteCmd.apply: ReadCmd.diff, WriteCmd.re_add: ReadCmd.diff_reverse}
+# commands with path arguments, served from other fixtures
+NOT_RECORDED = (ReadCmd.cat, ReadCmd.source_path)
+
+WRAPPER_SCRIPT = """#!/bin/sh
+# chezmoi stand-in, serves the fixtures in the parent directory
+fixture_dir="$(cd "$(dirname "$0")/.." && pwd)"
+PYTHONPATH="{src_dir}${{PYTHONPATH:+:$PYTHONPATH}}" exec "{python}" \\
+    -m chezmoi_mousse.debug.fake_chezmoi serve "$fixture_dir" "$@"
+"""
+
+
+class FakeChezmoi:
+    def __init__(self, fixture_dir: Path) -> None:
+        self.fixture_dir = fixture_dir
+        config_path = fixture_dir / CONFIG_FILE
+        self.config: dict[str, dict[str, float]] = (
+            json.loads(config_path.read_text(encoding="utf-8"))
+            if config_path.exists()
+            else {}
+        )
+        dump_config = json.loads(self._fixture(ReadCmd.dump_config.name) or "{}")
+        self.dest_dir = Path(dump_config.get("destDir", Path.home()))
+        self.source_dir = Path(
+            dump_config.get("sourceDir", self.dest_dir / ".local/share/chezmoi")
+        )
+
+    def _setting(self, setting: str, name: str, default: float) -> float:
+        values = self.config.get(setting, {})
+        return values.get(name, values.get("default", default))
+
+    def _fixture(self, name: str) -> str:
+        fixture_path = self.fixture_dir / f"{name}.out"
+        if not fixture_path.exists():
+            return ""
+        return fixture_path.read_text(encoding="utf-8")
+
+    def _scaled(self, name: str, text: str, separator: str = "\n") -> str:
+        scale = self._setting("output_scale", name, 1)
+        if scale == 1 or not text:
+            return text
+        if scale > 1:
+            return separator.join([text.rstrip(separator)] * round(scale))
+        parts = text.split(separator)
+        return separator.join(parts[: max(1, int(len(parts) * scale))])
+
+    def _in_paths(self, path: Path, paths: list[Path], *, recursive: bool) -> bool:
+        if not paths:
+            return True
+        if recursive:
+            return any(path == p or p in path.parents for p in paths)
+        return path in paths
+
+    def _path_lines(
+        self, read_cmd: ReadCmd, paths: list[Path], *, recursive: bool
+    ) -> str:
+        is_status = read_cmd in (ReadCmd.status_dirs, ReadCmd.status_files)
+        lines = self._scaled(read_cmd.name, self._fixture(read_cmd.name)).splitlines()
+        return "\n".join(
+            line
+            for line in lines
+            if self._in_paths(
+                Path(line[3:] if is_status else line), paths, recursive=recursive
+            )
+        )
+
+    def _diff(self, read_cmd: ReadCmd, paths: list[Path]) -> str:
+        text = self._scaled(read_cmd.name, self._fixture(read_cmd.name))
+        if not paths:
+            return text
+        sections: list[str] = []
+        for section in text.split("diff --git ")[1:]:
+            rel_path = section.split("\n", 1)[0].split(" b/", 1)[-1]
+            if self._in_paths(self.dest_dir / rel_path, paths, recursive=True):
+                sections.append(f"diff --git {section}")
+        return "".join(sections)
+
+    def _git_log(self, args: list[str]) -> str:
+        # all commits are served for any path, git does the filtering for chezmoi
+        records = self._scaled(
+            ReadCmd.git_log.name, self._fixture(ReadCmd.git_log.name), "\x00"
+        ).split("\x00")
+        records = [record.strip("\n") for record in records if record.strip("\n")]
+        skip = next((int(a.split("=")[1]) for a in args if a.startswith("--skip=")), 0)
+        max_count = next(
+            (int(a.split("=")[1]) for a in args if a.startswith("--max-count=")),
+            len(records),
+        )
+        return "".join(f"{r}\x00\n" for r in records[skip : skip + max_count])
+
+    def _source_path(self, paths: list[Path]) -> str:
+        if not paths:
+            return str(self.source_dir)
+        source_paths_file = self.fixture_dir / SOURCE_PATHS_FILE
+        recorded: dict[str, str] = (
+            json.loads(source_paths_file.read_text(encoding="utf-8"))
+            if source_paths_file.exists()
+            else {}
+        )
+        lines: list[str] = []
+        for path in paths:
+            if str(path) in recorded:
+                lines.append(recorded[str(path)])
+                continue
+            # only the dot_ prefix of the chezmoi source state attributes
+            parts = path.relative_to(self.dest_dir).parts
+            source_parts = [
+                f"dot_{part[1:]}" if part.startswith(".") else part for part in parts
+            ]
+            lines.append(str(self.source_dir.joinpath(*source_parts)))
+        return "\n".join(lines)
+
+    def _cat(self, paths: list[Path]) -> tuple[str, str, int]:
+        contents: list[str] = []
+        for path in paths:
+            if not path.is_relative_to(self.dest_dir):
+                return "", f"chezmoi: {path}: not in destination directory", 1
+            recorded = self.fixture_dir / CAT_DIR / path.relative_to(self.dest_dir)
+            # without a recording, the target is served as the destination file
+            for cat_path in (recorded, path):
+                if cat_path.is_file():
+                    contents.append(cat_path.read_text(encoding="utf-8"))
+                    break
+            else:
+                return "", f"chezmoi: {path}: not managed", 1
+        return self._scaled(ReadCmd.cat.name, "".join(contents)), "", 0
+
+    def serve(self, args: list[str]) -> tuple[str, str, int]:
+        verb = next((a for a in args if not a.startswith("-")), "")
+        paths = [Path(a) for a in args if Path(a).is_absolute()]
+        read_cmds = [
+            cmd for cmd in ReadCmd if cmd.value[0] == verb and set(cmd.value) <= {*args}
+        ]
+        write_cmd = next((cmd for cmd in WriteCmd if cmd.value[0] == verb), None)
+        if read_cmds:
+            # diff_reverse over diff, the most specific match
+            read_cmd = max(read_cmds, key=lambda cmd: len(cmd.value))
+            name = read_cmd.name
+        elif write_cmd is not None:
+            read_cmd = None
+            name = write_cmd.name
+        else:
+            return "", f"fake chezmoi: unsupported command: {' '.join(args)}", 1
+        time.sleep(self._setting("latency_ms", name, 0) / 1000)
+
+        if write_cmd is not None:
+            if not {GlobalArgs.dry_run.value, "--dry-run"} & {*args}:
+                return "", "fake chezmoi: only dry runs are supported", 1
+            diff_cmd = WRITE_CMD_DIFFS.get(write_cmd)
+            if diff_cmd is None or GlobalArgs.verbose.value not in args:
+                return "", "", 0
+            return self._diff(diff_cmd, paths), "", 0
+        if read_cmd == ReadCmd.cat:
+            return self._cat(paths)
+        if read_cmd == ReadCmd.source_path:
+            return self._source_path(paths), "", 0
+        if read_cmd in (ReadCmd.diff, ReadCmd.diff_reverse):
+            return self._diff(read_cmd, paths), "", 0
+        if read_cmd == ReadCmd.git_log:
+            return self._git_log(args), "", 0
+        if read_cmd in ReadCmd.managed_commands():
+            recursive = "--recursive=false" not in args
+            return self._path_lines(read_cmd, paths, recursive=recursive), "", 0
+        returncode = int(self._setting("returncodes", name, 0))
+        return self._scaled(name, self._fixture(name)), "", returncode
+
+
+def _write_config(
+    fixture_dir: Path, latency_ms: list[str], output_scale: list[str]
+) -> None:
+    config_path = fixture_dir / CONFIG_FILE
+    config: dict[str, dict[str, float]] = (
+        json.loads(config_path.read_text(encoding="utf-8"))
+        if config_path.exists()
+        else {}
+    )
+    for setting, values in (("latency_ms", latency_ms), ("output_scale", output_scale)):
+        for value in values:
+            name, _, number = value.partition("=")
+            config.setdefault(setting, {})[name] = float(number)
+    config_path.write_text(json.dumps(config, indent=2), encoding="utf-8")
+
+
+def _write_wrapper(fixture_dir: Path) -> Path:
+    wrapper_path = fixture_dir / "bin" / "chezmoi"
+    wrapper_path.parent.mkdir(parents=True, exist_ok=True)
+    wrapper_path.write_text(
+        WRAPPER_SCRIPT.format(
+            src_dir=Path(__file__).resolve().parents[2], python=sys.executable
+        ),
+        encoding="utf-8",
+    )
+    wrapper_path.chmod(0o755)
+    return wrapper_path
+
+
+def _synthetic_git_log(commits: int) -> str:
+    return "".join(
+        f"{index + 1} hours ago\x1fSynthetic Committer\x1fUpdate dotfiles {index}\x00\n"
+        for index in range(commits)
+    )
+
+
+def _generate(fixture_dir: Path, managed_paths: int, status_ratio: float) -> None:
+    from chezmoi_mousse.debug.synthetic_repo import RepoShape, SyntheticRepo
+
+    repo = SyntheticRepo(
+        RepoShape(managed_paths=managed_paths, status_ratio=status_ratio), fixture_dir
+    )
+    repo.generate()
+    outputs = {cmd.name: std_out for cmd, std_out in repo.command_outputs().items()}
+    outputs[ReadCmd.diff.name] = repo.diff_output()
+    outputs[ReadCmd.git_log.name] = _synthetic_git_log(SYNTHETIC_COMMITS)
+    outputs[ReadCmd.git_remote.name] = (
+        "origin\thttps://example.com/dotfiles.git (fetch)\n"
+        "origin\thttps://example.com/dotfiles.git (push)"
+    )
+    outputs[ReadCmd.doctor.name] = (
+        "RESULT CHECK MESSAGE\n"
+        "ok version v2.0.0, built by fake_chezmoi\n"
+        f"ok source-dir {repo.source_dir} is a git working tree (clean)\n"
+        "info age-command age not found in $PATH"
+    )
+    for name, std_out in outputs.items():
+        (fixture_dir / f"{name}.out").write_text(std_out, encoding="utf-8")
+
+
+def _run_chezmoi(chezmoi: str, args: list[str]) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [chezmoi, *args], capture_output=True, text=True, timeout=RECORD_TIME_OUT
+    )
+
+
+def _record(fixture_dir: Path, chezmoi: str, max_cat: int) -> None:
+    outputs: dict[ReadCmd, str] = {}
+    returncodes: dict[str, float] = {}
+    for read_cmd in ReadCmd:
+        if read_cmd in NOT_RECORDED:
+            continue
+        completed = _run_chezmoi(chezmoi, list(read_cmd.value))
+        if completed.returncode:
+            returncodes[read_cmd.name] = completed.returncode
+        outputs[read_cmd] = completed.stdout
+        (fixture_dir / f"{read_cmd.name}.out").write_text(
+            completed.stdout, encoding="utf-8"
+        )
+        sys.stdout.write(f"{read_cmd.name}: {len(completed.stdout)} characters\n")
+
+    managed_paths = (
+        outputs[ReadCmd.managed_dirs].splitlines()
+        + outputs[ReadCmd.managed_files].splitlines()
+    )
+    source_paths: dict[str, str] = {}
+    for start in range(0, len(managed_paths), SOURCE_PATH_CHUNK):
+        chunk = managed_paths[start : start + SOURCE_PATH_CHUNK]
+        completed = _run_chezmoi(chezmoi, [*ReadCmd.source_path.value, *chunk])
+        source_paths.update(zip(chunk, completed.stdout.splitlines(), strict=False))
+    (fixture_dir / SOURCE_PATHS_FILE).write_text(
+        json.dumps(source_paths, indent=2), encoding="utf-8"
+    )
+
+    dest_dir = Path(json.loads(outputs[ReadCmd.dump_config])["destDir"])
+    for file_path in outputs[ReadCmd.managed_files].splitlines()[:max_cat]:
+        completed = _run_chezmoi(chezmoi, [*ReadCmd.cat.value, file_path])
+        cat_path = fixture_dir / CAT_DIR / Path(file_path).relative_to(dest_dir)
+        cat_path.parent.mkdir(parents=True, exist_ok=True)
+        cat_path.write_text(completed.stdout, encoding="utf-8")
+
+    config_path = fixture_dir / CONFIG_FILE
+    config: dict[str, dict[str, float]] = (
+        json.loads(config_path.read_text(encoding="utf-8"))
+        if config_path.exists()
+        else {}
+    )
+    config["returncodes"] = returncodes
+    config_path.write_text(json.dumps(config, indent=2), encoding="utf-8")
+
+
+def _main() -> None:
+    # called by the wrapper script, the remaining arguments are for chezmoi
+    if len(sys.argv) > 2 and sys.argv[1] == "serve":
+        std_out, std_err, returncode = FakeChezmoi(Path(sys.argv[2])).serve(
+            sys.argv[3:]
+        )
+        for stream, output in ((sys.stdout, std_out), (sys.stderr, std_err)):
+            if output:
+                stream.write(output if output.endswith("\n") else f"{output}\n")
+        sys.exit(returncode)
+
+    parser = argparse.ArgumentParser(
+        description="A chezmoi stand-in serving output from a fixture directory."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    generate_parser = subparsers.add_parser("generate", help="synthetic fixtures")
+    generate_parser.add_argument("--managed-paths", type=int, default=1000)
+    generate_parser.add_argument("--status-ratio", type=float, default=0.05)
+    record_parser = subparsers.add_parser("record", help="record real chezmoi output")
+    record_parser.add_argument("--chezmoi", default=shutil.which("chezmoi"))
+    record_parser.add_argument("--max-cat", type=int, default=DEFAULT_MAX_CAT)
+    for subparser in (generate_parser, record_parser):
+        subparser.add_argument("fixture_dir", type=Path)
+        subparser.add_argument(
+            "--latency-ms", action="append", default=[], metavar="NAME=MS"
+        )
+        subparser.add_argument(
+            "--output-scale", action="append", default=[], metavar="NAME=FACTOR"
+        )
+    args = parser.parse_args()
+
+    fixture_dir: Path = args.fixture_dir.resolve()
+    fixture_dir.mkdir(parents=True, exist_ok=True)
+    if args.command == "generate":
+        _generate(fixture_dir, args.managed_paths, args.status_ratio)
+    else:
+        if args.chezmoi is None:
+            sys.exit("'chezmoi' command not found, pass --chezmoi to record")
+        _record(fixture_dir, args.chezmoi, args.max_cat)
+    _write_config(fixture_dir, args.latency_ms, args.output_scale)
+    wrapper_path = _write_wrapper(fixture_dir)
+    sys.stdout.write(f"Run the app with: PATH={wrapper_path.parent}:$PATH\n")
+
+
+if __name__ == "__main__":
+    _main()
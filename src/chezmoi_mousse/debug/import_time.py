@@ -0,0 +1,132 @@
+"""Import time budget report for the cold start of the app.
+
+Run with `python -m chezmoi_mousse.debug.import_time`, exits with an error if the
+budget is exceeded or if a module which should load on first use is imported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+IMPORT_STMT = "import chezmoi_mousse.main"
+DEFAULT_BUDGET_MS = 450
+DEFAULT_RUNS = 5
+REPORT_ROWS = 15
+PACKAGE_PREFIX = "chezmoi_mousse"
+
+# only imported when the feature is used
+LAZY_MODULES = (
+    "chezmoi_mousse.debug.pilot_mode",
+    "chezmoi_mousse.debug.test_paths",
+    "chezmoi_mousse.gui.common.doctor_data",
+    "textual.pilot",
+)
+
+
+class ImportTime(NamedTuple):
+    self_us: int
+    cumulative_us: int
+
+
+def _run_once() -> dict[str, ImportTime]:
+    env = os.environ.copy()
+    # without bytecode every run would include compiling the changed modules
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env["PYTHONPATH"] = str(Path(__file__).resolve().parents[2])
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_STMT],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    )
+    times: dict[str, ImportTime] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        times[name.strip()] = ImportTime(int(self_us), int(cumulative_us))
+    return times
+
+
+def _measure(runs: int) -> dict[str, ImportTime]:
+    _run_once()  # writes the bytecode caches
+    all_runs = [_run_once() for _ in range(runs)]
+    # the minimum is the least disturbed by other processes
+    return {
+        name: ImportTime(
+            min(run[name].self_us for run in all_runs if name in run),
+            min(run[name].cumulative_us for run in all_runs if name in run),
+        )
+        for name in all_runs[0]
+    }
+
+
+def _ms(us: int) -> str:
+    return f"{us / 1000:8.1f} ms"
+
+
+def _main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Import time budget report for the cold start of the app."
+    )
+    parser.add_argument("--budget-ms", type=int, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--json", type=Path, help="also write the results to a file")
+    args = parser.parse_args()
+
+    times = _measure(args.runs)
+    total_us = times["chezmoi_mousse.main"].cumulative_us
+    package_times = {
+        name: t for name, t in times.items() if name.startswith(PACKAGE_PREFIX)
+    }
+    package_us = sum(t.self_us for t in package_times.values())
+    eager_modules = [name for name in LAZY_MODULES if name in times]
+
+    report = [
+        f"{IMPORT_STMT}, minimum of {args.runs} runs",
+        f"{_ms(total_us)}  total, budget {args.budget_ms} ms",
+        f"{_ms(package_us)}  in {len(package_times)} {PACKAGE_PREFIX} modules",
+        f"\nSlowest modules by self time, of {len(times)} imported:",
+    ]
+    slowest = sorted(times.items(), key=lambda item: item[1].self_us, reverse=True)
+    report.extend(f"{_ms(t.self_us)}  {name}" for name, t in slowest[:REPORT_ROWS])
+    report.append(f"\n{PACKAGE_PREFIX} modules by cumulative time:")
+    by_cumulative = sorted(
+        package_times.items(), key=lambda item: item[1].cumulative_us, reverse=True
+    )
+    report.extend(
+        f"{_ms(t.cumulative_us)}  {name}" for name, t in by_cumulative[:REPORT_ROWS]
+    )
+    sys.stdout.write("\n".join(report) + "\n")
+
+    if args.json is not None:
+        results = {
+            "import_stmt": IMPORT_STMT,
+            "runs": args.runs,
+            "budget_ms": args.budget_ms,
+            "total_ms": total_us / 1000,
+            "package_ms": package_us / 1000,
+            "eager_modules": eager_modules,
+            "modules": {name: t._asdict() for name, t in times.items()},
+        }
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    errors: list[str] = [f"Imported at startup: {name}" for name in eager_modules]
+    if total_us > args.budget_ms * 1000:
+        over_ms = total_us / 1000 - args.budget_ms
+        errors.append(f"Over the {args.budget_ms} ms budget by {over_ms:.1f} ms")
+    if errors:
+        sys.exit("\n".join(errors))
+
+
+if __name__ == "__main__":
+    _main()
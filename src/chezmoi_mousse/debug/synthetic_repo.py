@@ -0,0 +1,196 @@
+"""Synthetic chezmoi repositories at a configurable scale.
+
+Creates a destination tree on disk and the output chezmoi would give for it, for
+the commands the app reads at startup and for a diff of all paths with a status.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from chezmoi_mousse.str_enums import ReadCmd
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+__all__ = ["RepoShape", "SyntheticRepo"]
+
+DIR_NAMES = (
+    "alacritty",
+    "bin",
+    "colors",
+    "fish",
+    "git",
+    "keymaps",
+    "kitty",
+    "lua",
+    "nvim",
+    "plugins",
+    "scripts",
+    "snippets",
+    "themes",
+    "tmux",
+    "zsh",
+)
+FILE_NAMES = ("aliases", "config", "env", "init", "keys", "settings", "theme")
+FILE_SUFFIXES = ("", ".conf", ".json", ".lua", ".sh", ".toml", ".yaml")
+WORDS = ("alpha", "blue", "dark", "fast", "green", "light", "quiet", "red", "slow")
+
+# status pairs with their weights, the first column compares the last state
+# written by chezmoi, the second column what chezmoi apply would change
+STATUS_WEIGHTS = {" M": 60, "MM": 10, "M ": 10, " A": 10, " D": 5, "DA": 5}
+# the destination file doesn't exist for these
+NOT_IN_DEST = (" A", "DA")
+# every MODIFIED_EVERY-th line differs between the target and the destination
+MODIFIED_EVERY = 5
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class RepoShape:
+    managed_paths: int = 1000
+    # part of the managed files with a status
+    status_ratio: float = 0.05
+    # part of the managed paths which are directories
+    dir_ratio: float = 0.15
+    depth: int = 5
+    fan_out: int = 6
+    # unmanaged files created next to the managed files, per managed file
+    unmanaged_ratio: float = 0.25
+    file_lines: int = 20
+    seed: int = 0
+
+
+class SyntheticRepo:
+    def __init__(self, shape: RepoShape, root: Path) -> None:
+        self.shape = shape
+        self.dest_dir = root / "home"
+        self.source_dir = self.dest_dir / ".local" / "share" / "chezmoi"
+        self.managed_dirs: list[Path] = []
+        self.managed_files: list[Path] = []
+        self.status_files: dict[Path, str] = {}
+        self._rng = random.Random(shape.seed)
+        self._file_parents: list[Path] = []
+
+    def _create_dirs(self, dir_count: int) -> None:
+        # breadth first, so the tree gets wide before it gets deep
+        parents = deque([(self.dest_dir, 0)])
+        while len(self.managed_dirs) < dir_count:
+            if not parents:
+                # the depth limit was reached, add another round of children
+                parents.append((self.dest_dir, 0))
+                parents.extend(
+                    (p, len(p.relative_to(self.dest_dir).parts))
+                    for p in self.managed_dirs
+                    if len(p.relative_to(self.dest_dir).parts) < self.shape.depth
+                )
+            parent, level = parents.popleft()
+            for _ in range(self._rng.randint(1, self.shape.fan_out)):
+                # numbered to keep names unique within the parent
+                name = f"{self._rng.choice(DIR_NAMES)}_{len(self.managed_dirs)}"
+                dir_path = parent / (f".{name}" if level == 0 else name)
+                self.managed_dirs.append(dir_path)
+                if level + 1 < self.shape.depth:
+                    parents.append((dir_path, level + 1))
+                if len(self.managed_dirs) == dir_count:
+                    break
+        for dir_path in self.managed_dirs:
+            dir_path.mkdir(parents=True, exist_ok=True)
+        self._file_parents = [self.dest_dir, *self.managed_dirs]
+
+    def _file_path(self, index: int) -> Path:
+        parent = self._rng.choice(self._file_parents)
+        name = f"{self._rng.choice(FILE_NAMES)}_{index}"
+        return parent / f"{name}{self._rng.choice(FILE_SUFFIXES)}"
+
+    def _lines(self, path: Path, *, modified: bool) -> list[str]:
+        lines: list[str] = []
+        name_hash = zlib.crc32(path.name.encode())
+        for line_number in range(self.shape.file_lines):
+            word = WORDS[(name_hash + line_number) % len(WORDS)]
+            if modified and line_number % MODIFIED_EVERY == 0:
+                word = word.upper()
+            lines.append(f'{path.stem}_{line_number} = "{word} {line_number}"')
+        return lines
+
+    def generate(self) -> None:
+        dir_count = int(self.shape.managed_paths * self.shape.dir_ratio)
+        self._create_dirs(dir_count)
+        file_count = self.shape.managed_paths - len(self.managed_dirs)
+        self.managed_files = [self._file_path(index) for index in range(file_count)]
+        status_count = int(file_count * self.shape.status_ratio)
+        pairs = self._rng.choices(
+            list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()), k=status_count
+        )
+        self.status_files = dict(
+            zip(self._rng.sample(self.managed_files, status_count), pairs, strict=True)
+        )
+        for file_path in self.managed_files:
+            status_pair = self.status_files.get(file_path)
+            if status_pair in NOT_IN_DEST:
+                continue
+            lines = self._lines(file_path, modified=status_pair is not None)
+            file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        unmanaged_count = int(file_count * self.shape.unmanaged_ratio)
+        for index in range(unmanaged_count):
+            unmanaged_path = self._file_path(index).with_name(f"unmanaged_{index}.txt")
+            unmanaged_path.write_text(f"{index}\n", encoding="utf-8")
+        self.source_dir.mkdir(parents=True, exist_ok=True)
+
+    def _diff_lines(self, path: Path, status_pair: str) -> list[str]:
+        rel_path = path.relative_to(self.dest_dir)
+        target = self._lines(path, modified=False)
+        lines = [f"diff --git a/{rel_path} b/{rel_path}"]
+        if status_pair[1] == "A":
+            lines += ["new file mode 100644", "--- /dev/null", f"+++ b/{rel_path}"]
+            lines.append(f"@@ -0,0 +1,{len(target)} @@")
+            lines += [f"+{line}" for line in target]
+        elif status_pair[1] == "D":
+            actual = self._lines(path, modified=True)
+            lines += ["deleted file mode 100644", f"--- a/{rel_path}", "+++ /dev/null"]
+            lines.append(f"@@ -1,{len(actual)} +0,0 @@")
+            lines += [f"-{line}" for line in actual]
+        else:
+            actual = self._lines(path, modified=True)
+            lines += [f"--- a/{rel_path}", f"+++ b/{rel_path}"]
+            lines.append(f"@@ -1,{len(actual)} +1,{len(target)} @@")
+            for old_line, new_line in zip(actual, target, strict=True):
+                if old_line == new_line:
+                    lines.append(f" {old_line}")
+                else:
+                    lines += [f"-{old_line}", f"+{new_line}"]
+        return lines
+
+    def diff_output(self) -> str:
+        """chezmoi diff output for all files which apply would change."""
+        lines: list[str] = []
+        for path in sorted(self.status_files):
+            status_pair = self.status_files[path]
+            if status_pair[1] != " ":
+                lines += self._diff_lines(path, status_pair)
+        return "\n".join(lines)
+
+    def command_outputs(self) -> dict[ReadCmd, str]:
+        dump_config = {
+            "destDir": str(self.dest_dir),
+            "sourceDir": str(self.source_dir),
+            "workingTree": str(self.source_dir),
+            "git": {"autoadd": False, "autocommit": False, "autopush": False},
+        }
+        return {
+            ReadCmd.dump_config: json.dumps(dump_config),
+            ReadCmd.template_data: json.dumps({"chezmoi": {"os": "linux"}}),
+            ReadCmd.ignored: "",
+            ReadCmd.managed_dirs: "\n".join(str(p) for p in sorted(self.managed_dirs)),
+            ReadCmd.managed_files: "\n".join(
+                str(p) for p in sorted(self.managed_files)
+            ),
+            ReadCmd.status_dirs: "",
+            ReadCmd.status_files: "\n".join(
+                f"{pair} {path}" for path, pair in sorted(self.status_files.items())
+            ),
+        }
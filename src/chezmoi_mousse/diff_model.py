@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import re
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import TYPE_CHECKING
+
+from rich.cells import cell_len
+
+from chezmoi_mousse.mapped_file import CONTROL_CHARS
+from chezmoi_mousse.str_enums import DiffLineKind
+
+if TYPE_CHECKING:
+    from chezmoi_mousse.named_tuples import CommandResult
+
+__all__ = ["ParsedDiff", "parse_diff"]
+
+# line kinds inside a hunk, by the first character
+HUNK_LINE_KINDS = {
+    " ": DiffLineKind.context,
+    "+": DiffLineKind.added,
+    "-": DiffLineKind.removed,
+    "\\": DiffLineKind.context,  # \ No newline at end of file
+}
+# only lines outside hunks are matched against these prefixes
+HEADER_LINE_KINDS = {
+    "---": DiffLineKind.removed,
+    "+++": DiffLineKind.added,
+    "deleted": DiffLineKind.removed,
+    "old": DiffLineKind.removed,
+    "new": DiffLineKind.added,
+    "index": DiffLineKind.header,
+    "changed": DiffLineKind.changed,
+}
+
+# longer lines and larger blocks of changed lines don't get word level spans
+MAX_WORD_DIFF_LINE = 1000
+MAX_WORD_DIFF_BLOCK = 200
+# lines which have less in common are shown as completely changed
+MIN_WORD_DIFF_RATIO = 0.4
+
+WORD_RE = re.compile(r"\w+|\s+|[^\w\s]")
+
+type Spans = list[tuple[int, int]]
+
+
+def _header_kind(line: str) -> DiffLineKind:
+    for prefix, kind in HEADER_LINE_KINDS.items():
+        if line.startswith(prefix):
+            return kind
+    return DiffLineKind.unhandled
+
+
+def _word_spans(old_line: str, new_line: str) -> tuple[Spans, Spans] | None:
+    # character ranges, after the +/- marker, of the words that differ
+    old_words = WORD_RE.findall(old_line, 1)
+    new_words = WORD_RE.findall(new_line, 1)
+    matcher = SequenceMatcher(None, old_words, new_words, autojunk=False)
+    if matcher.ratio() < MIN_WORD_DIFF_RATIO:
+        return None
+    old_offsets = array("l", [1])
+    for word in old_words:
+        old_offsets.append(old_offsets[-1] + len(word))
+    new_offsets = array("l", [1])
+    for word in new_words:
+        new_offsets.append(new_offsets[-1] + len(word))
+    old_spans: Spans = []
+    new_spans: Spans = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        if i1 < i2:
+            old_spans.append((old_offsets[i1], old_offsets[i2]))
+        if j1 < j2:
+            new_spans.append((new_offsets[j1], new_offsets[j2]))
+    return old_spans, new_spans
+
+
+@dataclass(slots=True)
+class DiffHunk:
+    header: int  # line index of the @@ line
+    end: int = 0
+    # word level spans of the added and removed lines, filled on first display
+    word_spans: dict[int, Spans] = field(default_factory=lambda: {})
+
+
+@dataclass(slots=True)
+class DiffFile:
+    header: int  # line index of the "diff" line
+    hunks: list[DiffHunk] = field(default_factory=lambda: [])
+
+
+@dataclass(slots=True)
+class ParsedDiff:
+    """A diff command result, parsed once into files, hunks and typed lines.
+
+    Lines are not stored as separate strings, offsets point into the raw output.
+    """
+
+    result: CommandResult
+    kinds: list[DiffLineKind] = field(default_factory=lambda: [])
+    # start of each line in result.std_out, followed by the end of the output
+    offsets: array[int] = field(default_factory=lambda: array("q", [0]))
+    files: list[DiffFile] = field(default_factory=lambda: [])
+    max_width: int = 0
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def line_text(self, line_index: int) -> str:
+        text = self.result.std_out[
+            self.offsets[line_index] : self.offsets[line_index + 1]
+        ].rstrip("\r\n")
+        if text.isprintable():
+            return text
+        # the text is rendered as raw segments, control characters would reach
+        # the terminal
+        return text.expandtabs().translate(CONTROL_CHARS)
+
+    def _hunk_at(self, line_index: int) -> DiffHunk | None:
+        file_index = bisect_right(self.files, line_index, key=lambda f: f.header) - 1
+        if file_index < 0:
+            return None
+        hunks = self.files[file_index].hunks
+        hunk_index = bisect_right(hunks, line_index, key=lambda h: h.header) - 1
+        if hunk_index < 0 or line_index >= hunks[hunk_index].end:
+            return None
+        return hunks[hunk_index]
+
+    def _is_changed(self, line_index: int) -> bool:
+        return self.kinds[line_index] in (DiffLineKind.added, DiffLineKind.removed)
+
+    def word_spans(self, line_index: int) -> Spans:
+        """Changed character ranges in an added or removed line.
+
+        Computed for the block of changed lines around the line on first use, so
+        only the hunks which are displayed are compared word by word.
+        """
+        if not self._is_changed(line_index):
+            return []
+        hunk = self._hunk_at(line_index)
+        if hunk is None:
+            return []
+        if line_index not in hunk.word_spans:
+            self._add_block_spans(hunk, line_index)
+        return hunk.word_spans[line_index]
+
+    def _add_block_spans(self, hunk: DiffHunk, line_index: int) -> None:
+        start = end = line_index
+        while start > hunk.header + 1 and self._is_changed(start - 1):
+            start -= 1
+        while end < hunk.end and self._is_changed(end):
+            end += 1
+        block = range(start, end)
+        for i in block:
+            hunk.word_spans[i] = []
+        removed = [i for i in block if self.kinds[i] == DiffLineKind.removed]
+        added = [i for i in block if self.kinds[i] == DiffLineKind.added]
+        if max(len(removed), len(added)) > MAX_WORD_DIFF_BLOCK:
+            return
+        # a block lists the removed lines first, pair them with the added lines
+        for old_index, new_index in zip(removed, added, strict=False):
+            old_line = self.line_text(old_index)
+            new_line = self.line_text(new_index)
+            if max(len(old_line), len(new_line)) > MAX_WORD_DIFF_LINE:
+                continue
+            spans = _word_spans(old_line, new_line)
+            if spans is not None:
+                hunk.word_spans[old_index], hunk.word_spans[new_index] = spans
+
+
+def parse_diff(result: CommandResult) -> ParsedDiff:
+    parsed = ParsedDiff(result=result)
+    kinds = parsed.kinds
+    offsets = parsed.offsets
+    current_file: DiffFile | None = None
+    current_hunk: DiffHunk | None = None
+    max_width = 0
+    for line_index, line in enumerate(result.std_out.splitlines(keepends=True)):
+        offsets.append(offsets[-1] + len(line))
+        kind = HUNK_LINE_KINDS.get(line[:1]) if current_hunk is not None else None
+        if kind is None:
+            if current_hunk is not None:
+                current_hunk.end = line_index
+                current_hunk = None
+            if line.startswith("diff "):
+                kind = DiffLineKind.file_header
+                current_file = DiffFile(header=line_index)
+                parsed.files.append(current_file)
+            elif line.startswith("@@"):
+                kind = DiffLineKind.hunk_header
+                if current_file is None:  # a hunk without a file header
+                    current_file = DiffFile(header=line_index)
+                    parsed.files.append(current_file)
+                current_hunk = DiffHunk(header=line_index)
+                current_file.hunks.append(current_hunk)
+            else:
+                kind = _header_kind(line)
+        kinds.append(kind)
+        text = line.rstrip("\r\n")
+        if "\t" in text:
+            text = text.expandtabs()
+        max_width = max(max_width, len(text) if text.isascii() else cell_len(text))
+    if current_hunk is not None:
+        current_hunk.end = len(kinds)
+    parsed.max_width = max_width
+    return parsed
@@ -6,7 +6,9 @@ import re
 import subprocess
 import time
 from asyncio import sleep
+from collections import deque
 from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from functools import lru_cache, wraps
 from itertools import islice
@@ -17,12 +19,23 @@ from rich.highlighter import ReprHighlighter
 from rich.text import Text
 
 from chezmoi_mousse import store
-from chezmoi_mousse.named_tuples import AffectedPaths, CommandResult, ScanDirItem
+from chezmoi_mousse.caches import (
+    ContentCache,
+    DoctorCache,
+    ScanCache,
+    SniffCache,
+    stat_key,
+)
+from chezmoi_mousse.diff_model import parse_diff
+from chezmoi_mousse.git_log_pages import GIT_LOG_PAGE_SIZE, GitLogPages
+from chezmoi_mousse.named_tuples import AffectedPaths, CommandResult
+from chezmoi_mousse.path_matcher import PathMatcher
+from chezmoi_mousse.scan_columns import ScanDirColumns
+from chezmoi_mousse.source_state import SourceState
 from chezmoi_mousse.str_enums import (
     ChezmoiGitArgs,
     GlobalArgs,
     OpBtnLabel,
-    PathFilters,
     PathKind,
     ReadCmd,
     VerbArgs,
@@ -30,7 +43,7 @@ from chezmoi_mousse.str_enums import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Awaitable
+    from collections.abc import Awaitable, Container, Iterable, Iterator
     from typing import Any
 
     from chezmoi_mousse.cm_types import (
@@ -39,10 +52,14 @@ if TYPE_CHECKING:
         ScanDirResult,
         StrTuple,
     )
+    from chezmoi_mousse.diff_model import ParsedDiff
     from chezmoi_mousse.gui.common.operate_modal import LoadingModal
 
 __all__ = ("min_wait", "AppLife", "Commands", "CheckPath")
 
+# control characters which don't occur in text files
+CONTROL_BYTES = bytes(code for code in range(32) if chr(code) not in "\t\n\r")
+
 
 def min_wait(
     func: Callable[..., Awaitable[Any]],
@@ -61,16 +78,23 @@ def min_wait(
     return wrapper
 
 
+# cache_clear functions of caches which go stale when files in the destDir change
+_dest_file_caches: list[Callable[[], None]] = []
+
+
 def _typed_lru_cache[**FuncParams, FuncReturn](
-    *, maxsize: int = 128, typed: bool = False
+    *,
+    maxsize: int = 128,
+    typed: bool = False,
+    clear_with: tuple[list[Callable[[], None]], ...] = (),
 ) -> Callable[[Callable[FuncParams, FuncReturn]], Callable[FuncParams, FuncReturn]]:
     def decorator(
         func: Callable[FuncParams, FuncReturn],
     ) -> Callable[FuncParams, FuncReturn]:
-        return cast(
-            Callable[FuncParams, FuncReturn],
-            lru_cache(maxsize=maxsize, typed=typed)(func),
-        )
+        cached_func = lru_cache(maxsize=maxsize, typed=typed)(func)
+        for cache_clears in clear_with:
+            cache_clears.append(cached_func.cache_clear)
+        return cast(Callable[FuncParams, FuncReturn], cached_func)
 
     return decorator
 
@@ -155,9 +179,15 @@ class Commands:
             raise ValueError("Calling subprocess.run with a relative path")
         else:
             run_args = args_tuple + (str(path),)
-        return subprocess.run(
-            run_args, capture_output=True, shell=False, text=True, timeout=time_out
-        )
+        try:
+            return subprocess.run(
+                run_args, capture_output=True, shell=False, text=True, timeout=time_out
+            )
+        except (OSError, subprocess.TimeoutExpired) as error:
+            # a failed result instead of an exception ending the calling worker
+            return subprocess.CompletedProcess(
+                run_args, returncode=1, stdout="", stderr=str(error)
+            )
 
     @staticmethod
     async def get_affected_paths(write_cmd: WriteCmd, path: Path) -> AffectedPaths:
@@ -222,10 +252,12 @@ class Commands:
         )
 
     @staticmethod
-    def run_read_cmd(cmd: ReadCmd, path_arg: Path | None) -> CommandResult:
+    def run_read_cmd(
+        cmd: ReadCmd, path_arg: Path | None, *, time_out: int = 5
+    ) -> CommandResult:
         args_tuple: StrTuple = ("chezmoi",) + cmd.value
         cp: subprocess.CompletedProcess[str] = Commands._subprocess_run(
-            args_tuple, path=path_arg, time_out=5
+            args_tuple, path=path_arg, time_out=time_out
         )
 
         result = CommandResult(
@@ -240,6 +272,39 @@ class Commands:
         setattr(store, f"{cmd.name}_result", result)
         return result
 
+    @staticmethod
+    def get_doctor_result() -> CommandResult:
+        cached = DoctorCache.get()
+        if cached is not None:
+            store.doctor_result = cached
+            return cached
+        # the version check can wait for a network timeout when offline
+        result = Commands.run_read_cmd(ReadCmd.doctor, path_arg=None, time_out=30)
+        if result.std_out:
+            DoctorCache.put(result)
+        return result
+
+    @staticmethod
+    def run_scoped_status(cmd: ReadCmd, paths: list[Path]) -> CommandResult:
+        # status for just the given targets, without recursing into managed dirs
+        path_args = tuple(str(path) for path in paths)
+        args_tuple: StrTuple = (
+            ("chezmoi",) + cmd.value + (VerbArgs.non_recursive.value,) + path_args
+        )
+        cp: subprocess.CompletedProcess[str] = Commands._subprocess_run(
+            args_tuple, path=None, time_out=5
+        )
+        rel_paths = " ".join(Commands.rel_path(path) for path in paths)
+        return CommandResult(
+            full_cmd=f"{AppLife.full_cmd(cmd, path=None)}{' '.join(path_args)}",
+            pretty_cmd=f"{AppLife.pretty_cmd(cmd, path=None)}{rel_paths}",
+            path_arg=None,
+            returncode=cp.returncode,
+            std_err=Commands._strip_empty_lines(cp.stderr),
+            std_out=Commands._strip_empty_lines(cp.stdout),
+            time_stamp=f"{datetime.now().strftime('%H:%M:%S')}",
+        )
+
     @staticmethod
     def run_write_cmd(cmd: WriteCmd, path_arg: Path) -> CommandResult:
         args_tuple: StrTuple = (
@@ -268,12 +333,19 @@ class Commands:
         return json.loads(str_to_parse)
 
     @staticmethod
-    @_typed_lru_cache(maxsize=500)
     def get_highlighted_file_contents(file_path: Path) -> Text:
         if file_path.is_dir():
             raise ValueError(
                 f"Trying to get file contents for a directory: {file_path}"
             )
+        try:
+            file_stat = file_path.stat()
+        except OSError as e:
+            return Text(str(e))
+        key = (file_path, file_stat.st_mtime_ns, file_stat.st_size)
+        cached = ContentCache.get(key)
+        if cached is not None:
+            return cached[0]
         try:
             max_chars = 500000
             with file_path.open("r", encoding="utf-8") as f:
@@ -289,50 +361,105 @@ class Commands:
             f_contents = str(e)
         text_contents = Text(f_contents)
         ReprHighlighter().highlight(text_contents)
+        ContentCache.put(key, (text_contents, None))
         return text_contents
 
     @staticmethod
-    @_typed_lru_cache(maxsize=500)
     def get_highlighted_chezmoi_cat_output(
         file_path: Path,
     ) -> tuple[Text, CommandResult]:
+        key = (file_path, SourceState.generation)
+        cached = ContentCache.get(key)
+        if cached is not None and cached[1] is not None:
+            return (cached[0], cached[1])
         cmd_result = Commands.run_read_cmd(ReadCmd.cat, path_arg=file_path)
         f_contents = cmd_result.std_out
         if not f_contents.strip():
             f_contents = "File is empty or contains only whitespace"
         text_contents = Text(f_contents)
         ReprHighlighter().highlight(text_contents)
+        ContentCache.put(key, (text_contents, cmd_result))
         return (text_contents, cmd_result)
 
     @staticmethod
-    @_typed_lru_cache(maxsize=500)
-    def run_chezmoi_git_log(path_arg: Path | None) -> list[CommandResult]:
-        results: list[CommandResult] = []
-        if path_arg is None:
-            results.append(Commands.run_read_cmd(ReadCmd.git_log, path_arg=path_arg))
-        else:
+    def _run_git_log_page(source_path: Path | None, *, skip: int) -> CommandResult:
+        page_args = (f"--skip={skip}", f"--max-count={GIT_LOG_PAGE_SIZE}")
+        args_tuple: StrTuple = ("chezmoi",) + ReadCmd.git_log.value + page_args
+        cp: subprocess.CompletedProcess[str] = Commands._subprocess_run(
+            args_tuple, path=source_path, time_out=5
+        )
+        return CommandResult(
+            full_cmd=f"{AppLife.full_cmd(ReadCmd.git_log, path=None)}"
+            f"{' '.join(page_args)} {source_path or ''}",
+            pretty_cmd=f"{AppLife.pretty_cmd(ReadCmd.git_log, path=source_path)}",
+            path_arg=source_path,
+            returncode=cp.returncode,
+            std_err=Commands._strip_empty_lines(cp.stderr),
+            std_out=Commands._strip_empty_lines(cp.stdout),
+            time_stamp=f"{datetime.now().strftime('%H:%M:%S')}",
+        )
+
+    @staticmethod
+    @_typed_lru_cache(maxsize=500, clear_with=(SourceState.cache_clears,))
+    def get_git_log_pages(path_arg: Path | None) -> GitLogPages:
+        # cached per path, reopening a path shows the pages loaded so far
+        pages = GitLogPages()
+        if path_arg is not None:
             source_path_result = Commands.run_read_cmd(
                 cmd=ReadCmd.source_path, path_arg=path_arg
             )
-            results.append(source_path_result)
-            results.append(
-                Commands.run_read_cmd(
-                    cmd=ReadCmd.git_log,
-                    path_arg=Path(source_path_result.std_out),
-                )
-            )
-        return results
+            pages.results.append(source_path_result)
+            pages.source_path = Path(source_path_result.std_out)
+        pages.results.append(Commands.load_git_log_page(pages))
+        return pages
 
     @staticmethod
-    @_typed_lru_cache()
-    def run_chezmoi_diff(diff_cmd: ReadCmd, path: Path) -> CommandResult:
-        return Commands.run_read_cmd(diff_cmd, path_arg=path)
+    def load_git_log_page(pages: GitLogPages) -> CommandResult:
+        with pages.lock:
+            result = Commands._run_git_log_page(pages.source_path, skip=len(pages.rows))
+            if result.returncode == 0:
+                pages.add_page(result.std_out)
+            else:
+                pages.complete = True
+        return result
+
+    @staticmethod
+    @_typed_lru_cache(clear_with=(_dest_file_caches, SourceState.cache_clears))
+    def get_chezmoi_diff(diff_cmd: ReadCmd, path: Path) -> ParsedDiff:
+        # the parsed diff is cached with the command result it was parsed from
+        return parse_diff(Commands.run_read_cmd(diff_cmd, path_arg=path))
+
+    @staticmethod
+    def clear_dest_file_caches() -> None:
+        for cache_clear in _dest_file_caches:
+            cache_clear()
 
 
 class CheckPath:
+    # threads are only started when the first scan is submitted
+    _scan_pool = ThreadPoolExecutor(thread_name_prefix="os_scan_dir")
+
     @staticmethod
-    @_typed_lru_cache(maxsize=1000)
-    def os_scan_dir(dir_path: Path, *, managed_dir: bool = False) -> ScanDirResult:
+    def scan_dirs(
+        dir_paths: Iterable[Path], *, managed_dir: bool = False
+    ) -> Iterator[tuple[Path, ScanDirResult]]:
+        """Yields os_scan_dir results in completion order, scanned in parallel."""
+        futures: dict[Future[ScanDirResult], Path] = {
+            CheckPath._scan_pool.submit(
+                CheckPath._os_scan_dir, dir_path, managed_dir=managed_dir
+            ): dir_path
+            for dir_path in dir_paths
+        }
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # the consumer stopped iterating, don't scan dirs nobody waits for
+            for future in futures:
+                future.cancel()
+
+    @staticmethod
+    def _os_scan_dir(dir_path: Path, *, managed_dir: bool = False) -> ScanDirResult:
 
         if not dir_path.is_absolute():
             raise ValueError(
@@ -342,7 +469,16 @@ class CheckPath:
                 )
             )
 
-        scan_dir_items: list[ScanDirItem] = []
+        # stat before listing, a change during the scan invalidates the entry
+        try:
+            dir_mtime: int | None = dir_path.stat().st_mtime_ns
+        except OSError:
+            dir_mtime = None  # the scan below returns the matching PathKind
+        else:
+            cached = ScanCache.get((dir_path, managed_dir), dir_mtime)
+            if cached is not None:
+                return cached
+
         # str(dir_path) to reduce possible exceptions which would be raised by pathlib
         try:
             with os.scandir(str(dir_path)) as entry_generator:
@@ -359,10 +495,16 @@ class CheckPath:
                 # can happen in ManagedTree scan
                 return PathKind.unman_dir_access_denied
 
-        sibling_count = len(dir_entries)
+        scan_columns = ScanDirColumns(
+            scanned_dir=dir_path,
+            managed_arg=managed_dir,
+            sibling_count=len(dir_entries),
+        )
 
         for de in dir_entries:
             de_path = Path(de.path)
+            if PathMatcher.is_ignored(de_path):
+                continue
             is_dir = de.is_dir()
             is_file = de.is_file()
             is_symlink = de.is_symlink()
@@ -373,112 +515,180 @@ class CheckPath:
                 matches_unwanted = CheckPath.is_unwanted_dir(de_path)
             elif is_file:
                 try:
-                    file_size = de.stat().st_size
+                    # DirEntry caches the result, it's passed on to the checks below
+                    de_stat = de.stat()
                 except OSError:
                     file_size = None
                     matches_unwanted = True
                 else:
-                    matches_unwanted = CheckPath.is_unwanted_file(de_path)
+                    file_size = de_stat.st_size
+                    matches_unwanted = CheckPath.is_unwanted_file(de_path, de_stat)
             else:
                 matches_unwanted = True
 
             if matches_unwanted and managed_dir:
                 continue
 
-            scan_dir_items.append(
-                ScanDirItem(
-                    scanned_dir=dir_path,
-                    managed_arg=managed_dir,
-                    path=de_path,
-                    is_dir=is_dir,
-                    is_file=is_file,
-                    is_symlink=is_symlink,
-                    name=de.name,
-                    file_size=file_size,
-                    sibling_count=sibling_count,
-                    matches_unwanted=matches_unwanted,
-                )
+            scan_columns.add_item(
+                de.name,
+                is_dir=is_dir,
+                is_file=is_file,
+                is_symlink=is_symlink,
+                file_size=file_size,
+                matches_unwanted=matches_unwanted,
             )
-        return scan_dir_items
-
-    # functions for both file and dir paths
+        if dir_mtime is not None:
+            ScanCache.put((dir_path, managed_dir), dir_mtime, scan_columns)
+        return scan_columns
 
     @staticmethod
-    def _looks_like_cache(path: Path) -> bool:
-        path_parts_lower = [p.lower() for p in path.parts]
-        return any(
-            p.startswith("cache") or p.endswith("cache") for p in path_parts_lower
-        )
+    def walk_unmanaged(
+        dir_path: Path,
+        *,
+        managed_dirs: Container[Path],
+        managed_files: Container[Path],
+        limit: int,
+    ) -> Iterator[tuple[list[Path], list[Path]]]:
+        """Breadth first walk yielding the unmanaged dirs and files per directory.
+
+        Unwanted directories are listed but not descended into, the walk stops as
+        soon as both limits are reached.
+        """
+        dir_count = file_count = 0
+        to_scan: deque[Path] = deque([dir_path])
+        while to_scan and (dir_count < limit or file_count < limit):
+            try:
+                with os.scandir(to_scan.popleft()) as entry_generator:
+                    dir_entries = list(entry_generator)
+            except OSError:
+                continue
+            new_dirs: list[Path] = []
+            new_files: list[Path] = []
+            for de in dir_entries:
+                de_path = Path(de.path)
+                if PathMatcher.is_ignored(de_path):
+                    continue
+                try:
+                    is_dir = de.is_dir()
+                    is_symlink = de.is_symlink()
+                except OSError:
+                    continue
+                if is_dir:
+                    if not (
+                        is_symlink
+                        or PathMatcher.is_unwanted_dir_path(de_path)
+                        or CheckPath._is_git_objects_dir(de_path)
+                    ):
+                        to_scan.append(de_path)
+                    if dir_count < limit and de_path not in managed_dirs:
+                        new_dirs.append(de_path)
+                        dir_count += 1
+                elif file_count < limit and de_path not in managed_files:
+                    new_files.append(de_path)
+                    file_count += 1
+            if new_dirs or new_files:
+                yield new_dirs, new_files
+
+    # functions for both file and dir paths
 
     # functions for file paths
 
     @staticmethod
-    @_typed_lru_cache(maxsize=4000)
-    def _is_sensitive(file_path: Path) -> bool:
-        return (
-            file_path.suffix in PathFilters.KEY_FILE_EXTENSIONS.value
-            or file_path.parts[-1] in PathFilters.KEY_FILE_NAMES.value
-        )
+    def _is_large(file_stat: os.stat_result) -> bool:
+        return file_stat.st_size > 512 * 1024  # half a megabyte
 
     @staticmethod
-    def _is_large(file_path: Path) -> bool:
+    def _is_binary_data(data: bytes) -> bool:
+        if not data:
+            return False  # empty files are not considered binary
+
+        # C-level scan for NUL and other control bytes, allowing tab, LF and CR
+        if len(data.translate(None, CONTROL_BYTES)) != len(data):
+            return True
+
         try:
-            return file_path.stat().st_size > 512 * 1024  # half a megabyte
-        except OSError:
-            return True  # if we can't stat it, return True to treat it as unwanted
+            data.decode("utf-8")  # a BOM is valid UTF-8 as well
+        except UnicodeDecodeError as error:
+            # the read can cut a multi-byte character in half at the end
+            return error.reason != "unexpected end of data"
+
+        return False  # no control characters and valid UTF-8, likely text
 
     @staticmethod
-    def _is_binary(file_path: Path) -> bool:
+    def is_binary(file_path: Path, file_stat: os.stat_result) -> bool:
+        key = stat_key(file_stat)
+        cached = SniffCache.get(key)
+        if cached is not None:
+            return cached
+
         try:
             with file_path.open("rb") as f:
                 data = f.read(1024)
         except OSError:
             return True  # if we can't read it, return True to treat it as unwanted
 
-        if not data:
-            return False  # empty files are not considered binary
+        is_binary = CheckPath._is_binary_data(data)
+        SniffCache.put(key, is_binary)
+        return is_binary
 
-        if b"\x00" in data:
-            return True  # null byte found, likely binary
+    @staticmethod
+    def is_unwanted_file(
+        file_path: Path, file_stat: os.stat_result | None = None
+    ) -> bool:
+        # Pass the stat result when it's already known, so the file is not stat'ed
+        # again, for example from an os.DirEntry
+        if PathMatcher.is_unwanted_file_path(file_path):
+            return True
+        if file_stat is None:
+            try:
+                file_stat = file_path.stat()
+            except OSError:
+                return True  # if we can't stat it, return True to treat it as unwanted
+        return CheckPath._is_large(file_stat) or CheckPath.is_binary(
+            file_path, file_stat
+        )
 
+    @staticmethod
+    def _is_unwanted_entry(dir_entry: os.DirEntry[str], *, is_dir: bool) -> bool:
+        # DirEntry caches its stat result, the entry is stat'ed at most once
+        entry_path = Path(dir_entry.path)
+        if is_dir:
+            return CheckPath.is_unwanted_dir(entry_path)
         try:
-            text = data.decode("utf-8-sig")  # decode with BOM handling
-        except UnicodeDecodeError:
-            return True  # likely binary
-
-        for char in text:
-            if char in "\t\n\r":
-                continue  # allow common whitespace characters
-
-            code = ord(char)
-            if 32 <= code <= 126 or code >= 127:
-                continue  # allow printable ASCII and extended characters
-
-            return True  # non-printable character found, likely binary
-
-        return False  # no non-printable characters found, likely text
+            entry_stat = dir_entry.stat()
+        except OSError:
+            return True
+        return CheckPath.is_unwanted_file(entry_path, entry_stat)
 
     @staticmethod
-    def _is_bad_suffix(file_path: Path) -> bool:
-        return file_path.suffix in PathFilters.UNWANTED_FILE_SUFFIXES.value
+    def is_unwanted_name(path: Path, *, is_dir: bool) -> bool:
+        # cheap rules which don't touch the file system
+        if is_dir:
+            return PathMatcher.is_unwanted_dir_path(
+                path
+            ) or CheckPath._is_git_objects_dir(path)
+        return PathMatcher.is_unwanted_file_path(path)
 
     @staticmethod
-    @_typed_lru_cache(maxsize=4000)
-    def is_unwanted_file(file_path: Path) -> bool:
-        return (
-            CheckPath._looks_like_cache(file_path)
-            or CheckPath._is_sensitive(file_path)
-            or CheckPath._is_bad_suffix(file_path)
-            or CheckPath._is_large(file_path)
-            or CheckPath._is_binary(file_path)
-        )
+    def classify_entries(
+        entries: Iterable[tuple[os.DirEntry[str], bool]],
+    ) -> Iterator[tuple[Path, bool]]:
+        """Yields (path, is_unwanted) in completion order, checked in parallel."""
+        futures: dict[Future[bool], Path] = {
+            CheckPath._scan_pool.submit(
+                CheckPath._is_unwanted_entry, dir_entry, is_dir=is_dir
+            ): Path(dir_entry.path)
+            for dir_entry, is_dir in entries
+        }
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
 
     # functions for dir paths
 
-    @staticmethod
-    def _is_unwanted_dir_name(dir_path: Path) -> bool:
-        return dir_path.parts[-1] in PathFilters.UNWANTED_DIRS.value
-
     @staticmethod
     def _is_git_objects_dir(dir_path: Path) -> bool:
         return dir_path.parts[-1] == "objects" and dir_path.parts[-2] == ".git"
@@ -500,8 +710,7 @@ class CheckPath:
     @_typed_lru_cache(maxsize=4000)
     def is_unwanted_dir(dir_path: Path) -> bool:
         return (
-            CheckPath._looks_like_cache(dir_path)
-            or CheckPath._is_unwanted_dir_name(dir_path)
+            PathMatcher.is_unwanted_dir_path(dir_path)
             or CheckPath._is_git_objects_dir(dir_path)
             or CheckPath._dir_has_many_children(dir_path)
         )
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from chezmoi_mousse.named_tuples import GitLogRow
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from chezmoi_mousse.named_tuples import CommandResult
+
+__all__ = ["GIT_LOG_PAGE_SIZE", "GitLogPages"]
+
+GIT_LOG_PAGE_SIZE = 100
+
+
+@dataclass(slots=True)
+class GitLogPages:
+    """Parsed git log rows for a path, extended one page at a time."""
+
+    # None for the log of the whole source dir
+    source_path: Path | None = None
+    rows: list[GitLogRow] = field(default_factory=lambda: [])
+    complete: bool = False
+    # the commands run to get the first page
+    results: list[CommandResult] = field(default_factory=lambda: [])
+    # views of different tabs can load the next page of the same path
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def add_page(self, std_out: str) -> None:
+        page_rows = 0
+        for line in std_out.split("\x00"):
+            line = line.strip("\n")
+            if not line:
+                continue
+            rel_date, committer, subject = line.split("\x1f", 2)
+            self.rows.append(GitLogRow(rel_date, committer, subject))
+            page_rows += 1
+        if page_rows < GIT_LOG_PAGE_SIZE:
+            self.complete = True
@@ -1,13 +1,11 @@
 from __future__ import annotations
 
-from textual.containers import Container
 from textual.widgets import Label, Static
 
 from chezmoi_mousse.str_enums import SectionLabel, Tcss
 
 __all__ = [
     "CatConfigStatic",
-    "DiffLinesContainer",
     "FlatSectionLabel",
     "HighlightedStatic",
     "InfoStatic",
@@ -39,18 +37,9 @@ class SubSectionLabel(Label):
 class CatConfigStatic(Static): ...
 
 
-class DiffLineStatic(Static): ...
-
-
 class InfoStatic(Static):
     def __init__(self, text: str = "") -> None:
         super().__init__(text, classes=Tcss.info)
 
 
 class HighlightedStatic(Static): ...
-
-
-# Container subclasses
-
-
-class DiffLinesContainer(Container): ...
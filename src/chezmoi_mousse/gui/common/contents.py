@@ -3,12 +3,18 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from textual import getters
+from rich.highlighter import ReprHighlighter
+from rich.text import Text
+from textual import getters, work
 from textual.app import ComposeResult
 from textual.containers import ScrollableContainer
+from textual.geometry import Size
 from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
 
-from chezmoi_mousse.functions import Commands
+from chezmoi_mousse.functions import CheckPath, Commands
+from chezmoi_mousse.mapped_file import MappedFile
 from chezmoi_mousse.str_enums import (
     PathKind,
     SectionLabel,
@@ -30,6 +36,103 @@ if TYPE_CHECKING:
 
 __all__ = ["ContentsView"]
 
+# larger files are memory mapped and only the visible lines are highlighted
+MAPPED_FILE_SIZE = 256 * 1024
+# lines above and below the visible lines which are highlighted in advance
+WINDOW_MARGIN = 50
+
+
+class FileLines(ScrollView, can_focus=True):
+    """Renders a memory mapped file with the Line API.
+
+    The line index is built in a worker, only a window of lines around the
+    visible lines is read and highlighted.
+    """
+
+    if TYPE_CHECKING:
+        app = getters.app(ChezmoiGui)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._file: MappedFile | None = None
+        self._line_count = 0
+        self._max_width = 0
+        self._window_start = 0
+        self._strips: list[Strip] = []
+
+    def open_file(self, file_path: Path) -> None:
+        mapped_file = MappedFile(file_path)
+        self.close_file()
+        self._file = mapped_file
+        self._update_size(0)
+        self.scroll_to(0, 0, animate=False)
+        self._index_lines(mapped_file)
+
+    def close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._line_count = 0
+        self._max_width = 0
+        self._strips = []
+
+    @work(thread=True, exclusive=True, group="index_lines")
+    def _index_lines(self, mapped_file: MappedFile) -> None:
+        for line_count in mapped_file.index_lines():
+            self.app.call_from_thread(self._set_line_count, mapped_file, line_count)
+
+    def _set_line_count(self, mapped_file: MappedFile, line_count: int) -> None:
+        if mapped_file is not self._file:
+            return  # another file was opened while indexing
+        if len(self._strips) < self.size.height + 2 * WINDOW_MARGIN:
+            self._strips = []  # the window can contain more lines now
+        self._update_size(line_count)
+
+    def _update_size(self, line_count: int) -> None:
+        self._line_count = line_count
+        self.virtual_size = Size(self._max_width, line_count)
+        self.refresh()
+
+    def _load_window(self, line_index: int) -> None:
+        assert self._file is not None
+        self._window_start = max(line_index - WINDOW_MARGIN, 0)
+        lines = self._file.read_lines(
+            self._window_start, self.size.height + 2 * WINDOW_MARGIN
+        )
+        highlighter = ReprHighlighter()
+        console = self.app.console
+        self._strips = []
+        for line in lines:
+            text = Text(line.expandtabs(), end="")
+            highlighter.highlight(text)
+            self._strips.append(Strip(text.render(console)))
+        max_width = max((strip.cell_length for strip in self._strips), default=0)
+        if max_width > self._max_width:
+            self._max_width = max_width
+            self.virtual_size = Size(max_width, self._line_count)
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.scrollable_content_region.width
+        style = self.rich_style
+        line_index = scroll_y + y
+        if self._file is None or line_index >= self._line_count:
+            return Strip.blank(width, style)
+        window_index = line_index - self._window_start
+        if not 0 <= window_index < len(self._strips):
+            self._load_window(line_index - y)
+            window_index = line_index - self._window_start
+            if window_index >= len(self._strips):
+                return Strip.blank(width, style)
+        return (
+            self._strips[window_index]
+            .apply_style(style)
+            .crop_extend(scroll_x, scroll_x + width, style)
+        )
+
+    def on_unmount(self) -> None:
+        self.close_file()
+
 
 class ContentsView(ScrollableContainer):
     if TYPE_CHECKING:
@@ -45,11 +148,14 @@ class ContentsView(ScrollableContainer):
         yield MainSectionLabel()
         yield SubSectionLabel()
         yield HighlightedStatic()
+        yield FileLines()
 
     def on_mount(self) -> None:
         self.highlighted_static = self.query_exactly_one(HighlightedStatic)
         self.main_section_label = self.query_exactly_one(MainSectionLabel)
         self.sub_section_label = self.query_exactly_one(SubSectionLabel)
+        self.file_lines = self.query_exactly_one(FileLines)
+        self.file_lines.display = False
 
         self.sub_section_label.update()
 
@@ -84,7 +190,28 @@ class ContentsView(ScrollableContainer):
             elif self._managed_paths.no_status_paths:
                 label = SectionLabel.no_status_paths
         self.sub_section_label.update(label)
-        self.highlighted_static.update(StaticString.click_file_for_contents)
+        self._show_highlighted_static(StaticString.click_file_for_contents)
+
+    def _show_highlighted_static(self, contents: Text | str) -> None:
+        self.file_lines.close_file()
+        self.file_lines.display = False
+        self.highlighted_static.update(contents)
+        self.highlighted_static.display = True
+
+    def _show_mapped_file(self, path: Path) -> bool:
+        try:
+            file_stat = path.stat()
+            if file_stat.st_size <= MAPPED_FILE_SIZE:
+                return False
+            if CheckPath.is_binary(path, file_stat):
+                self._show_highlighted_static(StaticString.cannot_decode)
+                return True
+            self.file_lines.open_file(path)
+        except (OSError, ValueError):
+            return False  # the error is shown by get_highlighted_file_contents
+        self.highlighted_static.display = False
+        self.file_lines.display = True
+        return True
 
     def _create_file_container(self, path: Path) -> None:
         self.sub_section_label.update(SectionLabel.not_set)
@@ -95,11 +222,12 @@ class ContentsView(ScrollableContainer):
         if self.app.cmattr.paths.managed_files.get(path) is PathKind.EXISTS_FALSE:
             f_content, cmd_result = Commands.get_highlighted_chezmoi_cat_output(path)
             self.post_message(LogCmdResultMsg([cmd_result]))
-            self.highlighted_static.update(f_content)
+            self._show_highlighted_static(f_content)
             self.sub_section_label.update(SectionLabel.chezmoi_cat_output)
         else:
-            f_content = Commands.get_highlighted_file_contents(path)
-            self.highlighted_static.update(f_content)
+            if not self._show_mapped_file(path):
+                f_content = Commands.get_highlighted_file_contents(path)
+                self._show_highlighted_static(f_content)
             self.sub_section_label.update(SectionLabel.read_file_output)
 
     def watch_show_path(self, show_path: Path | None) -> None:
@@ -1,17 +1,20 @@
 from __future__ import annotations
 
-from itertools import groupby
-from typing import TYPE_CHECKING
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, ClassVar
 
-from textual import getters
-from textual.app import ComposeResult
-from textual.containers import ScrollableContainer
+from rich.segment import Segment
+from textual import getters, work
+from textual.containers import Vertical
+from textual.geometry import Size
 from textual.reactive import reactive
-from textual.widgets import Label, Static
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
 
 from chezmoi_mousse.functions import Commands
-from chezmoi_mousse.named_tuples import CommandResult
 from chezmoi_mousse.str_enums import (
+    Chars,
+    DiffLineKind,
     ReadCmd,
     SectionLabel,
     StaticString,
@@ -20,7 +23,6 @@ from chezmoi_mousse.str_enums import (
 )
 
 from .components import (
-    DiffLinesContainer,
     FlatSectionLabel,
     InfoStatic,
     MainSectionLabel,
@@ -31,27 +33,147 @@ from .messages import LogCmdResultMsg
 if TYPE_CHECKING:
     from pathlib import Path
 
+    from rich.style import Style
+    from textual import events
+    from textual.app import ComposeResult
+
     from chezmoi_mousse.app_ids import AppIds
+    from chezmoi_mousse.diff_model import ParsedDiff
     from chezmoi_mousse.gui.textual_app import ChezmoiGui
     from chezmoi_mousse.named_tuples import ManagedTreePaths
 
 __all__ = ["DiffView"]
 
 DIFF_TCSS = {
-    " ": Tcss.context,
-    "@@": Tcss.context,
-    "index": Tcss.context,
-    "-": Tcss.removed,
-    "deleted": Tcss.removed,
-    "old": Tcss.removed,
-    "+": Tcss.added,
-    "new": Tcss.added,
-    "changed": Tcss.changed,
-    "unhandled": Tcss.unhandled,
+    DiffLineKind.added: Tcss.added,
+    DiffLineKind.changed: Tcss.changed,
+    DiffLineKind.context: Tcss.context,
+    DiffLineKind.file_header: Tcss.context,
+    DiffLineKind.header: Tcss.context,
+    DiffLineKind.hunk_header: Tcss.context,
+    DiffLineKind.removed: Tcss.removed,
+    DiffLineKind.unhandled: Tcss.unhandled,
+}
+WORDS_TCSS = {
+    DiffLineKind.added: Tcss.added_words,
+    DiffLineKind.removed: Tcss.removed_words,
 }
 
+# unchanged lines kept visible around a folded run of context lines
+FOLD_KEEP = 3
+FOLD_MIN = 4  # don't fold runs which would hide fewer lines
+
+
+@dataclass(slots=True)
+class _Fold:
+    start: int  # index of the first hidden line
+    end: int
+
+
+class DiffLines(ScrollView, can_focus=True):
+    """Renders a parsed diff with the Line API, only visible rows are rendered.
+
+    Runs of unchanged lines are folded, clicking a fold shows the hidden lines.
+    """
+
+    COMPONENT_CLASSES: ClassVar[set[str]] = {
+        Tcss.added,
+        Tcss.added_words,
+        Tcss.changed,
+        Tcss.context,
+        Tcss.folded_context,
+        Tcss.removed,
+        Tcss.removed_words,
+        Tcss.unhandled,
+    }
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._diff: ParsedDiff | None = None
+        self._rows: list[int | _Fold] = []
+        self._unfolded: set[int] = set()
+
+    def set_diff(self, parsed_diff: ParsedDiff) -> None:
+        if parsed_diff is self._diff:
+            return
+        self._diff = parsed_diff
+        self._unfolded.clear()
+        self._update_rows()
+        self.scroll_to(0, 0, animate=False)
+
+    def _update_rows(self) -> None:
+        if self._diff is None:
+            return
+        kinds = self._diff.kinds
+        rows: list[int | _Fold] = []
+        line_count = len(kinds)
+        i = 0
+        while i < line_count:
+            if kinds[i] != DiffLineKind.context:
+                rows.append(i)
+                i += 1
+                continue
+            run_end = i
+            while run_end < line_count and kinds[run_end] == DiffLineKind.context:
+                run_end += 1
+            fold = _Fold(start=i + FOLD_KEEP, end=run_end - FOLD_KEEP)
+            if fold.end - fold.start < FOLD_MIN or fold.start in self._unfolded:
+                rows.extend(range(i, run_end))
+            else:
+                rows.extend(range(i, fold.start))
+                rows.append(fold)
+                rows.extend(range(fold.end, run_end))
+            i = run_end
+        self._rows = rows
+        self.virtual_size = Size(self._diff.max_width, len(rows))
+        self.refresh()
+
+    def _line_segments(self, line_index: int) -> tuple[list[Segment], Style]:
+        assert self._diff is not None
+        text = self._diff.line_text(line_index)
+        kind = self._diff.kinds[line_index]
+        style = self.get_component_rich_style(DIFF_TCSS[kind])
+        spans = self._diff.word_spans(line_index) if kind in WORDS_TCSS else []
+        if not spans:
+            return [Segment(text, style)], style
+        words_style = self.get_component_rich_style(WORDS_TCSS[kind])
+        segments: list[Segment] = []
+        position = 0
+        for start, end in spans:
+            segments.append(Segment(text[position:start], style))
+            segments.append(Segment(text[start:end], words_style))
+            position = end
+        segments.append(Segment(text[position:], style))
+        return segments, style
 
-class DiffView(ScrollableContainer):
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.scrollable_content_region.width
+        row_index = scroll_y + y
+        if row_index >= len(self._rows):
+            return Strip.blank(width, self.rich_style)
+        row = self._rows[row_index]
+        if isinstance(row, _Fold):
+            text = f"{Chars.horizontal_ellipsis} {row.end - row.start} unchanged lines"
+            style = self.get_component_rich_style(Tcss.folded_context)
+            segments = [Segment(text, style)]
+        else:
+            segments, style = self._line_segments(row)
+        return Strip(segments).crop_extend(scroll_x, scroll_x + width, style)
+
+    def on_click(self, event: events.Click) -> None:
+        offset = event.get_content_offset(self)
+        if offset is None:
+            return
+        row_index = offset.y + self.scroll_offset.y
+        if row_index < len(self._rows):
+            row = self._rows[row_index]
+            if isinstance(row, _Fold):
+                self._unfolded.add(row.start)
+                self._update_rows()
+
+
+class DiffView(Vertical):
     if TYPE_CHECKING:
         app = getters.app(ChezmoiGui)
 
@@ -71,7 +193,7 @@ class DiffView(ScrollableContainer):
         yield SubSectionLabel()
         yield FlatSectionLabel()
         yield InfoStatic()
-        yield DiffLinesContainer()
+        yield DiffLines()
 
     def on_mount(self) -> None:
         self.info_static = self.query_exactly_one(InfoStatic)
@@ -80,7 +202,7 @@ class DiffView(ScrollableContainer):
 
         self.flat_section_label = self.query_exactly_one(FlatSectionLabel)
         self.flat_section_label.display = False
-        self.diff_lines = self.query_exactly_one(DiffLinesContainer)
+        self.diff_lines = self.query_exactly_one(DiffLines)
         self.diff_lines.display = False
 
         self._update_widgets(self.app.cmattr.dest_dir)
@@ -96,21 +218,8 @@ class DiffView(ScrollableContainer):
     def _update_widgets(self, path: Path) -> None:
 
         if path in self.paths.status_paths_set:
-            diff_result = Commands.run_chezmoi_diff(self.diff_cmd, path)
-            self.post_message(LogCmdResultMsg([diff_result]))
-
-            self.main_section_label.update(str(diff_result.full_cmd))
-
-            self.diff_lines.remove_children()
-            self.diff_lines.mount_all(self._create_diff_widgets(diff_result))
-            self.flat_section_label.update(diff_result.std_out.splitlines().pop(0))
-
-            self.diff_lines.display = True
-            self.flat_section_label.display = True
-            self.sub_section_label.display = False
-            self.info_static.display = False
+            self._load_diff(path)
             return
-
         if path == self.app.cmattr.dest_dir:
             self.main_section_label.update(SectionLabel.dest_dir)
             if self.app.cmattr.paths.no_managed_paths:
@@ -145,30 +254,28 @@ class DiffView(ScrollableContainer):
         self.sub_section_label.display = True
         self.info_static.display = True
 
-    def _create_diff_widgets(self, diff_result: CommandResult) -> list[Static]:
-        widgets: list[Label | Static] = []
-
-        def get_prefix(line: str) -> str:
-            for p in DIFF_TCSS:
-                if line.startswith(p):
-                    return p
-            return "unhandled"
-
-        for prefix, group_lines in groupby(
-            diff_result.std_out.splitlines(), key=get_prefix
-        ):
-            group_list = list(group_lines)
-            if prefix in ("+", "-"):
-                text = "\n".join(group_list)
-                widgets.append(
-                    Static(text, classes=DIFF_TCSS[prefix].value, markup=False)
-                )
-            else:
-                for line in group_list:
-                    widgets.append(
-                        Static(line, classes=DIFF_TCSS[prefix].value, markup=False)
-                    )
-        return widgets
+    @work(thread=True, exclusive=True, group="load_diff")
+    def _load_diff(self, path: Path) -> None:
+        # running chezmoi and parsing its output happen off the UI thread
+        parsed_diff = Commands.get_chezmoi_diff(self.diff_cmd, path)
+        self.app.call_from_thread(self._show_diff, path, parsed_diff)
+
+    def _show_diff(self, path: Path, parsed_diff: ParsedDiff) -> None:
+        if path != self.show_path:
+            return  # another path was selected while loading
+        diff_result = parsed_diff.result
+        self.post_message(LogCmdResultMsg([diff_result]))
+
+        self.main_section_label.update(str(diff_result.full_cmd))
+        self.diff_lines.set_diff(parsed_diff)
+        self.flat_section_label.update(
+            parsed_diff.line_text(0) if len(parsed_diff) else ""
+        )
+
+        self.diff_lines.display = True
+        self.flat_section_label.display = True
+        self.sub_section_label.display = False
+        self.info_static.display = False
 
     def watch_show_path(self, show_path: Path | None) -> None:
         if show_path is None:
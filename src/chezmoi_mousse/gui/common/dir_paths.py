@@ -1,14 +1,14 @@
 from __future__ import annotations
 
-import os
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from textual import getters
+from textual import getters, work
 from textual.containers import Container, ScrollableContainer
 from textual.reactive import reactive
 from textual.widgets import Label, Static
 
+from chezmoi_mousse.functions import CheckPath
 from chezmoi_mousse.str_enums import SectionLabel, TabLabel, Tcss
 
 from .actionables import DirContentBtn
@@ -30,6 +30,8 @@ class DirPathsView(Container):
 
     def __init__(self, ids: AppIds) -> None:
         self.app_ids = ids
+        # bumped for each selected path, a running walk stops when it changes
+        self.walk_generation = 0
         super().__init__(id=ids.container.contents)
 
     @property
@@ -49,72 +51,93 @@ class DirPathsView(Container):
             widgets.append(
                 Static("<- Click a directory path to see its paths.", classes=Tcss.info)
             )
-        unmanaged_dirs: list[str] = []
-        unmanaged_files: list[str] = []
-
-        limited_dirs = False
-        limited_files = False
-
-        for root, dirs, _ in os.walk(dir_path):
-            root_path = Path(root)
-
-            for name in dirs:
-                path = root_path / name
-                if path not in self.paths.managed_dirs:
-                    unmanaged_dirs.append(
-                        str(path.relative_to(self.app.cmattr.dest_dir))
-                    )
-                    if len(unmanaged_dirs) >= OUTPUT_LIMIT:
-                        limited_dirs = True
-                        break
-            if limited_dirs:
-                break
-
-        for root, _, files in os.walk(dir_path):
-            root_path = Path(root)
-            for name in files:
-                path = root_path / name
-                if path not in self.paths.managed_files:
-                    unmanaged_files.append(
-                        str(path.relative_to(self.app.cmattr.dest_dir))
-                    )
-                    if len(unmanaged_files) >= OUTPUT_LIMIT:
-                        limited_files = True
-                        break
-            if limited_files:
-                break
-
-        unmanaged_dirs.sort()
-        unmanaged_files.sort()
-
-        if unmanaged_dirs:
-            widgets.append(
-                Label("Contains unmanaged directories", classes=Tcss.sub_section_label)
+        self.unmanaged_dirs: list[str] = []
+        self.unmanaged_files: list[str] = []
+        self.dirs_label = Label(
+            "Contains unmanaged directories", classes=Tcss.sub_section_label
+        )
+        self.dirs_static = Static(classes=Tcss.info)
+        self.files_label = Label(
+            "Contains unmanaged files", classes=Tcss.sub_section_label
+        )
+        self.files_static = Static(classes=Tcss.info)
+        for widget in (
+            self.dirs_label,
+            self.dirs_static,
+            self.files_label,
+            self.files_static,
+        ):
+            widget.display = False
+        self.walk_status = Static("Looking for unmanaged paths...", classes=Tcss.info)
+        widgets.extend(
+            (
+                self.dirs_label,
+                self.dirs_static,
+                self.files_label,
+                self.files_static,
+                self.walk_status,
             )
-            widgets.append(Static("\n".join(unmanaged_dirs), classes=Tcss.info))
-            if limited_dirs:
-                widgets.append(
-                    Label(
-                        f"Limited output to {OUTPUT_LIMIT} unmanaged directories",
-                        classes=Tcss.limited_label,
-                    )
-                )
-        if unmanaged_files:
-            widgets.append(
-                Label("Contains unmanaged files", classes=Tcss.sub_section_label)
+        )
+        self._walk_unmanaged(dir_path, self.walk_generation)
+        return ScrollableContainer(*widgets)
+
+    @work(thread=True, group="walk_unmanaged")
+    def _walk_unmanaged(self, dir_path: Path, generation: int) -> None:
+        for new_dirs, new_files in CheckPath.walk_unmanaged(
+            dir_path,
+            managed_dirs=self.paths.managed_dirs,
+            managed_files=self.paths.managed_files,
+            limit=OUTPUT_LIMIT,
+        ):
+            if generation != self.walk_generation:
+                return  # another path was selected, stop walking
+            self.app.call_from_thread(
+                self._add_walk_batch, generation, new_dirs, new_files
             )
-            widgets.append(Static("\n".join(unmanaged_files), classes=Tcss.info))
-            if limited_files:
-                widgets.append(
-                    Label(
-                        f"Limited output to {OUTPUT_LIMIT} unmanaged files",
-                        classes=Tcss.limited_label,
-                    )
-                )
+        self.app.call_from_thread(self._finish_walk, generation)
 
-        if not unmanaged_dirs and not unmanaged_files:
-            widgets.append(Static("No unmanaged paths in this directory."))
-        return ScrollableContainer(*widgets)
+    def _add_walk_batch(
+        self, generation: int, new_dirs: list[Path], new_files: list[Path]
+    ) -> None:
+        if generation != self.walk_generation:
+            return
+        dest_dir = self.app.cmattr.dest_dir
+        if new_dirs:
+            self.unmanaged_dirs.extend(str(p.relative_to(dest_dir)) for p in new_dirs)
+            self.unmanaged_dirs.sort()
+            self.dirs_static.update("\n".join(self.unmanaged_dirs))
+            self.dirs_label.display = True
+            self.dirs_static.display = True
+        if new_files:
+            self.unmanaged_files.extend(str(p.relative_to(dest_dir)) for p in new_files)
+            self.unmanaged_files.sort()
+            self.files_static.update("\n".join(self.unmanaged_files))
+            self.files_label.display = True
+            self.files_static.display = True
+
+    def _finish_walk(self, generation: int) -> None:
+        if generation != self.walk_generation:
+            return
+        self.walk_status.display = False
+        container = self.query_exactly_one(ScrollableContainer)
+        if len(self.unmanaged_dirs) >= OUTPUT_LIMIT:
+            container.mount(
+                Label(
+                    f"Limited output to {OUTPUT_LIMIT} unmanaged directories",
+                    classes=Tcss.limited_label,
+                ),
+                after=self.dirs_static,
+            )
+        if len(self.unmanaged_files) >= OUTPUT_LIMIT:
+            container.mount(
+                Label(
+                    f"Limited output to {OUTPUT_LIMIT} unmanaged files",
+                    classes=Tcss.limited_label,
+                ),
+                after=self.files_static,
+            )
+        if not self.unmanaged_dirs and not self.unmanaged_files:
+            container.mount(Static("No unmanaged paths in this directory."))
 
     def _create_managed_dir_container(self, dir_path: Path) -> ScrollableContainer:
         widgets: list[Static | Label | DirContentBtn] = []
@@ -154,6 +177,7 @@ class DirPathsView(Container):
     def watch_show_path(self, show_path: Path | None) -> None:
         if show_path is None:
             return
+        self.walk_generation += 1  # stops a walk for the previous path
         self.remove_children()
         if self.app_ids.tab_label == TabLabel.add and (
             show_path == self.app.cmattr.dest_dir or show_path.is_dir()
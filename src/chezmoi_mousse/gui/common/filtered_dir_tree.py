@@ -1,18 +1,25 @@
 from __future__ import annotations
 
 import os
+import time
 from collections.abc import Iterable
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from textual import getters
+from textual import getters, work
 from textual.reactive import reactive
 from textual.widgets import DirectoryTree
+from textual.widgets.directory_tree import DirEntry
 
 from chezmoi_mousse.functions import CheckPath
+from chezmoi_mousse.named_tuples import DirTreeEntry
+from chezmoi_mousse.path_matcher import PathMatcher
 from chezmoi_mousse.str_enums import Chars
 
 if TYPE_CHECKING:
+    from textual.await_complete import AwaitComplete
+    from textual.widgets.tree import TreeNode
+
     from chezmoi_mousse.gui.textual_app import ChezmoiGui
 
 __all__ = ["FilteredDirTree"]
@@ -32,6 +39,11 @@ class FilteredDirTree(DirectoryTree):
     show_unwanted: reactive[bool] = reactive(False, init=False)
 
     def __init__(self, *, dest_dir: Path) -> None:
+        # resolved node paths, the loader lists the resolved path of a directory
+        self._dir_keys: dict[Path, Path] = {}
+        # classification of the children of each loaded directory, also when the
+        # filters hide all of them and the loader doesn't populate the node
+        self._children_by_dir: dict[Path, dict[Path, DirTreeEntry]] = {}
         super().__init__(dest_dir)
 
     def on_mount(self) -> None:
@@ -64,15 +76,196 @@ class FilteredDirTree(DirectoryTree):
             case (True, True):  # show_managed is ON, show_unwanted is ON
                 return True  # Always show the path, no second pass needed
 
+    def reload(self) -> AwaitComplete:
+        self._dir_keys.clear()
+        self._children_by_dir.clear()
+        return super().reload()
+
+    def _dir_key(self, node: TreeNode[DirEntry]) -> Path | None:
+        if node.data is None or not node.data.loaded:
+            return None
+        dir_key = self._dir_keys.get(node.data.path)
+        if dir_key is None:
+            dir_key = node.data.path.expanduser().resolve()
+            self._dir_keys[node.data.path] = dir_key
+        return dir_key
+
+    def _dir_node(self, dir_key: Path) -> TreeNode[DirEntry] | None:
+        to_visit: list[TreeNode[DirEntry]] = [self.root]
+        while to_visit:
+            node = to_visit.pop()
+            if self._dir_key(node) == dir_key:
+                return node
+            to_visit.extend(node.children)
+        return None
+
+    def _forget_nodes(self, node: TreeNode[DirEntry]) -> None:
+        # drop the stored classification of a subtree before its nodes are removed
+        to_visit = [node]
+        while to_visit:
+            visiting = to_visit.pop()
+            dir_key = self._dir_key(visiting)
+            if dir_key is not None:
+                self._children_by_dir.pop(dir_key, None)
+            to_visit.extend(visiting.children)
+
+    def _remove_node(self, node: TreeNode[DirEntry]) -> None:
+        self._forget_nodes(node)
+        node.remove()
+
+    @staticmethod
+    def _scan_dir(dir_path: Path) -> dict[str, os.DirEntry[str]]:
+        # DirEntry objects carry the d_type and cache their stat result
+        try:
+            with os.scandir(dir_path) as entries:
+                return {entry.name: entry for entry in entries}
+        except OSError:
+            return {}
+
     def filter_paths(self, paths: Iterable[Path]) -> Iterable[Path]:
-        filter_paths: set[Path] = set()
-        for p in paths:
-            is_dir = p.is_dir()
+        # Runs in the loader thread. Only the cheap name based rules are applied
+        # here, the size and contents checks run once the node is populated.
+        listed = list(paths)
+        if not listed:
+            return listed
+        dir_key = listed[0].parent
+        dir_entries = self._scan_dir(dir_key)
+        children: dict[Path, DirTreeEntry] = {}
+        for p in listed:
+            if PathMatcher.is_ignored(p):
+                continue  # chezmoi won't add it, whatever the filters
             is_managed = bool(p in self.app.cmattr.paths.managed_paths_set)
-            if is_dir:
-                is_unwanted = CheckPath.is_unwanted_dir(p)
+            dir_entry = dir_entries.get(p.name)
+            if dir_entry is None:
+                is_dir = p.is_dir()
+                if is_dir:
+                    is_unwanted = CheckPath.is_unwanted_dir(p)
+                else:
+                    is_unwanted = CheckPath.is_unwanted_file(p)
             else:
-                is_unwanted = CheckPath.is_unwanted_file(p)
-            if self._should_show_path(is_managed, is_unwanted):
-                filter_paths.add(p)
-        return filter_paths
+                try:
+                    is_dir = dir_entry.is_dir()
+                except OSError:
+                    is_dir = False
+                is_unwanted = CheckPath.is_unwanted_name(p, is_dir=is_dir)
+            children[p] = DirTreeEntry(
+                dir_entry=dir_entry,
+                is_dir=is_dir,
+                is_managed=is_managed,
+                is_unwanted=is_unwanted,
+                # a path matching a name rule is unwanted whatever its contents
+                checked=dir_entry is None or is_unwanted,
+            )
+        # kept for the in-memory filtering when the switches change
+        self._children_by_dir[dir_key] = children
+        self.app.call_from_thread(self._check_children, dir_key)
+        return [path for path, entry in children.items() if self._is_shown(entry)]
+
+    def _is_shown(self, entry: DirTreeEntry) -> bool:
+        return self._should_show_path(entry.is_managed, entry.is_unwanted)
+
+    def _needs_check(self, entry: DirTreeEntry) -> bool:
+        # the other checks only matter if they can hide the path
+        return not entry.checked and self._should_show_path(
+            entry.is_managed, False
+        ) != self._should_show_path(entry.is_managed, True)
+
+    @work(group="check_children")
+    async def _check_children(self, dir_key: Path) -> None:
+        # the loader populates the node while it holds the lock
+        async with self.lock:
+            node = self._dir_node(dir_key)
+        if node is None:
+            return
+        to_check = [
+            (entry.dir_entry, entry.is_dir)
+            for entry in self._children_by_dir.get(dir_key, {}).values()
+            if entry.dir_entry is not None and self._needs_check(entry)
+        ]
+        if to_check:
+            self._classify_children(node, dir_key, to_check)
+
+    @work(thread=True, group="classify_children")
+    def _classify_children(
+        self,
+        node: TreeNode[DirEntry],
+        dir_key: Path,
+        entries: list[tuple[os.DirEntry[str], bool]],
+    ) -> None:
+        results: dict[Path, bool] = {}
+        last_flush = time.monotonic()
+        for path, is_unwanted in CheckPath.classify_entries(entries):
+            results[path] = is_unwanted
+            # hide unwanted nodes in batches while the remaining checks run
+            if time.monotonic() - last_flush > 0.1:
+                self.app.call_from_thread(
+                    self._apply_check_results, node, dir_key, results
+                )
+                results = {}
+                last_flush = time.monotonic()
+        if results:
+            self.app.call_from_thread(self._apply_check_results, node, dir_key, results)
+
+    def _apply_check_results(
+        self, node: TreeNode[DirEntry], dir_key: Path, results: dict[Path, bool]
+    ) -> None:
+        children = self._children_by_dir.get(dir_key)
+        if children is None:
+            return
+        for path, is_unwanted in results.items():
+            if path in children:
+                children[path] = children[path]._replace(
+                    is_unwanted=is_unwanted, checked=True
+                )
+        for child in list(node.children):
+            if (
+                child.data is not None
+                and child.data.path in results
+                and not self._is_shown(children[child.data.path])
+            ):
+                self._remove_node(child)
+
+    def _refilter_node(self, node: TreeNode[DirEntry], dir_key: Path) -> None:
+        children = self._children_by_dir.get(dir_key)
+        if children is None:
+            return
+        shown = sorted(
+            (path for path, entry in children.items() if self._is_shown(entry)),
+            key=lambda path: (not children[path].is_dir, path.name.lower()),
+        )
+        shown_set = set(shown)
+        current: dict[Path, TreeNode[DirEntry]] = {}
+        for child in list(node.children):
+            if child.data is None:
+                continue
+            if child.data.path in shown_set:
+                current[child.data.path] = child
+            else:
+                self._remove_node(child)
+        # existing nodes keep their expansion state and loaded children
+        for index, path in enumerate(shown):
+            if path not in current:
+                node.add(
+                    path.name,
+                    data=DirEntry(path),
+                    before=index if index < len(node.children) else None,
+                    allow_expand=children[path].is_dir,
+                )
+        self._check_children(dir_key)
+
+    def _refilter(self) -> None:
+        # Uses the stored classification of the loaded directories, no file system
+        # access except for the checks still needed for paths which become visible.
+        to_visit: list[TreeNode[DirEntry]] = [self.root]
+        while to_visit:
+            node = to_visit.pop()
+            dir_key = self._dir_key(node)
+            if dir_key is not None:
+                self._refilter_node(node, dir_key)
+            to_visit.extend(node.children)
+
+    def watch_show_managed(self) -> None:
+        self._refilter()
+
+    def watch_show_unwanted(self) -> None:
+        self._refilter()
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from textual import getters
+from rich.text import Text
+from textual import getters, work
 from textual.containers import Container, ScrollableContainer
 from textual.reactive import reactive
 from textual.widgets import DataTable, Label, Static
@@ -15,10 +17,29 @@ from .messages import LogCmdResultMsg
 
 if TYPE_CHECKING:
     from chezmoi_mousse.app_ids import AppIds
+    from chezmoi_mousse.git_log_pages import GitLogPages
     from chezmoi_mousse.gui.textual_app import ChezmoiGui
+    from chezmoi_mousse.named_tuples import CommandResult, GitLogRow
 
 __all__ = ["GitLogView"]
 
+# the next page is loaded when scrolled this close to the last row
+LOAD_MORE_ROWS = 20
+# styled rows are kept for the most recently shown paths only
+STYLED_ROWS_PATHS = 8
+
+NO_COMMIT_MESSAGE = "no commit message"
+SUBJECT_COLORS = {
+    "Add": ColorVar.text_success,
+    "Update": ColorVar.text_warning,
+    "Remove": ColorVar.text_error,
+}
+
+type StyledRow = tuple[Text, Text]
+
+
+class GitLogTable(DataTable[Text]): ...
+
 
 class GitLogView(Container):
     if TYPE_CHECKING:
@@ -28,6 +49,13 @@ class GitLogView(Container):
 
     def __init__(self, ids: AppIds) -> None:
         super().__init__(id=ids.container.git_log)
+        self._path_arg: Path | None = None
+        self._pages: GitLogPages | None = None
+        self._loading_page = False
+        # styled rows are reused as long as the cached pages and the theme are
+        self._styled_rows: OrderedDict[
+            Path | None, tuple[GitLogPages, str, list[StyledRow]]
+        ] = OrderedDict()
 
     def _create_unmanaged_path_container(self, path: Path) -> ScrollableContainer:
         widgets: list[Static | Label] = []
@@ -40,49 +68,100 @@ class GitLogView(Container):
         )
         return ScrollableContainer(*widgets)
 
-    def _create_datatable_container(
-        self, git_log_lines: list[str]
-    ) -> ScrollableContainer:
-        data_table = DataTable[str](cursor_type="row", show_cursor=False)
+    def _get_data_table(self) -> GitLogTable:
+        # created once, and again after the view was purged
+        tables = self.query(GitLogTable)
+        if tables:
+            return tables.first()
+        self.remove_children()
+        data_table = GitLogTable(cursor_type="row", show_cursor=False)
+        data_table.add_columns("COMMIT", "MESSAGE")
+        self.mount(data_table)
+        self.watch(data_table, "scroll_y", self._check_load_page, init=False)
+        return data_table
 
-        def add_row_with_style(columns: list[str], log_color: ColorVar) -> None:
-            color = self.app.get_color(log_color)
-            row: list[str] = [f"[{color}]{cell_text}[/]" for cell_text in columns]
-            data_table.add_row(*row)
+    def _style_rows(self, path_arg: Path | None, pages: GitLogPages) -> list[StyledRow]:
+        cached = self._styled_rows.get(path_arg)
+        if cached is not None and cached[0] is pages and cached[1] == self.app.theme:
+            styled_rows = cached[2]
+            self._styled_rows.move_to_end(path_arg)
+        else:
+            styled_rows = []
+            self._styled_rows[path_arg] = (pages, self.app.theme, styled_rows)
+            self._styled_rows.move_to_end(path_arg)
+            while len(self._styled_rows) > STYLED_ROWS_PATHS:
+                self._styled_rows.popitem(last=False)
+        if len(styled_rows) == len(pages.rows):
+            return styled_rows
+        colors = {color_var: self.app.get_color(color_var) for color_var in ColorVar}
+        for row in pages.rows[len(styled_rows) :]:
+            styled_rows.append(self._style_row(row, colors))
+        return styled_rows
 
-        data_table.add_columns("COMMIT", "MESSAGE")
-        for line in git_log_lines:
-            no_commit_message = "no commit message"
-            rel_date, committer, subject = line.rstrip("\x00").split("\x1f", 2)
-            column_one = f"{rel_date} by {committer}"
-            column_two = f"{subject}" if subject.strip() else no_commit_message
-            columns: list[str] = [column_one, column_two]
-            if column_two.split(maxsplit=1)[0] == "Add":
-                add_row_with_style(columns, ColorVar.text_success)
-            elif column_two.split(maxsplit=1)[0] == "Update":
-                add_row_with_style(columns, ColorVar.text_warning)
-            elif column_two.split(maxsplit=1)[0] == "Remove":
-                add_row_with_style(columns, ColorVar.text_error)
-            elif column_two == no_commit_message:
-                add_row_with_style(columns, ColorVar.text_secondary)
-            else:
-                add_row_with_style(columns, ColorVar.text)
-        return ScrollableContainer(data_table)
+    @staticmethod
+    def _style_row(row: GitLogRow, colors: dict[ColorVar, str]) -> StyledRow:
+        subject = row.subject if row.subject.strip() else NO_COMMIT_MESSAGE
+        if subject == NO_COMMIT_MESSAGE:
+            color = colors[ColorVar.text_secondary]
+        else:
+            first_word = subject.split(maxsplit=1)[0]
+            color = colors[SUBJECT_COLORS.get(first_word, ColorVar.text)]
+        return (
+            Text(f"{row.rel_date} by {row.committer}", style=color),
+            Text(subject, style=color),
+        )
+
+    @work(thread=True, exclusive=True, group="git_log_pages")
+    def _get_pages(self, path_arg: Path | None) -> None:
+        pages = Commands.get_git_log_pages(path_arg)
+        self.app.call_from_thread(self._show_pages, path_arg, pages)
+
+    def _show_pages(self, path_arg: Path | None, pages: GitLogPages) -> None:
+        if path_arg != self._path_arg:
+            return  # another path was selected while loading
+        self.post_message(LogCmdResultMsg(pages.results))
+        self._pages = pages
+        data_table = self._get_data_table()
+        data_table.clear()
+        data_table.add_rows(self._style_rows(path_arg, pages))
+        data_table.scroll_home(animate=False)
+        # max_scroll_y is only updated for the new rows after a refresh
+        self.call_after_refresh(self._check_load_page)
+
+    def _check_load_page(self) -> None:
+        pages = self._pages
+        if pages is None or pages.complete or self._loading_page:
+            return
+        data_table = self._get_data_table()
+        if data_table.scroll_y >= data_table.max_scroll_y - LOAD_MORE_ROWS:
+            self._loading_page = True
+            self._load_page(self._path_arg, pages)
+
+    @work(thread=True, group="git_log_page")
+    def _load_page(self, path_arg: Path | None, pages: GitLogPages) -> None:
+        result = Commands.load_git_log_page(pages)
+        self.app.call_from_thread(self._add_page_rows, path_arg, pages, result)
+
+    def _add_page_rows(
+        self, path_arg: Path | None, pages: GitLogPages, result: CommandResult
+    ) -> None:
+        self._loading_page = False
+        self.post_message(LogCmdResultMsg([result]))
+        if pages is not self._pages:
+            return
+        data_table = self._get_data_table()
+        styled_rows = self._style_rows(path_arg, pages)
+        data_table.add_rows(styled_rows[data_table.row_count :])
 
     def watch_show_path(self, show_path: Path | None) -> None:
-        self.remove_children()
         path_arg = None if show_path == self.app.cmattr.dest_dir else show_path
+        self._path_arg = path_arg
+        self._pages = None
         if (
-            show_path != self.app.cmattr.dest_dir
-            and show_path is not None
-            and show_path not in self.app.cmattr.paths.managed_paths_set
+            path_arg is not None
+            and path_arg not in self.app.cmattr.paths.managed_paths_set
         ):
-            container = self._create_unmanaged_path_container(show_path)
-            self.mount(container)
+            self.remove_children()
+            self.mount(self._create_unmanaged_path_container(path_arg))
             return
-        cmd_results = Commands.run_chezmoi_git_log(path_arg)
-        self.post_message(LogCmdResultMsg(cmd_results))
-        container = self._create_datatable_container(
-            cmd_results[-1].std_out.splitlines()
-        )
-        self.mount(container)
+        self._get_pages(path_arg)
@@ -2,80 +2,265 @@ from __future__ import annotations
 
 import inspect
 import os
+from collections import deque
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
+from rich.cells import cell_len
 from rich.markup import escape
-from textual import getters
-from textual.containers import ScrollableContainer
+from rich.segment import Segment
+from textual import getters, on, work
+from textual.containers import Vertical
+from textual.geometry import Size
 from textual.reactive import reactive
-from textual.widgets import Collapsible, Label, RichLog, Static
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+from textual.widgets import Input, RichLog
 
+from chezmoi_mousse.caches import CmdArchive
+from chezmoi_mousse.mapped_file import CONTROL_CHARS
+from chezmoi_mousse.named_tuples import CmdLogEntry
 from chezmoi_mousse.str_enums import Chars, ColorVar, LogString, SectionLabel, Tcss
 
 if TYPE_CHECKING:
     from collections.abc import Callable
     from typing import Any
 
+    from textual import events
+    from textual.app import ComposeResult
+
     from chezmoi_mousse.app_ids import AppIds
+    from chezmoi_mousse.cm_types import ArchiveLocation
     from chezmoi_mousse.gui.textual_app import ChezmoiGui
     from chezmoi_mousse.named_tuples import CommandResult
 
 __all__ = ["AppLog", "CmdLog", "DebugLog"]
 
+# oldest entries are dropped from the log, their output stays in the archive
+MAX_LOG_ENTRIES = 5000
 
-class CmdResultCollapsible(Collapsible):
-    def __init__(self, *, cmd_result: CommandResult) -> None:
-        collapsible_contents = self._collapsible_contents(cmd_result)
-        super().__init__(
-            *collapsible_contents,
-            title=self._colored_with_timestamp(
-                cmd_result.pretty_cmd, cmd_result.returncode
-            ),
-            collapsed_symbol=Chars.right_triangle,
-            expanded_symbol=Chars.down_triangle,
-        )
+type OutputLine = tuple[str, Tcss | None]
+
+
+class CmdLogLines(ScrollView, can_focus=True):
+    """Command log headers in a ring buffer, rendered with the Line API.
+
+    Full results are written to the CmdArchive, clicking a header loads the
+    output back and shows it below the header until it's clicked again.
+    """
+
+    if TYPE_CHECKING:
+        app = getters.app(ChezmoiGui)
+
+    COMPONENT_CLASSES: ClassVar[set[str]] = {
+        Tcss.cmd_failed,
+        Tcss.cmd_succeeded,
+        Tcss.full_cmd,
+        Tcss.sub_section_label,
+    }
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._entries: deque[CmdLogEntry] = deque(maxlen=MAX_LOG_ENTRIES)
+        self._entry_count = 0
+        self._filter_tokens: list[str] = []
+        # output lines of the expanded entries, by entry number
+        self._expanded: dict[int, list[OutputLine]] = {}
+        self._rows: list[CmdLogEntry | OutputLine] = []
+        self._max_width = 0
+
+    def add_results(self, cmd_results: list[CommandResult]) -> None:
+        follow = self.scroll_y >= self.max_scroll_y
+        evicted = len(self._entries) + len(cmd_results) > MAX_LOG_ENTRIES
+        first_number = self._entry_count
+        for result in cmd_results:
+            # the result is kept until the archive worker has written it
+            entry = CmdLogEntry(
+                number=self._entry_count,
+                full_cmd=result.full_cmd,
+                pretty_cmd=result.pretty_cmd.translate(CONTROL_CHARS),
+                returncode=result.returncode,
+                time_stamp=result.time_stamp,
+                location=None,
+                result=result,
+            )
+            self._entries.append(entry)
+            self._entry_count += 1
+            if not evicted and self._matches(entry):
+                self._append_rows(entry)
+        if evicted:
+            # rows of the dropped entries are at the start, rebuild them all
+            oldest = self._entries[0].number
+            for number in [n for n in self._expanded if n < oldest]:
+                del self._expanded[number]
+            self._update_rows()
+        else:
+            self._set_virtual_size()
+        if follow:
+            self.call_after_refresh(self.scroll_end, animate=False)
+        self._archive_results(first_number, cmd_results)
+
+    @work(thread=True, group="cmd_archive")
+    def _archive_results(
+        self, first_number: int, cmd_results: list[CommandResult]
+    ) -> None:
+        # JSON encoding and the file writes don't run on the UI thread
+        locations = [CmdArchive.append(result) for result in cmd_results]
+        self.app.call_from_thread(self._set_locations, first_number, locations)
 
-    def _colored_with_timestamp(self, cmd_str: str, code: int) -> str:
-        color = (
-            f"${ColorVar.text_success}" if code == 0 else f"${ColorVar.text_warning}"
+    def _set_locations(
+        self, first_number: int, locations: list[ArchiveLocation | None]
+    ) -> None:
+        # drop the results which can be loaded back from the archive
+        archived: dict[int, CmdLogEntry] = {}
+        oldest = self._entries[0].number if self._entries else 0
+        for number, location in enumerate(locations, first_number):
+            index = number - oldest
+            if location is None or not 0 <= index < len(self._entries):
+                continue  # not written or already dropped from the log
+            entry = self._entries[index]._replace(location=location, result=None)
+            self._entries[index] = entry
+            archived[number] = entry
+        # new entries are at the end of the rows
+        for row_index in range(len(self._rows) - 1, -1, -1):
+            row = self._rows[row_index]
+            if isinstance(row, CmdLogEntry):
+                if row.number < first_number:
+                    break
+                if row.number in archived:
+                    self._rows[row_index] = archived[row.number]
+
+    def set_filter(self, filter_text: str) -> None:
+        self._filter_tokens = filter_text.lower().split()
+        self._update_rows()
+
+    def _matches(self, entry: CmdLogEntry) -> bool:
+        for token in self._filter_tokens:
+            if token.startswith("rc:!"):
+                if token[4:] == str(entry.returncode):
+                    return False
+            elif token.startswith("rc:"):
+                if token[3:] != str(entry.returncode):
+                    return False
+            elif token not in entry.full_cmd.lower():
+                return False
+        return True
+
+    @staticmethod
+    def _header_text(entry: CmdLogEntry, expanded: bool) -> str:
+        symbol = Chars.down_triangle if expanded else Chars.right_triangle
+        return (
+            f"{symbol} {entry.time_stamp} {entry.pretty_cmd} "
+            f"(returncode {entry.returncode})"
         )
-        time = f"{datetime.now().strftime('%H:%M:%S')}"
-        return f"{time} [{color}]{cmd_str}[/] (returncode {code})"
-
-    def _collapsible_contents(self, result: CommandResult) -> list[Label | Static]:
-        curated_std_out = result.std_out or f"{LogString.no_stdout}"
-        curated_std_err = result.std_err or f"{LogString.no_stderr}"
-        contents: list[Label | Static] = [
-            Label(SectionLabel.full_cmd, classes=Tcss.sub_section_label)
+
+    @staticmethod
+    def _output_lines(entry: CmdLogEntry) -> list[OutputLine]:
+        result = entry.result
+        if result is None and entry.location is not None:
+            result = CmdArchive.load(entry.location)
+        if result is None:
+            return [(f"  {LogString.cmd_output_rotated}", None)]
+        lines: list[OutputLine] = [
+            (f"  {SectionLabel.full_cmd}", Tcss.sub_section_label),
+            (f"  {result.full_cmd.translate(CONTROL_CHARS)}", Tcss.full_cmd),
+            (f"  {SectionLabel.stdout_output}", Tcss.sub_section_label),
         ]
-        contents.extend([Label(result.full_cmd, classes=Tcss.full_cmd)])
-        contents.extend(
-            [
-                Label(SectionLabel.stdout_output, classes=Tcss.sub_section_label),
-                Static(f"{curated_std_out}", markup=False),
-            ]
+        # rendered as raw segments, control characters would reach the terminal
+        std_out = result.std_out.expandtabs() or LogString.no_stdout
+        lines.extend(
+            (f"  {line.translate(CONTROL_CHARS)}", None)
+            for line in std_out.splitlines()
         )
-        contents.extend(
-            [
-                Label(SectionLabel.stderr_output, classes=Tcss.sub_section_label),
-                Static(f"{curated_std_err}", markup=False),
-            ]
+        lines.append((f"  {SectionLabel.stderr_output}", Tcss.sub_section_label))
+        std_err = result.std_err.expandtabs() or LogString.no_stderr
+        lines.extend(
+            (f"  {line.translate(CONTROL_CHARS)}", None)
+            for line in std_err.splitlines()
         )
-        return contents
+        return lines
+
+    def _append_rows(self, entry: CmdLogEntry) -> None:
+        self._rows.append(entry)
+        self._max_width = max(self._max_width, cell_len(self._header_text(entry, True)))
+        output_lines = self._expanded.get(entry.number)
+        if output_lines is not None:
+            self._rows.extend(output_lines)
+            self._max_width = max(
+                self._max_width, *(cell_len(line) for line, _ in output_lines)
+            )
 
+    def _set_virtual_size(self) -> None:
+        self.virtual_size = Size(self._max_width, len(self._rows))
+        self.refresh()
+
+    def _update_rows(self) -> None:
+        # full rebuild after a filter change, dropped entries or expand/collapse
+        self._rows = []
+        self._max_width = 0
+        for entry in self._entries:
+            if self._matches(entry):
+                self._append_rows(entry)
+        self._set_virtual_size()
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.scrollable_content_region.width
+        row_index = scroll_y + y
+        if row_index >= len(self._rows):
+            return Strip.blank(width, self.rich_style)
+        row = self._rows[row_index]
+        if isinstance(row, CmdLogEntry):
+            text = self._header_text(row, row.number in self._expanded)
+            style = self.get_component_rich_style(
+                Tcss.cmd_succeeded if row.returncode == 0 else Tcss.cmd_failed
+            )
+        else:
+            text, tcss = row
+            style = (
+                self.rich_style if tcss is None else self.get_component_rich_style(tcss)
+            )
+        return Strip([Segment(text, style)]).crop_extend(
+            scroll_x, scroll_x + width, style
+        )
 
-class CmdLog(ScrollableContainer):
+    def on_click(self, event: events.Click) -> None:
+        offset = event.get_content_offset(self)
+        if offset is None:
+            return
+        row_index = offset.y + self.scroll_offset.y
+        if row_index >= len(self._rows):
+            return
+        row = self._rows[row_index]
+        if not isinstance(row, CmdLogEntry):
+            return
+        if self._expanded.pop(row.number, None) is None:
+            self._expanded[row.number] = self._output_lines(row)
+        self._update_rows()
+
+
+class CmdLog(Vertical):
     def __init__(self, ids: AppIds) -> None:
         super().__init__(id=ids.richlog.cmd)
 
     cmd_results: reactive[list[CommandResult] | None] = reactive(None, init=False)
 
+    def compose(self) -> ComposeResult:
+        yield Input(placeholder=LogString.cmd_log_filter)
+        yield CmdLogLines()
+
+    def on_mount(self) -> None:
+        self.cmd_log_lines = self.query_exactly_one(CmdLogLines)
+
+    @on(Input.Changed)
+    def filter_cmd_log(self, event: Input.Changed) -> None:
+        event.stop()
+        self.cmd_log_lines.set_filter(event.value)
+
     def watch_cmd_results(self, cmd_results: list[CommandResult] | None) -> None:
         if cmd_results is None:
             return
-        for result in cmd_results:
-            self.mount(CmdResultCollapsible(cmd_result=result))
+        self.cmd_log_lines.add_results(cmd_results)
 
 
 class RichLoggers(RichLog):
@@ -6,7 +6,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from textual import getters, on
+from textual import getters, on, work
 from textual.app import ComposeResult
 from textual.containers import Vertical
 from textual.reactive import reactive
@@ -26,8 +26,9 @@ from chezmoi_mousse.str_enums import (
 
 if TYPE_CHECKING:
     from chezmoi_mousse.app_ids import AppIds
-    from chezmoi_mousse.cm_types import ScanDirResult, TreeNodeDict
+    from chezmoi_mousse.cm_types import TreeNodeDict
     from chezmoi_mousse.gui.textual_app import ChezmoiGui
+    from chezmoi_mousse.named_tuples import ScanDirItem
 
 from .actionables import RefreshBtn
 from .messages import CurrentNodeMsg
@@ -55,6 +56,10 @@ class ManagedTreeState:
     show_unchanged: bool = False
     show_unmanaged: bool = False
     expand_all: bool = False
+    # bumped to cancel running unmanaged scans and drop their pending batches
+    scan_generation: int = 0
+    # expanded by update_tree, the unmanaged scan of these dirs is already running
+    restored_paths: set[Path] = field(default_factory=lambda: set())
 
 
 class ManagedTree(Tree[Path]):
@@ -98,6 +103,16 @@ class ManagedTree(Tree[Path]):
         if self.root.data:
             self.state.expanded_paths.add(self.root.data)
 
+    def select_path(self, path: Path) -> None:
+        """Selects the path, or its nearest parent in the tree, on the next update."""
+        dest_dir = self.app.cmattr.dest_dir
+        if not path.is_relative_to(dest_dir):
+            return
+        self.state.selected_path = path
+        self.state.expanded_paths.update(
+            parent for parent in path.parents if parent.is_relative_to(dest_dir)
+        )
+
     @property
     def paths(self) -> ManagedTreePaths:
         return (
@@ -178,30 +193,54 @@ class ManagedTree(Tree[Path]):
             for node in self._iter_tree_nodes()
             if node.allow_expand and node.data in self.state.expanded_paths
         ]
+        self._scan_unmanaged_dirs(expanded_dirs, self.state.scan_generation)
+
+    def _cancel_unmanaged_scans(self) -> None:
+        self.state.scan_generation += 1
+        self.state.restored_paths.clear()
 
-        for dir_path in expanded_dirs:
-            unmanaged: ScanDirResult = CheckPath.os_scan_dir(dir_path, managed_dir=True)
+    @work(thread=True)
+    def _scan_unmanaged_dirs(self, dir_paths: list[Path], generation: int) -> None:
+        for dir_path, unmanaged in CheckPath.scan_dirs(dir_paths, managed_dir=True):
+            if generation != self.state.scan_generation:
+                return  # leaving the loop cancels the pending scans
             if isinstance(unmanaged, PathKind):
                 continue
-
-            for item in unmanaged:
-                if (
-                    item.path in self.paths.managed_dirs
-                    or item.path in self.paths.managed_files
-                ):
-                    continue
-
-                if not self.show_unchanged and (
-                    item.path in self.paths.unchanged_tree_dirs
-                    or item.path in self.paths.unchanged_files
-                ):
-                    continue
-
-                parent_node = self._get_tree_node(item.path, parent_node=True)
-                if parent_node is not None:
-                    self._insert_node(
-                        dir_node=item.is_dir, path=item.path, parent_node=parent_node
+            batch = [
+                item
+                for item in unmanaged
+                if item.path not in self.paths.managed_dirs
+                and item.path not in self.paths.managed_files
+                and (
+                    self.show_unchanged
+                    or (
+                        item.path not in self.paths.unchanged_tree_dirs
+                        and item.path not in self.paths.unchanged_files
                     )
+                )
+            ]
+            if batch:
+                self.app.call_from_thread(
+                    self._insert_unmanaged_batch, dir_path, batch, generation
+                )
+
+    def _insert_unmanaged_batch(
+        self, dir_path: Path, batch: list[ScanDirItem], generation: int
+    ) -> None:
+        # the scan can be cancelled while the batch was waiting to be processed
+        if generation != self.state.scan_generation:
+            return
+        parent_node = self._get_tree_node(dir_path, parent_node=False)
+        if parent_node is None:
+            return
+        for item in batch:
+            node = self._insert_node(
+                dir_node=item.is_dir, path=item.path, parent_node=parent_node
+            )
+            if item.is_dir and item.path in self.state.expanded_paths:
+                node.expand()
+            if item.path == self.state.selected_path:
+                self.move_cursor(node, animate=False)
 
     def _iter_tree_nodes(self) -> Iterator[TreeNode[Path]]:
         queue: deque[TreeNode[Path]] = deque([self.root])
@@ -223,6 +262,7 @@ class ManagedTree(Tree[Path]):
 
     def update_tree(self) -> None:
         """Rebuilds the tree structure from current chezmoi paths and restores state."""
+        self._cancel_unmanaged_scans()
         self.root.remove_children()
 
         # Add status directories and files to root node
@@ -252,6 +292,8 @@ class ManagedTree(Tree[Path]):
                 continue
             if node.allow_expand:
                 if self.expand_all or (node.data in self.state.expanded_paths):
+                    if self.show_unmanaged and not self.expand_all and node.data:
+                        self.state.restored_paths.add(node.data)
                     node.expand()
                 else:
                     node.collapse()
@@ -269,6 +311,8 @@ class ManagedTree(Tree[Path]):
 
         if node_to_select is not None:
             self.select_node(node_to_select)
+            # a new node only gets its line when the tree is rendered
+            self.call_after_refresh(self.move_cursor, node_to_select)
         else:
             self.select_node(self.root)
 
@@ -285,6 +329,11 @@ class ManagedTree(Tree[Path]):
     def handle_node_expanded(self, event: Tree.NodeExpanded[Path]) -> None:
         if not self.expand_all and event.node.data:
             self.state.expanded_paths.add(event.node.data)
+            if event.node.data in self.state.restored_paths:
+                # scanned by _populate_unmanaged_nodes in update_tree
+                self.state.restored_paths.discard(event.node.data)
+            elif self.show_unmanaged:
+                self._scan_unmanaged_dirs([event.node.data], self.state.scan_generation)
 
     @on(Tree.NodeSelected)
     def send_node_context_message(self, event: Tree.NodeSelected[Path]) -> None:
@@ -332,6 +381,7 @@ class ManagedTree(Tree[Path]):
         if show_unmanaged:
             self._populate_unmanaged_nodes()
         else:
+            self._cancel_unmanaged_scans()
             for node in list(self._iter_tree_nodes()):
                 if (
                     node.data not in self.paths.managed_dirs | self.paths.managed_files
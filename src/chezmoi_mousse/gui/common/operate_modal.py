@@ -22,6 +22,7 @@ from chezmoi_mousse.str_enums import (
     Tcss,
     WriteCmd,
 )
+from chezmoi_mousse.task_graph import TaskGraph
 
 from .actionables import RunBtnGroup
 from .components import InfoStatic, MainSectionLabel, SubSectionLabel
@@ -55,15 +56,15 @@ class LoadingModal(ModalScreen[None]):
         await self._run_affected_paths(write_cmd, path_arg).wait()
 
     @work
+    @min_wait
     async def run_managed_commands(self) -> None:
-        for cmd in ReadCmd.managed_commands():
-            self.label_text = f"Running: {AppLife.pretty_cmd(cmd, path=None)}"
-            await self._run_read_command(cmd).wait()
+        graph = TaskGraph()
+        graph.add_read_cmds(ReadCmd.managed_commands())
+        await graph.run(on_done=self._show_completed)
 
-    @work(thread=True)
-    @min_wait
-    async def _run_read_command(self, read_cmd: ReadCmd) -> None:
-        Commands.run_read_cmd(read_cmd, path_arg=None)
+    def _show_completed(self, task_name: str, _: object) -> None:
+        read_cmd = ReadCmd[task_name]
+        self.label_text = f"Completed: {AppLife.pretty_cmd(read_cmd, path=None)}"
 
     @work(thread=True)
     @min_wait
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from collections.abc import Iterator
+from contextlib import suppress
 from itertools import chain
+from pathlib import Path
 from typing import TYPE_CHECKING, ClassVar
 
 from textual import getters, on, work
@@ -9,18 +11,24 @@ from textual.app import ComposeResult
 from textual.containers import Vertical
 from textual.reactive import reactive
 from textual.screen import Screen
-from textual.widgets import Footer, Header, Static, TabbedContent, Tabs
+from textual.widgets import Footer, Header, Static, TabbedContent, TabPane, Tabs
 
 from chezmoi_mousse import store
+from chezmoi_mousse.cm_attributes import ManagedPaths
 from chezmoi_mousse.functions import Commands, min_wait
+from chezmoi_mousse.named_tuples import CommandResult
+from chezmoi_mousse.source_state import SourceState
 from chezmoi_mousse.str_enums import (
     Chars,
     LoadingLabel,
     NotifyMsg,
     OpBtnLabel,
+    ReadCmd,
     TabLabel,
     Tcss,
 )
+from chezmoi_mousse.task_graph import TaskGraph, startup_graph
+from chezmoi_mousse.watcher import PathWatcher
 
 from .common.contents import ContentsView
 from .common.diffs import DiffView
@@ -36,11 +44,20 @@ from .common.messages import (
 )
 from .common.operate_modal import LoadingModal, OperateModal
 from .common.switchers import ViewSwitcher
-from .tab_panes import AddTab, ApplyTab, ConfigTab, DebugTab, LogsTab, ReAddTab
+from .tab_panes import (
+    AddTab,
+    ApplyTab,
+    ConfigTab,
+    DebugTab,
+    LazyTabPane,
+    LogsTab,
+    ReAddTab,
+)
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from chezmoi_mousse.gui.textual_app import ChezmoiGui
-    from chezmoi_mousse.named_tuples import CommandResult
 
 __all__ = ["MainScreen", "CustomHeader"]
 
@@ -74,7 +91,10 @@ class MainScreen(Screen[None]):
     def compose(self) -> ComposeResult:
         yield CustomHeader()
 
-        with Vertical(), TabbedContent():
+        with (
+            Vertical(),
+            TabbedContent(initial=self.app.startup_options.initial_tab),
+        ):
             yield ApplyTab(self.app.cmattr.apply_id)
             yield ReAddTab(self.app.cmattr.re_add_id)
             yield AddTab(self.app.cmattr.add_id)
@@ -88,26 +108,56 @@ class MainScreen(Screen[None]):
         self.app_log = self.query_one(self.app.cmattr.logs_id.richlog.app_q, AppLog)
         self.cmd_log = self.query_one(self.app.cmattr.logs_id.richlog.cmd_q, CmdLog)
         self.main_tabs = self.query_exactly_one(Tabs)
-        self.apply_managed_tree = self.query_one(
-            self.app.cmattr.apply_id.managed_tree_q, ManagedTree
-        )
-        self.re_add_managed_tree = self.query_one(
-            self.app.cmattr.re_add_id.managed_tree_q, ManagedTree
-        )
         self.tabbed_content = self.query_exactly_one(TabbedContent)
+        # tabs to refresh when activated, the managed trees are built on first use
+        self._stale_tabs: set[str] = {TabLabel.apply, TabLabel.re_add}
+        self._deferred_done = False
+        # with a fast start the tabs are composed after the startup graph ran
+        self._startup_done = not self.app.startup_options.fast_start
+        # paths reported by the watcher and not merged in the status yet
+        self._unmerged_paths: set[Path] = set()
+        self._status_batch = 0
+        self.path_watcher = PathWatcher(
+            self._on_watched_paths_changed, self._on_watcher_overflow
+        )
         self._first_startup()
 
+    def on_unmount(self) -> None:
+        self.path_watcher.stop()
+
     ###########################################
     # Push modal methods with their callbacks #
     ###########################################
 
     @work
     async def _first_startup(self) -> None:
-        self.loading_modal = LoadingModal()
-        await self.app.push_screen(self.loading_modal)
-        await self._update_managed_trees_loading().wait()
-        await self._log_cmd_results_loading(store.splash_results()).wait()
-        await self.loading_modal.dismiss()
+        if self._startup_done:
+            self.loading_modal = LoadingModal()
+            await self.app.push_screen(self.loading_modal)
+            self._run_deferred_commands()
+            await self._update_managed_trees_loading().wait()
+            await self._log_cmd_results_loading(store.splash_results()).wait()
+            await self.loading_modal.dismiss()
+        else:
+            await self._run_startup_graph()
+            self._run_deferred_commands()
+        self.path_watcher.start(self.app.cmattr.paths.managed_paths_set)
+        self.check_source_state(full=True)  # creates the initial fingerprint
+        self.set_interval(10, self.check_source_state)
+
+    async def _run_startup_graph(self) -> None:
+        graph = startup_graph(self.app.cmattr)
+        await graph.run(on_done=self._log_task_result)
+        self._startup_done = True
+        active_pane = self.tabbed_content.active_pane
+        if active_pane is not None:
+            await self._activate_tab(active_pane)
+        self.app.refresh_bindings()
+
+    def _log_task_result(self, _: str, result: object) -> None:
+        # command results are logged as they come in, not after the splash screen
+        if isinstance(result, CommandResult):
+            self._log_cmd_results([result])
 
     #####################
     # UI update workers #
@@ -120,6 +170,29 @@ class MainScreen(Screen[None]):
         self.cmd_log.cmd_results = cmd_results
         self.app_log.cmd_results = cmd_results
 
+    @work(thread=True, group="deferred_commands")
+    def _run_deferred_commands(self) -> None:
+        # also caches the first git log page for the destDir
+        git_log_results = Commands.get_git_log_pages(None).results
+        self.app.call_from_thread(self._log_cmd_results, git_log_results)
+        for cmd in ReadCmd.deferred_commands():
+            if cmd is ReadCmd.doctor:
+                result = Commands.get_doctor_result()
+            else:
+                result = Commands.run_read_cmd(cmd, path_arg=None)
+            self.app.call_from_thread(self._log_cmd_results, [result])
+        self.app.call_from_thread(self._on_deferred_commands_done)
+
+    def _log_cmd_results(self, cmd_results: list[CommandResult]) -> None:
+        self.cmd_log.cmd_results = cmd_results
+        self.app_log.cmd_results = cmd_results
+
+    def _on_deferred_commands_done(self) -> None:
+        self._deferred_done = True
+        config_tab = self.query_exactly_one(ConfigTab)
+        if config_tab.composed:
+            config_tab.load_views()
+
     @work
     async def _purge_views_cache(self) -> None:
         self.loading_modal.label_text = LoadingLabel.purge_cache
@@ -135,28 +208,175 @@ class MainScreen(Screen[None]):
     @min_wait
     async def _update_managed_trees_loading(self) -> None:
         self.loading_modal.label_text = LoadingLabel.update_trees
-        self.apply_managed_tree.update_tree()
-        self.apply_managed_tree.refresh()
-        self.re_add_managed_tree.update_tree()
-        self.re_add_managed_tree.refresh()
-        # Update FilteredDirTree
-        dir_tree = self.query_exactly_one(FilteredDirTree)
-        dir_tree.reload()
-        dir_tree.refresh()
+        self._refresh_tabs((TabLabel.apply, TabLabel.re_add, TabLabel.add))
 
     @work
     @min_wait
     async def _reload_directory_tree_loading(self) -> None:
         self.loading_modal.label_text = LoadingLabel.reload_dir_tree
-        # Update FilteredDirTree
-        dir_tree = self.query_exactly_one(FilteredDirTree)
-        dir_tree.reload()
-        dir_tree.refresh()
+        self._refresh_tabs((TabLabel.add,))
+
+    ###########################################
+    # Lazy tabs and deferred refreshes        #
+    ###########################################
+
+    async def _activate_tab(self, tab_pane: TabPane) -> None:
+        if not self._startup_done:
+            return  # the tab contents need the managed paths
+        if isinstance(tab_pane, LazyTabPane) and not tab_pane.composed:
+            await tab_pane.compose_tab()
+            initial_path = self.app.startup_options.initial_path
+            if isinstance(tab_pane, (ApplyTab, ReAddTab)) and initial_path:
+                tab_pane.query_exactly_one(ManagedTree).select_path(initial_path)
+            if tab_pane.id == TabLabel.add:
+                # a new FilteredDirTree loads the current directory contents
+                self._stale_tabs.discard(TabLabel.add)
+            elif isinstance(tab_pane, ConfigTab) and self._deferred_done:
+                tab_pane.load_views()
+        if tab_pane.id in self._stale_tabs:
+            self._refresh_tab(tab_pane.id)
+
+    def _refresh_tabs(self, tab_labels: Iterable[str]) -> None:
+        # only the visible tab is refreshed now, others when they are activated
+        self._stale_tabs.update(tab_labels)
+        active_pane = self.tabbed_content.active_pane
+        if active_pane is None or active_pane.id not in self._stale_tabs:
+            return
+        if not isinstance(active_pane, LazyTabPane) or active_pane.composed:
+            self._refresh_tab(active_pane.id)
+
+    def _refresh_tab(self, tab_label: str) -> None:
+        self._stale_tabs.discard(tab_label)
+        if tab_label == TabLabel.add:
+            dir_tree = self.query_exactly_one(FilteredDirTree)
+            dir_tree.reload()
+            dir_tree.refresh()
+        elif tab_label in (TabLabel.apply, TabLabel.re_add):
+            ids = (
+                self.app.cmattr.apply_id
+                if tab_label == TabLabel.apply
+                else self.app.cmattr.re_add_id
+            )
+            managed_tree = self.query_one(ids.managed_tree_q, ManagedTree)
+            managed_tree.update_tree()
+            managed_tree.refresh()
+
+    ###########################################
+    # Incremental updates for watched paths   #
+    ###########################################
+
+    def _set_managed_paths(self) -> None:
+        # the watcher follows the managed paths after a refresh or operation
+        watched = self.app.cmattr.paths.managed_paths_set
+        self.app.cmattr.paths = ManagedPaths()
+        if self.app.cmattr.paths.managed_paths_set != watched:
+            self.path_watcher.start(self.app.cmattr.paths.managed_paths_set)
+
+    def _on_watched_paths_changed(self, changed: set[Path]) -> None:
+        # called from the watcher thread
+        with suppress(RuntimeError):  # raised if the app is shutting down
+            self.app.call_from_thread(self._queue_scoped_status, changed)
+
+    def _on_watcher_overflow(self) -> None:
+        # called from the watcher thread, events were lost so any path can be stale
+        with suppress(RuntimeError):
+            self.app.call_from_thread(self._refresh_all_paths)
+
+    def _queue_scoped_status(self, changed: set[Path]) -> None:
+        # a new batch cancels the running one and also checks its paths
+        self._unmerged_paths |= changed
+        self._status_batch += 1
+        self._run_scoped_status(self._status_batch, frozenset(self._unmerged_paths))
+
+    @work(thread=True, group="scoped_status", exclusive=True)
+    def _run_scoped_status(self, batch: int, changed: frozenset[Path]) -> None:
+        managed_dirs = self.app.cmattr.paths.managed_dirs
+        changed_dirs = sorted(path for path in changed if path in managed_dirs)
+        changed_files = sorted(path for path in changed if path not in managed_dirs)
+        dirs_result = (
+            Commands.run_scoped_status(ReadCmd.status_dirs, changed_dirs)
+            if changed_dirs
+            else None
+        )
+        files_result = (
+            Commands.run_scoped_status(ReadCmd.status_files, changed_files)
+            if changed_files
+            else None
+        )
+        self.app.call_from_thread(
+            self._update_changed_status, batch, changed, dirs_result, files_result
+        )
+
+    async def _update_changed_status(
+        self,
+        batch: int,
+        changed: frozenset[Path],
+        dirs_result: CommandResult | None,
+        files_result: CommandResult | None,
+    ) -> None:
+        if batch != self._status_batch:
+            return  # superseded by a batch with newer status for these paths
+        self._unmerged_paths -= changed
+        cmd_results = [r for r in (dirs_result, files_result) if r is not None]
+        self.app_log.cmd_results = cmd_results
+        self.cmd_log.cmd_results = cmd_results
+        if any(result.returncode != 0 for result in cmd_results):
+            return  # keep the current status, the refresh button runs a full update
+        await store.store_current_snapshot()
+        store.merge_scoped_status(
+            changed, dirs_result=dirs_result, files_result=files_result
+        )
+        await store.update_changed_paths()
+        Commands.clear_dest_file_caches()
+        if not store.changed_paths.no_changes:
+            self._set_managed_paths()
+            self._refresh_tabs((TabLabel.apply, TabLabel.re_add))
+        # re-render views showing a changed path, the tree selection stays the same
+        for view in chain(
+            self.query(DiffView).results(), self.query(ContentsView).results()
+        ):
+            if view.show_path in changed:
+                view.mutate_reactive(type(view).show_path)
+
+    @work(thread=True, group="source_state", exclusive=True)
+    def check_source_state(self, *, full: bool = False) -> None:
+        if SourceState.check(full=full):
+            self.app.call_from_thread(self._refresh_all_paths)
+
+    def _refresh_all_paths(self) -> None:
+        # the source changed or watcher events were lost, re-render every view
+        self._refresh_managed_paths()
+        for view in chain(
+            self.query(DiffView).results(),
+            self.query(ContentsView).results(),
+            self.query(GitLogView).results(),
+        ):
+            if view.show_path is not None:
+                view.mutate_reactive(type(view).show_path)
+
+    @work(group="managed_refresh", exclusive=True)
+    async def _refresh_managed_paths(self) -> None:
+        # a pull or an edit in the source dir can add, remove or change any path
+        await store.store_current_snapshot()
+        graph = TaskGraph()
+        graph.add_read_cmds(ReadCmd.managed_commands())
+        await graph.run(on_done=self._log_task_result)
+        if any(result.returncode != 0 for result in store.managed_cmd_results()):
+            return
+        await store.update_changed_paths()
+        Commands.clear_dest_file_caches()
+        if not store.changed_paths.no_changes:
+            self._set_managed_paths()
+            self._refresh_tabs((TabLabel.apply, TabLabel.re_add, TabLabel.add))
 
     #####################
     # Message handling  #
     #####################
 
+    @on(TabbedContent.TabActivated)
+    async def handle_tab_activated(self, event: TabbedContent.TabActivated) -> None:
+        await self._activate_tab(event.pane)
+
     @on(CurrentNodeMsg)
     def handle_new_tree_node_selected(self, msg: CurrentNodeMsg) -> None:
         msg.stop()
@@ -204,6 +424,7 @@ class MainScreen(Screen[None]):
                 self.notify(NotifyMsg.add_tab_tree_reloaded)
             await self.loading_modal.dismiss()
             return
+        self._set_managed_paths()
         # We have changes, push the OperateModal to show these with a close button
         self.app.push_screen(OperateModal((OpBtnLabel.close,)))
         # Meanwhile we continue updates for the loading modal, which will become visible
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import asyncio
 from collections import deque
-from enum import StrEnum, auto
 from typing import TYPE_CHECKING
 
 from rich.segment import Segment
@@ -15,11 +14,9 @@ from textual.screen import Screen
 from textual.strip import Strip
 from textual.widgets import RichLog, Static
 
-from chezmoi_mousse import store
-from chezmoi_mousse.cm_attributes import ManagedPaths
-from chezmoi_mousse.functions import Commands
 from chezmoi_mousse.named_tuples import CommandResult
 from chezmoi_mousse.str_enums import ColorVar, ReadCmd
+from chezmoi_mousse.task_graph import startup_graph
 
 from .common.ascii_constants import SPLASH_ASCII
 
@@ -50,17 +47,6 @@ def _create_fade_line_styles() -> deque[Style]:
 FADE_LINE_STYLES: deque[Style] = _create_fade_line_styles()
 
 
-class GroupName(StrEnum):
-    json_output_group = auto()
-    managed_cmd_group = auto()
-    splash_cmd_group = auto()
-
-
-class WorkerName(StrEnum):
-    parse_json_outputs = "parse json outputs"
-    set_cm_attributes = "set cmattr"
-
-
 class AnimatedFade(Static):
     def on_mount(self) -> None:
         self.step_count = 0
@@ -118,7 +104,8 @@ class SplashScreen(Screen[None]):
         self.splash_log.styles.width = "auto"
         self.splash_log.styles.text_align = "center"
         self.splash_log.styles.margin = 2
-        self.splash_log.styles.height = ReadCmd.grouped_commands_count() + 4
+        # a line per command, per task and for the critical path
+        self.splash_log.styles.height = ReadCmd.grouped_commands_count() + 6
 
         self.primary_color = self.app.get_color(ColorVar.text_primary)
         self.success_color = self.app.get_color(ColorVar.text_success)
@@ -138,82 +125,24 @@ class SplashScreen(Screen[None]):
             color = self.warning_color
         return f"[{color}]{prefix} {'.' * padding} {suffix}[/{color}]"
 
-    def _run_chezmoi_command(self, command: ReadCmd) -> str:
-        if command is ReadCmd.git_log:
-            result: CommandResult = Commands.run_chezmoi_git_log(None)[-1]
+    def _log_task_done(self, task_name: str, result: object) -> None:
+        if isinstance(result, CommandResult):
+            msg = self._get_log_msg(
+                prefix=result.pretty_cmd, returncode=result.returncode
+            )
         else:
-            result: CommandResult = Commands.run_read_cmd(command, path_arg=None)
-        return self._get_log_msg(prefix=result.pretty_cmd, returncode=result.returncode)
-
-    # Threaded Command Workers
-
-    @work(thread=True, group=GroupName.splash_cmd_group)
-    def _run_splash_cmd(self, command: ReadCmd) -> None:
-        msg = self._run_chezmoi_command(command)
-        self.app.call_from_thread(self.splash_log.write, msg)
-
-    @work(thread=True, group=GroupName.managed_cmd_group)
-    def _run_managed_cmd(self, command: ReadCmd) -> None:
-        msg = self._run_chezmoi_command(command)
-        self.app.call_from_thread(self.splash_log.write, msg)
-
-    @work(thread=True, group=GroupName.json_output_group)
-    def _run_json_output_cmd(self, command: ReadCmd) -> None:
-        msg = self._run_chezmoi_command(command)
-        self.app.call_from_thread(self.splash_log.write, msg)
-
-    # Non-threaded Workers for tasks that are not worth creating a thread for
-
-    @work(name=WorkerName.parse_json_outputs)
-    async def _parse_json_outputs(self) -> None:
-        parsed_dump_config = Commands.json_loads(store.dump_config_result.std_out)
-        store.parsed_dump_config = parsed_dump_config
-        Commands.dest_dir = store.get_dest_dir()
-        parsed_template_data = Commands.json_loads(store.template_data_result.std_out)
-        store.parsed_template_data = parsed_template_data
-        msg = self._get_log_msg(prefix=WorkerName.parse_json_outputs, returncode=None)
+            msg = self._get_log_msg(prefix=task_name, returncode=None)
         self.splash_log.write(msg)
 
-    @work(name=WorkerName.set_cm_attributes)
-    async def _set_cm_attributes(self) -> None:
-        self.app.cmattr.paths = ManagedPaths()
-        msg = self._get_log_msg(prefix=WorkerName.set_cm_attributes, returncode=None)
-        self.app.cmattr.add_path = store.get_dest_dir()
-        self.app.cmattr.apply_path = store.get_dest_dir()
-        self.app.cmattr.re_add_path = store.get_dest_dir()
-        self.splash_log.write(msg)
-
-    # Sequential Orchestration Pipeline
-
     @work
     async def _run_all_tasks(self) -> None:
         self.fade_timer.resume()
-
-        # Dispatch command workers and store worker instances for awaiting later.
-        splash_workers = [
-            self._run_splash_cmd(cmd)
-            for cmd in ReadCmd.splash_only_commands() + (ReadCmd.git_log,)
-        ]
-        json_workers = [
-            self._run_json_output_cmd(cmd) for cmd in ReadCmd.json_parsable_commands()
-        ]
-        managed_workers = [
-            self._run_managed_cmd(cmd) for cmd in ReadCmd.managed_commands()
-        ]
-
-        # Await JSON output read commands and then parse them.
-        for worker in json_workers:
-            await worker.wait()
-        await self._parse_json_outputs().wait()
-
-        # Await Managed paths read commands and then set the cmattr attributes
-        for worker in managed_workers:
-            await worker.wait()
-        await self._set_cm_attributes().wait()
-
-        # Wait for remaining splash commands, if any
-        for worker in splash_workers:
-            await worker.wait()
+        graph = startup_graph(self.app.cmattr)
+        await graph.run(on_done=self._log_task_done)
+        critical_path = " > ".join(
+            f"{name} {graph.durations[name]:.2f}s" for name in graph.critical_path()
+        )
+        self.splash_log.write(f"[{self.primary_color}]{critical_path}[/]")
 
         # Only dismiss after a completed fade cycle
         while (
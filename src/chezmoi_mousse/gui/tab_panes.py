@@ -24,7 +24,6 @@ from textual.widgets import (
 )
 
 from chezmoi_mousse import store
-from chezmoi_mousse.debug.test_paths import TestPaths
 from chezmoi_mousse.enum_data import PwMgrEnum
 from chezmoi_mousse.named_tuples import PwMgrData
 from chezmoi_mousse.str_enums import (
@@ -48,7 +47,6 @@ from .common.actionables import (
 from .common.ascii_constants import FLOW_DIAGRAM
 from .common.components import CatConfigStatic
 from .common.contents import ContentsView
-from .common.doctor_data import DoctorTable, PwCollapsible
 from .common.filtered_dir_tree import FilteredDirTree
 from .common.loggers import AppLog, CmdLog, DebugLog
 from .common.managed_tree import DestDirTree, ManagedTree
@@ -58,18 +56,45 @@ if TYPE_CHECKING:
     from chezmoi_mousse.app_ids import AppIds
     from chezmoi_mousse.gui.textual_app import ChezmoiGui
 
-__all__ = ["AddTab", "ApplyTab", "ConfigTab", "DebugTab", "LogsTab", "ReAddTab"]
+__all__ = [
+    "AddTab",
+    "ApplyTab",
+    "ConfigTab",
+    "DebugTab",
+    "LazyTabPane",
+    "LogsTab",
+    "ReAddTab",
+]
 
 
-class AddTab(TabPane):
+class LazyTabPane(TabPane):
+    """Composes its contents when the tab is activated for the first time."""
+
+    def __init__(self, ids: AppIds, *, tab_label: TabLabel) -> None:
+        super().__init__(id=tab_label, title=tab_label)
+        self.ids = ids
+        self.composed = False
+
+    def compose_contents(self) -> ComposeResult:
+        yield from ()
+
+    def _on_contents_mounted(self) -> None:
+        pass
+
+    async def compose_tab(self) -> None:
+        self.composed = True
+        await self.mount_compose(self.compose_contents())
+        self._on_contents_mounted()
+
+
+class AddTab(LazyTabPane):
     if TYPE_CHECKING:
         app = getters.app(ChezmoiGui)
 
     def __init__(self, ids: AppIds) -> None:
-        super().__init__(id=TabLabel.add, title=TabLabel.add)
-        self.ids = ids
+        super().__init__(ids, tab_label=TabLabel.add)
 
-    def compose(self) -> ComposeResult:
+    def compose_contents(self) -> ComposeResult:
         with Horizontal():
             yield Vertical(
                 FilteredDirTree(dest_dir=self.app.cmattr.dest_dir),
@@ -82,7 +107,7 @@ class AddTab(TabPane):
                 yield ReviewBtnGroup(self.ids, (OpBtnLabel.add_review,))
         yield SwitchSlider(self.ids)
 
-    def on_mount(self) -> None:
+    def _on_contents_mounted(self) -> None:
         self.dir_tree = self.query_exactly_one(FilteredDirTree)
         self.contents_view = self.query_one(self.ids.container.contents_q, ContentsView)
         self.contents_view.add_class(Tcss.add_tab_contents_view)
@@ -111,15 +136,13 @@ class AddTab(TabPane):
             self.dir_tree.show_managed = event.value
         elif event.switch.id == self.ids.switch.show_unwanted:
             self.dir_tree.show_unwanted = event.value
-        self.dir_tree.reload()
 
 
-class ApplyTab(TabPane):
+class ApplyTab(LazyTabPane):
     def __init__(self, ids: AppIds) -> None:
-        super().__init__(id=TabLabel.apply, title=TabLabel.apply)
-        self.ids = ids
+        super().__init__(ids, tab_label=TabLabel.apply)
 
-    def compose(self) -> ComposeResult:
+    def compose_contents(self) -> ComposeResult:
         with Horizontal():
             yield DestDirTree(self.ids)
             yield Vertical(
@@ -135,7 +158,7 @@ class ApplyTab(TabPane):
             )
         yield SwitchSlider(self.ids)
 
-    def on_mount(self) -> None:
+    def _on_contents_mounted(self) -> None:
         self.managed_tree = self.query_one(self.ids.managed_tree_q, ManagedTree)
 
     @on(Switch.Changed)
@@ -149,12 +172,13 @@ class ApplyTab(TabPane):
             self.managed_tree.expand_all = event.value
 
 
-class ConfigTab(TabPane):
+class ConfigTab(LazyTabPane):
     def __init__(self, ids: AppIds) -> None:
-        super().__init__(id=TabLabel.config, title=TabLabel.config)
-        self.ids = ids
+        super().__init__(ids, tab_label=TabLabel.config)
+
+    def compose_contents(self) -> ComposeResult:
+        from .common.doctor_data import DoctorTable
 
-    def compose(self) -> ComposeResult:
         with Horizontal():
             yield FlatButtonsVertical(
                 self.ids,
@@ -205,9 +229,8 @@ class ConfigTab(TabPane):
                     id=self.ids.container.diagram,
                 )
 
-    def on_mount(self) -> None:
+    def _on_contents_mounted(self) -> None:
         self.switcher = self.query_exactly_one(ContentSwitcher)
-        self._load_views()
 
     def _get_pw_mgr_data(self, doctor_check: str) -> PwMgrData:
         for member in PwMgrEnum:
@@ -217,6 +240,8 @@ class ConfigTab(TabPane):
 
     @work
     async def _populate_pw_mgr_info(self, doctor_lines: list[str]) -> None:
+        from .common.doctor_data import PwCollapsible
+
         pw_mgr_info = self.query_one(self.ids.container.pw_mgr_info_q, Vertical)
 
         pw_mgr_entries: list[tuple[PwMgrData, str]] = []
@@ -237,7 +262,10 @@ class ConfigTab(TabPane):
         pw_mgr_info.mount(Static(f"\n{PwMgrInfo.info_warning}"))
 
     @work
-    async def _load_views(self) -> None:
+    async def load_views(self) -> None:
+        # called once the deferred commands have completed
+        from .common.doctor_data import DoctorTable
+
         doctor_view = self.query_one(self.ids.container.doctor_q, Vertical)
         doctor_table = doctor_view.query_exactly_one(DoctorTable)
         doctor_table.populate_table(store.doctor_result.std_out.splitlines())
@@ -276,7 +304,7 @@ class ConfigTab(TabPane):
             self.switcher.current = self.ids.container.diagram
 
 
-class DebugTab(TabPane):
+class DebugTab(LazyTabPane):
     if TYPE_CHECKING:
         app = getters.app(ChezmoiGui)
 
@@ -291,10 +319,9 @@ class DebugTab(TabPane):
         app = getters.app(ChezmoiGui)
 
     def __init__(self, ids: AppIds) -> None:
-        super().__init__(id=TabLabel.debug, title=TabLabel.debug)
-        self.ids = ids
+        super().__init__(ids, tab_label=TabLabel.debug)
 
-    def compose(self) -> ComposeResult:
+    def compose_contents(self) -> ComposeResult:
         with Horizontal():
             yield FlatButtonsVertical(
                 self.ids,
@@ -357,7 +384,9 @@ class DebugTab(TabPane):
                 label=OpBtnLabel.remove_paths,
             )
 
-    def on_mount(self) -> None:
+    def _on_contents_mounted(self) -> None:
+        from chezmoi_mousse.debug.test_paths import TestPaths
+
         self.test_paths = TestPaths()
         self.switcher = self.query_exactly_one(ContentSwitcher)
         self.test_paths_view = self.query_one(self.ids.container.test_paths_view_q)
@@ -522,12 +551,11 @@ class LogsTab(TabPane):
             self.switcher.current = self.app_ids.richlog.cmd
 
 
-class ReAddTab(TabPane):
+class ReAddTab(LazyTabPane):
     def __init__(self, ids: AppIds) -> None:
-        super().__init__(id=TabLabel.re_add, title=TabLabel.re_add)
-        self.ids = ids
+        super().__init__(ids, tab_label=TabLabel.re_add)
 
-    def compose(self) -> ComposeResult:
+    def compose_contents(self) -> ComposeResult:
         with Horizontal():
             yield DestDirTree(self.ids)
             yield Vertical(
@@ -543,7 +571,7 @@ class ReAddTab(TabPane):
             )
         yield SwitchSlider(self.ids)
 
-    def on_mount(self) -> None:
+    def _on_contents_mounted(self) -> None:
         self.managed_tree = self.query_one(self.ids.managed_tree_q, ManagedTree)
 
     @on(Switch.Changed)
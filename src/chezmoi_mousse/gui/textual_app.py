@@ -12,8 +12,10 @@ from textual.scrollbar import ScrollBar, ScrollBarRender
 from textual.theme import Theme
 from textual.widgets import TabbedContent, TabPane, Tabs
 
+from chezmoi_mousse.caches import SniffCache
 from chezmoi_mousse.cm_attributes import CmAttributes
 from chezmoi_mousse.functions import Commands
+from chezmoi_mousse.named_tuples import StartupOptions
 from chezmoi_mousse.str_enums import (
     BindingAction,
     BindingDescription,
@@ -33,7 +35,7 @@ from .common.messages import DryRunBtnMsg
 from .common.operate_modal import OperateModal
 from .main_screen import CustomHeader, MainScreen
 from .splash_screen import SplashScreen
-from .tab_panes import AddTab, ApplyTab, ReAddTab
+from .tab_panes import AddTab, ApplyTab, LazyTabPane, ReAddTab
 
 __all__ = ["ChezmoiGui"]
 
@@ -98,9 +100,10 @@ class ChezmoiGui(App[str]):
 
     cmattr: ClassVar[CmAttributes] = CmAttributes()
 
-    def __init__(self) -> None:
+    def __init__(self, startup_options: StartupOptions | None = None) -> None:
         ScrollBar.renderer = CustomScrollBarRender  # monkey patch
         super().__init__()
+        self.startup_options = startup_options or StartupOptions()
 
     def _handle_exception(self, error: Exception) -> None:
         from chezmoi_mousse.debug.utils import DebugUtils
@@ -112,7 +115,20 @@ class ChezmoiGui(App[str]):
         self.register_theme(chezmoi_mousse_light)
         self.register_theme(chezmoi_mousse_dark)
         self.theme = "chezmoi-mousse-dark"
-        self._run_splash_screen()
+        self.set_interval(SniffCache.SAVE_INTERVAL, self._save_sniff_cache)
+        if self.startup_options.fast_start:
+            self.push_screen(MainScreen())
+        else:
+            self._run_splash_screen()
+
+    def on_app_focus(self) -> None:
+        # catch changes to the source state made while the terminal had no focus
+        if isinstance(self.screen, MainScreen):
+            self.screen.check_source_state(full=True)
+
+    @work(thread=True, group="sniff_cache")
+    def _save_sniff_cache(self) -> None:
+        SniffCache.save()
 
     def get_color(self, color_var: ColorVar) -> str:
         return self.theme_variables.get(color_var.value, ColorVar.bogus.value)
@@ -139,7 +155,9 @@ class ChezmoiGui(App[str]):
     def _get_switch_slider_widget(self) -> SwitchSlider | None:
         current_tab_widget = self._get_tab_widget()
         if isinstance(current_tab_widget, (ApplyTab, ReAddTab, AddTab)):
-            return current_tab_widget.query_exactly_one(SwitchSlider)
+            # None until the tab contents are composed
+            sliders = current_tab_widget.query(SwitchSlider)
+            return sliders.first() if sliders else None
         return None
 
     def _get_main_screen(self) -> MainScreen:
@@ -309,6 +327,10 @@ class ChezmoiGui(App[str]):
     ) -> bool:
         if not isinstance(self.screen, MainScreen):
             return True
+        if action == BindingAction.toggle_maximized:
+            # a fast start shows the tabs before their contents are composed
+            tab_pane = self.screen.query_exactly_one(TabbedContent).active_pane
+            return not isinstance(tab_pane, LazyTabPane) or tab_pane.composed
         if action == BindingAction.toggle_switch_slider:
             header = self.screen.query_exactly_one(CustomHeader)
             switch_slider = self._get_switch_slider_widget()
@@ -1,8 +1,12 @@
 import os
+from pathlib import Path
 
-from chezmoi_mousse.debug.pilot_mode import run_with_pilot
+from chezmoi_mousse.caches import CmdArchive, ContentCache, DoctorCache, SniffCache
 from chezmoi_mousse.debug.utils import DebugUtils
 from chezmoi_mousse.gui.textual_app import ChezmoiGui
+from chezmoi_mousse.named_tuples import StartupOptions
+from chezmoi_mousse.path_matcher import PathMatcher
+from chezmoi_mousse.str_enums import TabLabel
 
 __all__ = ["run_app"]
 
@@ -32,19 +36,63 @@ def _check_if_we_can_run() -> None:
         sys.exit("\n".join(list(error_info)))
 
 
+def _get_startup_options() -> StartupOptions:
+    # the tab name as shown in the app, case insensitive
+    tab_name = os.environ.get("CHEZMOI_MOUSSE_INITIAL_TAB", "").strip().lower()
+    main_tabs = (
+        TabLabel.apply,
+        TabLabel.re_add,
+        TabLabel.add,
+        TabLabel.logs,
+        TabLabel.config,
+    )
+    initial_tab = next((tab for tab in main_tabs if tab.lower() == tab_name), "")
+    initial_path = os.environ.get("CHEZMOI_MOUSSE_INITIAL_PATH")
+    return StartupOptions(
+        fast_start=os.environ.get("CHEZMOI_MOUSSE_FAST_START") == "1",
+        initial_tab=initial_tab,
+        initial_path=Path(initial_path).expanduser().absolute()
+        if initial_path
+        else None,
+    )
+
+
 def run_app() -> None:
     DebugUtils.clear_stacktrace()
     _check_if_we_can_run()
 
+    # extra glob patterns for paths to treat as unwanted, separated like PATH
+    unwanted_patterns = os.environ.get("CHEZMOI_MOUSSE_UNWANTED_PATTERNS")
+    if unwanted_patterns:
+        PathMatcher.add_patterns(unwanted_patterns.split(os.pathsep))
+
+    # memory budget in MiB for highlighted file contents
+    content_cache_mib = os.environ.get("CHEZMOI_MOUSSE_CONTENT_CACHE_MIB", "")
+    if content_cache_mib.isdigit():
+        ContentCache.set_max_bytes(int(content_cache_mib) * 1024 * 1024)
+
+    # keep the command log output files after exit, they can contain template data
+    CmdArchive.keep_files = os.environ.get("CHEZMOI_MOUSSE_KEEP_CMD_LOG") == "1"
+
+    # hours to reuse the chezmoi doctor result, 0 runs doctor every session
+    doctor_ttl_hours = os.environ.get("CHEZMOI_MOUSSE_DOCTOR_TTL_HOURS", "")
+    if doctor_ttl_hours.isdigit():
+        DoctorCache.ttl_seconds = int(doctor_ttl_hours) * 60 * 60
+
     try:
-        app = ChezmoiGui()
+        app = ChezmoiGui(_get_startup_options())
         if os.environ.get("CHEZMOI_MOUSSE_PILOT_MODE") == "1":
+            from chezmoi_mousse.debug.pilot_mode import run_with_pilot
+
             run_with_pilot(app)
         else:
             app.run()
     except Exception as error:
         DebugUtils.save_stacktrace()
         raise error
+    finally:
+        SniffCache.save()
+        CmdArchive.close()
 
 
 if __name__ == "__main__":
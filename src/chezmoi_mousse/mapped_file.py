@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+from array import array
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+__all__ = ["CONTROL_CHARS", "MappedFile"]
+
+# the start of every STRIDE-th line is indexed, lines in between are found on read
+STRIDE = 64
+GROUP_RE = re.compile(rb"(?:[^\n]*\n){%d}" % STRIDE)
+# bytes read and matched while holding the lock, between two progress reports
+INDEX_CHUNK_BYTES = 1024 * 1024
+# bytes read at once when reading lines for the view
+READ_BYTES = 64 * 1024
+# longer lines are cut when read, to not decode a huge minified line at once
+MAX_LINE_BYTES = 16 * 1024
+# C0 and C1 control characters except tab, they would move the terminal cursor,
+# removed from text rendered as raw segments
+CONTROL_CHARS = dict.fromkeys(
+    code for code in (*range(0x20), *range(0x7F, 0xA0)) if code != ord("\t")
+)
+
+
+class MappedFile:
+    """A read-only view of a file with a sparse index of its lines.
+
+    Memory use doesn't depend on the file contents: lines are read with os.pread
+    when shown and the index holds one offset per STRIDE lines. Unlike a memory
+    map, a file truncated by another process only results in short reads.
+    """
+
+    def __init__(self, file_path: Path) -> None:
+        self.file_path = file_path
+        self._fd = os.open(file_path, os.O_RDONLY)
+        self._group_starts = array("q", [0])
+        self._lock = threading.Lock()
+        self._closed = False
+        self._indexing = False
+        self.line_count = 0
+
+    def index_lines(self) -> Iterator[int]:
+        """Indexes the file in batches, yields the number of lines found so far."""
+        with self._lock:
+            if self._closed:
+                return
+            self._indexing = True
+        try:
+            while True:
+                with self._lock:
+                    if self._closed:
+                        return
+                    done = self._index_batch()
+                yield self.line_count
+                if done:
+                    return
+        finally:
+            with self._lock:
+                self._indexing = False
+                if self._closed:
+                    os.close(self._fd)
+
+    def _index_batch(self) -> bool:
+        pos = self._group_starts[-1]
+        chunk = os.pread(self._fd, INDEX_CHUNK_BYTES, pos)
+        offset = 0
+        while (match := GROUP_RE.match(chunk, offset)) is not None:
+            offset = match.end()
+            self._group_starts.append(pos + offset)
+        groups_lines = STRIDE * (len(self._group_starts) - 1)
+        if len(chunk) < INDEX_CHUNK_BYTES:
+            # end of file, fewer than STRIDE lines are left after the last group
+            tail_lines = chunk.count(b"\n", offset)
+            if offset < len(chunk) and not chunk.endswith(b"\n"):
+                tail_lines += 1
+            self.line_count = groups_lines + tail_lines
+            return True
+        if offset:
+            self.line_count = groups_lines
+            return False
+        # STRIDE lines don't fit in a chunk, find the end of the group chunk by chunk
+        remaining = STRIDE
+        last_chunk = chunk
+        while chunk:
+            start = 0
+            while remaining and (end := chunk.find(b"\n", start)) != -1:
+                remaining -= 1
+                start = end + 1
+            if not remaining:
+                self._group_starts.append(pos + start)
+                self.line_count = groups_lines + STRIDE
+                return False
+            last_chunk = chunk
+            pos += len(chunk)
+            chunk = os.pread(self._fd, INDEX_CHUNK_BYTES, pos)
+        tail_lines = STRIDE - remaining
+        if not last_chunk.endswith(b"\n"):
+            tail_lines += 1
+        self.line_count = groups_lines + tail_lines
+        return True
+
+    def _iter_lines(self, pos: int) -> Iterator[bytes]:
+        partial = b""  # start of a line which continues in the next read
+        while True:
+            chunk = os.pread(self._fd, READ_BYTES, pos)
+            if not chunk:
+                if partial:
+                    yield partial  # the last line has no newline
+                return
+            pos += len(chunk)
+            start = 0
+            while (end := chunk.find(b"\n", start)) != -1:
+                yield (partial + chunk[start:end])[:MAX_LINE_BYTES]
+                partial = b""
+                start = end + 1
+            partial = (partial + chunk[start:])[:MAX_LINE_BYTES]
+
+    def read_lines(self, first: int, count: int) -> list[str]:
+        with self._lock:
+            if self._closed:
+                return []
+            group, skip = divmod(first, STRIDE)
+            if group >= len(self._group_starts):
+                return []
+            lines: list[str] = []
+            if count <= 0:
+                return lines
+            for index, line in enumerate(self._iter_lines(self._group_starts[group])):
+                if index < skip:
+                    continue
+                lines.append(
+                    line.decode("utf-8", errors="replace").translate(CONTROL_CHARS)
+                )
+                if len(lines) == count:
+                    break
+            return lines
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            # an indexing thread closes the file when it notices
+            if not self._indexing:
+                os.close(self._fd)
@@ -3,18 +3,23 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, NamedTuple
 
 if TYPE_CHECKING:
+    import os
     from pathlib import Path
 
-    from chezmoi_mousse.cm_types import PathKindMap, StatusMap
+    from chezmoi_mousse.cm_types import ArchiveLocation, PathKindMap, StatusMap
 
 
 __all__ = [
     "AffectedPaths",
+    "CmdLogEntry",
     "CommandResult",
+    "DirTreeEntry",
+    "GitLogRow",
     "ManagedTreePaths",
     "PwMgrData",
     "RunCommandInfo",
     "ScanDirItem",
+    "StartupOptions",
     "SwitchData",
 ]
 
@@ -29,6 +34,17 @@ class AffectedPaths(NamedTuple):
         return " ".join(str(p) for p in self.paths)
 
 
+class CmdLogEntry(NamedTuple):
+    number: int
+    full_cmd: str
+    pretty_cmd: str
+    returncode: int
+    time_stamp: str
+    # None if writing the archive failed, the result is then kept in memory
+    location: ArchiveLocation | None
+    result: CommandResult | None
+
+
 class CommandResult(NamedTuple):
     full_cmd: str
     path_arg: Path | None
@@ -39,6 +55,22 @@ class CommandResult(NamedTuple):
     time_stamp: str
 
 
+class DirTreeEntry(NamedTuple):
+    # None if the path was not listed with os.scandir
+    dir_entry: os.DirEntry[str] | None
+    is_dir: bool
+    is_managed: bool
+    # based on the name rules only, until checked is True
+    is_unwanted: bool
+    checked: bool
+
+
+class GitLogRow(NamedTuple):
+    rel_date: str
+    committer: str
+    subject: str
+
+
 class ManagedTreePaths(NamedTuple):
     managed_dirs: PathKindMap
     managed_files: PathKindMap
@@ -70,7 +102,7 @@ class PwMgrData(NamedTuple):
 
 
 class ScanDirItem(NamedTuple):
-    # matches the argument passed to the os_scan_dir function
+    # matches the argument passed to the _os_scan_dir function
     scanned_dir: Path
     managed_arg: bool
     # absolute path matchingthe DirEntry.path attribute
@@ -82,11 +114,20 @@ class ScanDirItem(NamedTuple):
     name: str
     # if it's a dir or if an exception occurs when calling .stat()
     file_size: int | None
-    # set by the os_scan_dir function
+    # set by the _os_scan_dir function
     sibling_count: int
     matches_unwanted: bool
 
 
+class StartupOptions(NamedTuple):
+    # push the main screen right away, the tabs are filled when the data is ready
+    fast_start: bool = False
+    # TabLabel of the main tab to show first, an empty string for the first tab
+    initial_tab: str = ""
+    # path to select in the managed trees
+    initial_path: Path | None = None
+
+
 class SwitchData(NamedTuple):
     label: str
     enabled_tooltip: str
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, ClassVar
+
+from chezmoi_mousse.str_enums import PathFilters
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+__all__ = ["PathMatcher"]
+
+_SEP = re.escape(os.sep)
+
+# a path component starting or ending with "cache", in any case
+_CACHE_PATTERN = rf"(?i:(?:^|{_SEP})cache|cache(?:{_SEP}|$))"
+
+_TEMPLATE_OPEN = re.compile(r"{{-?\s*(if|range|with|define|block)\b")
+_TEMPLATE_END = re.compile(r"{{-?\s*end\b")
+
+
+def _compile(patterns: list[str]) -> re.Pattern[str] | None:
+    return re.compile("|".join(patterns)) if patterns else None
+
+
+def _translate_doublestar(pattern: str) -> str:
+    # .chezmoiignore patterns are doublestar globs on slash separated target paths
+    translated: list[str] = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.endswith("/**") and i == len(pattern) - 3:
+            translated.append("(?:/.*)?")  # the directory itself and its contents
+            break
+        if pattern.startswith("**/", i):
+            translated.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            translated.append(".*")
+            i += 2
+            continue
+        if char == "*":
+            translated.append("[^/]*")
+        elif char == "?":
+            translated.append("[^/]")
+        elif char == "[" and (end := pattern.find("]", i + 1)) != -1:
+            char_class = pattern[i + 1 : end].replace("\\", "\\\\")
+            if char_class.startswith(("!", "^")):
+                char_class = "^" + char_class[1:]
+            translated.append(f"[{char_class}]")
+            i = end
+        elif char == "{" and (end := pattern.find("}", i + 1)) != -1:
+            alternatives = pattern[i + 1 : end].split(",")
+            translated.append(
+                f"(?:{'|'.join(_translate_doublestar(alt) for alt in alternatives)})"
+            )
+            i = end
+        else:
+            translated.append(re.escape(char))
+        i += 1
+    return "".join(translated)
+
+
+def _read_ignore_patterns(source_dir: Path) -> tuple[list[str], list[str]]:
+    # Returns the include and exclude patterns, lines in template blocks are
+    # skipped as their result depends on the template data.
+    include: list[str] = []
+    exclude: list[str] = []
+    for file_name in (".chezmoiignore", ".chezmoiignore.tmpl"):
+        try:
+            lines = (source_dir / file_name).read_text(encoding="utf-8").splitlines()
+        except OSError:
+            continue
+        template_depth = 0
+        for line in lines:
+            line = line.strip()
+            if "{{" in line:
+                if _TEMPLATE_OPEN.search(line):
+                    template_depth += 1
+                elif _TEMPLATE_END.search(line):
+                    template_depth = max(template_depth - 1, 0)
+                continue
+            if template_depth or not line or line.startswith("#"):
+                continue
+            if line.startswith("!"):
+                exclude.append(_translate_doublestar(line[1:]))
+            else:
+                include.append(_translate_doublestar(line))
+    return include, exclude
+
+
+class PathMatcher:
+    """PathFilters compiled once into frozensets and precompiled regexes."""
+
+    _unwanted_dir_names: ClassVar[frozenset[str]] = frozenset(
+        PathFilters.UNWANTED_DIRS.value
+    )
+    _key_file_names: ClassVar[frozenset[str]] = frozenset(
+        PathFilters.KEY_FILE_NAMES.value
+    )
+    _unwanted_suffixes: ClassVar[frozenset[str]] = frozenset(
+        PathFilters.KEY_FILE_EXTENSIONS.value + PathFilters.UNWANTED_FILE_SUFFIXES.value
+    )
+
+    # glob patterns translated to regexes, matched against the full path or the name
+    _path_patterns: ClassVar[list[str]] = [_CACHE_PATTERN]
+    _name_patterns: ClassVar[list[str]] = []
+    _path_re: ClassVar[re.Pattern[str] | None] = _compile(_path_patterns)
+    _name_re: ClassVar[re.Pattern[str] | None] = None
+
+    # from the chezmoi ignored output and the .chezmoiignore patterns
+    _dest_dir_prefix: ClassVar[str] = ""
+    _ignored_paths: ClassVar[frozenset[Path]] = frozenset()
+    _ignore_re: ClassVar[re.Pattern[str] | None] = None
+    _not_ignore_re: ClassVar[re.Pattern[str] | None] = None
+
+    @classmethod
+    def add_patterns(cls, patterns: Iterable[str]) -> None:
+        # Patterns containing a path separator match the full path, other patterns
+        # match the name of the file or directory, like .gitignore does.
+        for pattern in patterns:
+            pattern = pattern.strip()
+            if not pattern:
+                continue
+            if os.sep in pattern:
+                pattern_path = Path(pattern).expanduser()
+                # absolute patterns match from the root, others any trailing part
+                anchor = "^" if pattern_path.is_absolute() else f"(?:^|{_SEP})"
+                translated = fnmatch.translate(str(pattern_path))
+                cls._path_patterns.append(anchor + translated)
+            else:
+                cls._name_patterns.append(fnmatch.translate(pattern))
+        cls._path_re = _compile(cls._path_patterns)
+        cls._name_re = _compile(cls._name_patterns)
+
+    @classmethod
+    def set_ignored(
+        cls, *, dest_dir: Path, source_dir: Path, ignored_targets: Iterable[str]
+    ) -> None:
+        cls._dest_dir_prefix = f"{dest_dir}{os.sep}"
+        cls._ignored_paths = frozenset(
+            dest_dir / target for target in ignored_targets if target.strip()
+        )
+        include, exclude = _read_ignore_patterns(source_dir)
+        cls._ignore_re = _compile([f"(?:{pattern})" for pattern in include])
+        cls._not_ignore_re = _compile([f"(?:{pattern})" for pattern in exclude])
+
+    @staticmethod
+    def is_ignored(path: Path) -> bool:
+        """Paths chezmoi ignores, scanners skip them without stat'ing them."""
+        if path in PathMatcher._ignored_paths:
+            return True
+        if PathMatcher._ignored_paths and any(
+            parent in PathMatcher._ignored_paths for parent in path.parents
+        ):
+            return True
+        path_str = str(path)
+        if PathMatcher._ignore_re is None or not path_str.startswith(
+            PathMatcher._dest_dir_prefix
+        ):
+            return False
+        target = path_str[len(PathMatcher._dest_dir_prefix) :].replace(os.sep, "/")
+        return PathMatcher._ignore_re.fullmatch(target) is not None and (
+            PathMatcher._not_ignore_re is None
+            or PathMatcher._not_ignore_re.fullmatch(target) is None
+        )
+
+    @staticmethod
+    def _matches_patterns(path: Path) -> bool:
+        if PathMatcher._name_re is not None and PathMatcher._name_re.match(path.name):
+            return True
+        return (
+            PathMatcher._path_re is not None
+            and PathMatcher._path_re.search(str(path)) is not None
+        )
+
+    @staticmethod
+    def is_unwanted_file_path(file_path: Path) -> bool:
+        # covers sensitive files, unwanted suffixes and cache paths
+        return (
+            file_path.name in PathMatcher._key_file_names
+            or file_path.suffix in PathMatcher._unwanted_suffixes
+            or PathMatcher._matches_patterns(file_path)
+        )
+
+    @staticmethod
+    def is_unwanted_dir_path(dir_path: Path) -> bool:
+        return dir_path.name in PathMatcher._unwanted_dir_names or (
+            PathMatcher._matches_patterns(dir_path)
+        )
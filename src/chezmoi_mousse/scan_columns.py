@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from chezmoi_mousse.named_tuples import ScanDirItem
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+__all__ = ["ScanDirColumns"]
+
+# bits in ScanDirColumns.flags
+IS_DIR = 1
+IS_FILE = 2
+IS_SYMLINK = 4
+MATCHES_UNWANTED = 8
+
+NO_FILE_SIZE = -1
+
+
+@dataclass(slots=True)
+class ScanDirColumns:
+    """Result of scanning one directory, stored as parallel arrays.
+
+    The fields shared by all items are stored once, ScanDirItem views and their
+    Path objects are only created while iterating.
+    """
+
+    scanned_dir: Path
+    managed_arg: bool
+    sibling_count: int
+    names: list[str] = field(default_factory=lambda: [])
+    file_sizes: array[int] = field(default_factory=lambda: array("q"))
+    flags: array[int] = field(default_factory=lambda: array("B"))
+
+    def add_item(
+        self,
+        name: str,
+        *,
+        is_dir: bool,
+        is_file: bool,
+        is_symlink: bool,
+        file_size: int | None,
+        matches_unwanted: bool,
+    ) -> None:
+        self.names.append(name)
+        self.file_sizes.append(NO_FILE_SIZE if file_size is None else file_size)
+        self.flags.append(
+            (IS_DIR if is_dir else 0)
+            | (IS_FILE if is_file else 0)
+            | (IS_SYMLINK if is_symlink else 0)
+            | (MATCHES_UNWANTED if matches_unwanted else 0)
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[ScanDirItem]:
+        for name, file_size, flags in zip(
+            self.names, self.file_sizes, self.flags, strict=True
+        ):
+            yield ScanDirItem(
+                scanned_dir=self.scanned_dir,
+                managed_arg=self.managed_arg,
+                path=self.scanned_dir / name,
+                is_dir=bool(flags & IS_DIR),
+                is_file=bool(flags & IS_FILE),
+                is_symlink=bool(flags & IS_SYMLINK),
+                name=name,
+                file_size=None if file_size == NO_FILE_SIZE else file_size,
+                sibling_count=self.sibling_count,
+                matches_unwanted=bool(flags & MATCHES_UNWANTED),
+            )
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, ClassVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+__all__ = ["SourceState"]
+
+type GitState = tuple[str, int]
+type WalkState = tuple[int, int]
+
+# seconds between walks of the source dir, git changes are checked on each call
+WALK_INTERVAL = 60.0
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _git_dirs(working_tree: Path) -> tuple[Path, Path] | None:
+    # In a worktree or submodule checkout .git is a file pointing to the git dir,
+    # a worktree keeps the refs in the common dir of the main repository.
+    dot_git = working_tree / ".git"
+    try:
+        if dot_git.is_dir():
+            git_dir = dot_git
+        else:
+            gitdir_line = dot_git.read_text(encoding="utf-8").strip()
+            if not gitdir_line.startswith("gitdir: "):
+                return None
+            git_dir = Path(
+                os.path.normpath(working_tree / gitdir_line.removeprefix("gitdir: "))
+            )
+    except OSError:
+        return None
+    try:
+        common_dir = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+    except OSError:
+        return git_dir, git_dir
+    return git_dir, Path(os.path.normpath(git_dir / common_dir))
+
+
+class SourceState:
+    """Cheap fingerprint of the chezmoi source state.
+
+    The generation is bumped, and the registered cache_clear functions are called,
+    when the git HEAD, the git index or any file in the source dir changed. The
+    git state is compared on each check, the source dir is only walked every
+    WALK_INTERVAL seconds or when a full check is requested.
+    """
+
+    generation: int = 0
+
+    _source_dir: Path | None = None
+    _git_dir: Path | None = None
+    _common_dir: Path | None = None
+    _git_state: GitState | None = None
+    _walk_state: WalkState | None = None
+    _last_walk: float = 0.0
+    # directory mtimes tell which directories need to be listed again
+    _dir_mtimes: ClassVar[dict[Path, int]] = {}
+    _files_by_dir: ClassVar[dict[Path, list[Path]]] = {}
+    cache_clears: ClassVar[list[Callable[[], None]]] = []
+
+    @classmethod
+    def set_dirs(cls, *, source_dir: Path, working_tree: Path) -> None:
+        cls._source_dir = source_dir
+        git_dirs = _git_dirs(working_tree)
+        cls._git_dir, cls._common_dir = git_dirs if git_dirs else (None, None)
+        cls._dir_mtimes.clear()
+        cls._files_by_dir.clear()
+        # the first check creates the initial fingerprint
+        cls._git_state = None
+        cls._walk_state = None
+        cls._last_walk = 0.0
+
+    @classmethod
+    def _git_head(cls) -> str:
+        if cls._git_dir is None or cls._common_dir is None:
+            return ""
+        try:
+            head = (cls._git_dir / "HEAD").read_text(encoding="utf-8").strip()
+            if head.startswith("ref: "):
+                ref_path = cls._common_dir / head.removeprefix("ref: ")
+                if ref_path.is_file():
+                    return ref_path.read_text(encoding="utf-8").strip()
+                # the branch is only in packed-refs, which changes on each update
+                return f"{head}:{_mtime_ns(cls._common_dir / 'packed-refs')}"
+        except OSError:
+            return ""
+        return head  # detached HEAD
+
+    @classmethod
+    def _rescan_changed_dirs(cls, source_dir: Path) -> None:
+        to_scan = [
+            dir_path
+            for dir_path, mtime in cls._dir_mtimes.items()
+            if _mtime_ns(dir_path) != mtime
+        ]
+        if not cls._dir_mtimes:
+            to_scan.append(source_dir)
+        while to_scan:
+            dir_path = to_scan.pop()
+            try:
+                mtime = dir_path.stat().st_mtime_ns
+                with os.scandir(dir_path) as entries:
+                    dir_entries = list(entries)
+            except OSError:  # removed, forget it and its files
+                cls._dir_mtimes.pop(dir_path, None)
+                cls._files_by_dir.pop(dir_path, None)
+                continue
+            cls._dir_mtimes[dir_path] = mtime
+            files: list[Path] = []
+            for entry in dir_entries:
+                entry_path = Path(entry.path)
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name != ".git" and entry_path not in cls._dir_mtimes:
+                        to_scan.append(entry_path)
+                else:
+                    files.append(entry_path)
+            cls._files_by_dir[dir_path] = files
+
+    @classmethod
+    def _max_source_mtime(cls) -> tuple[int, int]:
+        # Listing is limited to directories with a new mtime, known files are only
+        # stat'ed to notice in-place edits, which don't change the directory mtime.
+        if cls._source_dir is None:
+            return (0, 0)
+        cls._rescan_changed_dirs(cls._source_dir)
+        max_mtime = max(cls._dir_mtimes.values(), default=0)
+        file_count = 0
+        for files in cls._files_by_dir.values():
+            file_count += len(files)
+            for file_path in files:
+                max_mtime = max(max_mtime, _mtime_ns(file_path))
+        return (max_mtime, file_count)
+
+    @classmethod
+    def _create_git_state(cls) -> GitState:
+        index_mtime = _mtime_ns(cls._git_dir / "index") if cls._git_dir else 0
+        return (cls._git_head(), index_mtime)
+
+    @classmethod
+    def check(cls, *, full: bool = False) -> bool:
+        """Returns True if the source state changed since the previous check."""
+        if cls._source_dir is None:
+            return False
+        git_state = cls._create_git_state()
+        git_changed = cls._git_state is not None and git_state != cls._git_state
+        cls._git_state = git_state
+        # after a git change the walk only updates the state for later checks
+        if full or git_changed or time.monotonic() - cls._last_walk >= WALK_INTERVAL:
+            walk_state = cls._max_source_mtime()
+            cls._last_walk = time.monotonic()
+            walk_changed = cls._walk_state is not None and walk_state != cls._walk_state
+            cls._walk_state = walk_state
+        else:
+            walk_changed = False
+        if not git_changed and not walk_changed:
+            return False
+        cls.generation += 1
+        for cache_clear in cls.cache_clears:
+            cache_clear()
+        return True
@@ -7,6 +7,8 @@ from typing import TYPE_CHECKING
 from chezmoi_mousse.named_tuples import CommandResult
 
 if TYPE_CHECKING:
+    from collections.abc import Set
+
     from chezmoi_mousse.cm_types import ParsedJson
 
 
@@ -59,7 +61,6 @@ EMPTY_CMD_RESULT = CommandResult(
 cat_config_result: CommandResult = EMPTY_CMD_RESULT
 doctor_result: CommandResult = EMPTY_CMD_RESULT
 dump_config_result: CommandResult = EMPTY_CMD_RESULT
-git_log_result: CommandResult = EMPTY_CMD_RESULT
 git_remote_result: CommandResult = EMPTY_CMD_RESULT
 ignored_result: CommandResult = EMPTY_CMD_RESULT
 managed_dirs_result: CommandResult = EMPTY_CMD_RESULT
@@ -78,11 +79,7 @@ changed_paths: ChangedPaths = ChangedPaths()
 # Functions
 def splash_results() -> list[CommandResult]:
     return [
-        cat_config_result,
-        doctor_result,
         dump_config_result,
-        git_log_result,
-        git_remote_result,
         ignored_result,
         managed_dirs_result,
         managed_files_result,
@@ -122,6 +119,39 @@ async def store_current_snapshot() -> None:
     _managed_snapshot = _create_results_snapshot()
 
 
+def _merge_status_lines(
+    full_result: CommandResult, scoped_result: CommandResult, touched: Set[Path]
+) -> CommandResult:
+    lines = {
+        line[3:]: line
+        for line in full_result.std_out.splitlines()
+        if Path(line[3:]) not in touched
+    }
+    lines.update((line[3:], line) for line in scoped_result.std_out.splitlines())
+    return full_result._replace(
+        std_out="\n".join(lines[key] for key in sorted(lines)),
+        time_stamp=scoped_result.time_stamp,
+    )
+
+
+def merge_scoped_status(
+    touched: Set[Path],
+    *,
+    dirs_result: CommandResult | None,
+    files_result: CommandResult | None,
+) -> None:
+    # replace the status lines for the touched paths with a scoped status run
+    global status_dirs_result, status_files_result
+    if dirs_result is not None:
+        status_dirs_result = _merge_status_lines(
+            status_dirs_result, dirs_result, touched
+        )
+    if files_result is not None:
+        status_files_result = _merge_status_lines(
+            status_files_result, files_result, touched
+        )
+
+
 async def update_changed_paths() -> None:
     global changed_paths
     new_snapshot = _create_results_snapshot()
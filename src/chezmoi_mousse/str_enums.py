@@ -9,6 +9,7 @@ __all__ = [
     "ChezmoiGitArgs",
     "ColorVar",
     "ContainerName",
+    "DiffLineKind",
     "FlatBtnLabel",
     "GlobalArgs",
     "StaticString",
@@ -52,6 +53,7 @@ class BindingDescription(StrEnum):
 class Chars(StrEnum):
     burger = "\u2261"  # IDENTICAL TO
     down_triangle = "\u25be"  # BLACK DOWN-POINTING SMALL TRIANGLE
+    horizontal_ellipsis = "\u22ef"  # MIDLINE HORIZONTAL ELLIPSIS
     lower_3_8ths_block = "\u2583"  # LOWER THREE EIGHTHS BLOCK
     right_arrow = f"{'\u2014' * 3}\u2192"  # EM DASH, RIGHTWARDS ARROW
     right_triangle = "\u25b8"  # BLACK RIGHT-POINTING SMALL TRIANGLE
@@ -106,6 +108,17 @@ class ContainerName(StrEnum):
     test_paths_view = auto()
 
 
+class DiffLineKind(StrEnum):
+    added = auto()
+    changed = auto()
+    context = auto()
+    file_header = auto()
+    header = auto()
+    hunk_header = auto()
+    removed = auto()
+    unhandled = auto()
+
+
 class FlatBtnLabel(StrEnum):
     cat_config = "Cat Config"
     debug_log = "Debug Log"
@@ -131,6 +144,11 @@ class LogString(StrEnum):
     added_managed = "New managed paths"
     app_log_initialized = "Application log initialized"
     changed_status = "New managed paths"
+    cmd_log_filter = "Filter on command or path, rc:1 or rc:!0 for the returncode"
+    cmd_output_not_archived = (
+        "Output not kept, it can contain decrypted or templated file contents"
+    )
+    cmd_output_rotated = "Output no longer available, the command log was rotated"
     debug_log_initialized = "Debug log initialized"
     debug_tab_enabled = "Debug tab enabled"
     doctor_errors_found = "See the Config tab for errors"
@@ -515,6 +533,7 @@ class SectionLabel(StrEnum):
 
 
 class StaticString(StrEnum):
+    cannot_decode = "Binary file, the contents can't be decoded as UTF-8 text"
     click_path_with_status = "<- click a path with a status to see its diff"
     click_file_for_contents = "<- Click a file path to see its contents"
 
@@ -561,12 +580,16 @@ class TabLabel(StrEnum):
 class Tcss(StrEnum):
     add_tab_contents_view = auto()
     added = auto()
+    added_words = auto()
     changed = auto()
+    cmd_failed = auto()
+    cmd_succeeded = auto()
     context = auto()
     dest_dir_tree_label = auto()
     flat_button = auto()
     flat_section_label = auto()
     flow_diagram = auto()
+    folded_context = auto()
     full_cmd = auto()
     info = auto()
     last_clicked_flat_btn = auto()
@@ -581,6 +604,7 @@ class Tcss(StrEnum):
     pw_mgr_group = auto()
     refresh_button = auto()
     removed = auto()
+    removed_words = auto()
     single_button_vertical = auto()
     sub_section_label = auto()
     tab_button = auto()
@@ -608,7 +632,6 @@ class ChezmoiGitArgs(Enum):
     git_log_args = (
         "--date-order",
         "--format=%ar%x1f%cn%x1f%s%x00",
-        "--max-count=100",
         "--no-color",
         "--no-decorate",
         "--no-expand-tabs",
@@ -638,6 +661,7 @@ class VerbArgs(StrEnum):
     format_json = "--format=json"
     include_dirs = "--include=dirs"
     include_files = "--include=files"
+    non_recursive = "--recursive=false"
     path_style_absolute = "--path-style=absolute"
     reverse = "--reverse"
 
@@ -662,7 +686,12 @@ class ReadCmd(Enum):
     @classmethod
     def splash_only_commands(cls) -> tuple["ReadCmd", ...]:
         # TODO: create function to re-run the loading screen
-        return (cls.cat_config, cls.doctor, cls.git_remote, cls.ignored)
+        return (cls.ignored,)
+
+    @classmethod
+    def deferred_commands(cls) -> tuple["ReadCmd", ...]:
+        # only needed by the Config tab, run after the main screen is shown
+        return (cls.cat_config, cls.git_remote, cls.doctor)
 
     @classmethod
     def json_parsable_commands(cls) -> tuple["ReadCmd", ...]:
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import os
+import time
+from dataclasses import dataclass, field
+from enum import StrEnum
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from chezmoi_mousse import store
+from chezmoi_mousse.cm_attributes import ManagedPaths
+from chezmoi_mousse.functions import Commands
+from chezmoi_mousse.path_matcher import PathMatcher
+from chezmoi_mousse.source_state import SourceState
+from chezmoi_mousse.str_enums import ReadCmd
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from chezmoi_mousse.cm_attributes import CmAttributes
+
+__all__ = ["TaskGraph", "startup_graph"]
+
+# Each task waits in a thread on a chezmoi subprocess. Every chezmoi process
+# reads and templates the source state, this limits how many of them compete for
+# the cores and the disk at once.
+MAX_CONCURRENT_TASKS = min(8, os.cpu_count() or 1)
+
+
+class TaskName(StrEnum):
+    parse_json_outputs = "parse json outputs"
+    set_cm_attributes = "set cmattr"
+    set_ignored = "set ignored paths"
+
+
+@dataclass(frozen=True, slots=True)
+class GraphTask:
+    name: str
+    run: Callable[[], object]
+    requires: tuple[str, ...]
+    # blocking work runs in a thread, other tasks on the event loop
+    thread: bool
+
+
+@dataclass(slots=True)
+class TaskGraph:
+    """Tasks which declare the tasks they depend on, run as soon as these finish.
+
+    Threaded tasks are limited to max_concurrent at a time. The seconds each task
+    took and when it finished are kept to find the critical path of the last run.
+    """
+
+    max_concurrent: int = MAX_CONCURRENT_TASKS
+    tasks: dict[str, GraphTask] = field(default_factory=lambda: {})
+    durations: dict[str, float] = field(default_factory=lambda: {})
+    finished_at: dict[str, float] = field(default_factory=lambda: {})
+
+    def add(
+        self,
+        name: str,
+        run: Callable[[], object],
+        *,
+        requires: Iterable[str] = (),
+        thread: bool = True,
+    ) -> None:
+        if name in self.tasks:
+            raise ValueError(f"Task {name!r} was already added")
+        self.tasks[name] = GraphTask(
+            name=name, run=run, requires=tuple(requires), thread=thread
+        )
+
+    def add_read_cmds(self, read_cmds: Iterable[ReadCmd]) -> None:
+        # the task name is the ReadCmd name, the task result the CommandResult
+        for read_cmd in read_cmds:
+            self.add(
+                read_cmd.name, partial(Commands.run_read_cmd, read_cmd, path_arg=None)
+            )
+
+    def _check(self) -> None:
+        # Kahn's algorithm, tasks left with unmet requirements are part of a cycle
+        waiting_on = {name: len(task.requires) for name, task in self.tasks.items()}
+        required_by: dict[str, list[str]] = {name: [] for name in self.tasks}
+        for task in self.tasks.values():
+            for required in task.requires:
+                if required not in self.tasks:
+                    raise ValueError(
+                        f"Task {task.name!r} requires unknown {required!r}"
+                    )
+                required_by[required].append(task.name)
+        ready = [name for name, count in waiting_on.items() if count == 0]
+        while ready:
+            for dependent in required_by[ready.pop()]:
+                waiting_on[dependent] -= 1
+                if waiting_on[dependent] == 0:
+                    ready.append(dependent)
+        in_cycle = sorted(name for name, count in waiting_on.items() if count)
+        if in_cycle:
+            raise ValueError(f"Tasks with cyclic requirements: {', '.join(in_cycle)}")
+
+    async def run(self, on_done: Callable[[str, object], None] | None = None) -> None:
+        """Runs all tasks, on_done is called on the event loop with each result."""
+        self._check()
+        self.durations.clear()
+        self.finished_at.clear()
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        done = {name: asyncio.Event() for name in self.tasks}
+        graph_start = time.monotonic()
+
+        async def run_task(task: GraphTask) -> None:
+            for required in task.requires:
+                await done[required].wait()
+            if task.thread:
+                async with semaphore:
+                    start = time.monotonic()
+                    result = await asyncio.to_thread(task.run)
+            else:
+                start = time.monotonic()
+                result = task.run()
+                if inspect.isawaitable(result):
+                    result = await result
+            self.durations[task.name] = time.monotonic() - start
+            self.finished_at[task.name] = time.monotonic() - graph_start
+            done[task.name].set()
+            if on_done is not None:
+                on_done(task.name, result)
+
+        async with asyncio.TaskGroup() as task_group:
+            for task in self.tasks.values():
+                task_group.create_task(run_task(task))
+
+    def critical_path(self) -> list[str]:
+        """The chain of tasks which determined when the last run finished."""
+        if not self.finished_at:
+            return []
+        name = max(self.finished_at, key=self.finished_at.__getitem__)
+        path = [name]
+        while self.tasks[name].requires:
+            name = max(self.tasks[name].requires, key=self.finished_at.__getitem__)
+            path.append(name)
+        return path[::-1]
+
+
+def _parse_json_outputs() -> None:
+    parsed_dump_config = Commands.json_loads(store.dump_config_result.std_out)
+    store.parsed_dump_config = parsed_dump_config
+    Commands.dest_dir = store.get_dest_dir()
+    SourceState.set_dirs(
+        source_dir=Path(parsed_dump_config["sourceDir"]),
+        working_tree=Path(parsed_dump_config["workingTree"]),
+    )
+    parsed_template_data = Commands.json_loads(store.template_data_result.std_out)
+    store.parsed_template_data = parsed_template_data
+
+
+def _set_cm_attributes(cmattr: CmAttributes) -> None:
+    cmattr.paths = ManagedPaths()
+    cmattr.add_path = store.get_dest_dir()
+    cmattr.apply_path = store.get_dest_dir()
+    cmattr.re_add_path = store.get_dest_dir()
+
+
+def _set_ignored() -> None:
+    PathMatcher.set_ignored(
+        dest_dir=store.get_dest_dir(),
+        source_dir=Path(store.parsed_dump_config["sourceDir"]),
+        ignored_targets=store.ignored_result.std_out.splitlines(),
+    )
+
+
+def startup_graph(cmattr: CmAttributes) -> TaskGraph:
+    """The commands and tasks to run before the managed paths can be shown."""
+    graph = TaskGraph()
+    graph.add_read_cmds(
+        ReadCmd.json_parsable_commands()
+        + ReadCmd.managed_commands()
+        + ReadCmd.splash_only_commands()
+    )
+    graph.add(
+        TaskName.parse_json_outputs,
+        _parse_json_outputs,
+        requires=(cmd.name for cmd in ReadCmd.json_parsable_commands()),
+        thread=False,
+    )
+    graph.add(
+        TaskName.set_cm_attributes,
+        partial(_set_cm_attributes, cmattr),
+        requires=(
+            TaskName.parse_json_outputs,
+            *(cmd.name for cmd in ReadCmd.managed_commands()),
+        ),
+        thread=False,
+    )
+    # the scanners skip ignored paths, set before the main screen scans
+    graph.add(
+        TaskName.set_ignored,
+        _set_ignored,
+        requires=(TaskName.parse_json_outputs, ReadCmd.ignored.name),
+        thread=False,
+    )
+    return graph
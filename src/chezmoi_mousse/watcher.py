@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from chezmoi_mousse.caches import stat_key
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from chezmoi_mousse.cm_types import StatKey
+
+__all__ = ["PathWatcher"]
+
+# inotify event masks from <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+# the kernel event queue overflowed, events were lost
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = (
+    IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+)
+# struct inotify_event without the variable length name
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Minimal inotify binding using ctypes, watching directories only."""
+
+    def __init__(self, libc: ctypes.CDLL, fd: int) -> None:
+        self._libc = libc
+        self._fd = fd
+        self._watched_dirs: dict[int, Path] = {}
+        self._dir_paths: set[Path] = set()
+        self._failed_dirs: set[Path] = set()
+
+    @classmethod
+    def create(cls) -> _Inotify | None:
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd: int = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        return cls(libc, fd) if fd >= 0 else None
+
+    def watch(self, path: Path) -> bool:
+        # A watch on the parent directory reports changes to the path itself,
+        # including editors replacing a file by renaming a new one over it.
+        dir_path = path.parent
+        if dir_path in self._failed_dirs:
+            return False
+        if dir_path in self._dir_paths:
+            return True
+        wd: int = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(dir_path), WATCH_MASK
+        )
+        if wd < 0:  # missing directory or the max_user_watches limit was reached
+            self._failed_dirs.add(dir_path)
+            return False
+        self._watched_dirs[wd] = dir_path
+        self._dir_paths.add(dir_path)
+        return True
+
+    def read_paths(self, timeout: float) -> tuple[set[Path], bool]:
+        """Returns the changed paths and whether the event queue overflowed."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set(), False
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set(), False
+        paths: set[Path] = set()
+        overflowed = False
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, name_len = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + name_len].rstrip(b"\0")
+            offset += name_len
+            if mask & IN_Q_OVERFLOW:
+                overflowed = True
+                continue
+            dir_path = self._watched_dirs.get(wd)
+            if dir_path is not None and name:
+                paths.add(dir_path / os.fsdecode(name))
+        return paths, overflowed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def _poll_stat(path: Path) -> StatKey | None:
+    try:
+        return stat_key(path.lstat())
+    except OSError:
+        return None
+
+
+class PathWatcher:
+    """Reports batches of changed paths from a background thread.
+
+    Uses inotify where available, paths it can't watch are polled for stat changes.
+    If inotify lost events, on_overflow is called instead, any path can have changed.
+    """
+
+    BATCH_DELAY = 0.5  # seconds without new changes before a batch is reported
+    POLL_INTERVAL = 2.0
+
+    def __init__(
+        self,
+        on_change: Callable[[set[Path]], None],
+        on_overflow: Callable[[], None],
+    ) -> None:
+        self._on_change = on_change
+        self._on_overflow = on_overflow
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, paths: frozenset[Path]) -> None:
+        self.stop()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(paths, self._stop_event),
+            name="path_watcher",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _run(self, paths: frozenset[Path], stop_event: threading.Event) -> None:
+        inotify = _Inotify.create()
+        if inotify is None:
+            polled = set(paths)
+        else:
+            polled = {path for path in paths if not inotify.watch(path)}
+        stat_keys = {path: _poll_stat(path) for path in polled}
+
+        pending: set[Path] = set()
+        last_change = next_poll = time.monotonic()
+        try:
+            while not stop_event.is_set():
+                changed: set[Path]
+                if inotify is not None:
+                    changed, overflowed = inotify.read_paths(
+                        timeout=self.BATCH_DELAY / 2
+                    )
+                    if overflowed:
+                        # the full refresh includes the pending paths
+                        self._on_overflow()
+                        pending = set()
+                        continue
+                else:
+                    stop_event.wait(self.BATCH_DELAY / 2)
+                    changed = set()
+                now = time.monotonic()
+                if polled and now >= next_poll:
+                    next_poll = now + self.POLL_INTERVAL
+                    for path in polled:
+                        new_key = _poll_stat(path)
+                        if new_key != stat_keys[path]:
+                            stat_keys[path] = new_key
+                            changed.add(path)
+                # events for unmanaged siblings in watched directories are dropped
+                changed &= paths
+                if changed:
+                    pending |= changed
+                    last_change = now
+                elif pending and now - last_change >= self.BATCH_DELAY:
+                    self._on_change(pending)
+                    pending = set()
+        finally:
+            if inotify is not None:
+                inotify.close()
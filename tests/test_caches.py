@@ -0,0 +1,139 @@
+from collections import OrderedDict
+from pathlib import Path
+
+import pytest
+from rich.text import Text
+
+from chezmoi_mousse.caches import ContentCache, ScanCache, SniffCache
+from chezmoi_mousse.scan_columns import ScanDirColumns
+from chezmoi_mousse.str_enums import PathKind
+
+
+@pytest.fixture
+def sniff_cache(monkeypatch: pytest.MonkeyPatch) -> type[SniffCache]:
+    # an empty cache, not loaded from or saved to the user's cache dir
+    monkeypatch.setattr(SniffCache, "_entries", OrderedDict())
+    monkeypatch.setattr(SniffCache, "_loaded", True)
+    monkeypatch.setattr(SniffCache, "_dirty", False)
+    monkeypatch.setattr(SniffCache, "MAX_ENTRIES", 3)
+    return SniffCache
+
+
+def test_sniff_cache_evicts_least_recently_used(
+    sniff_cache: type[SniffCache],
+) -> None:
+    for ino in range(3):
+        sniff_cache.put((1, ino, 0, 0), False)
+    assert sniff_cache.get((1, 0, 0, 0)) is False  # now the most recently used
+    sniff_cache.put((1, 3, 0, 0), True)
+    assert sniff_cache.get((1, 1, 0, 0)) is None
+    assert sniff_cache.get((1, 0, 0, 0)) is False
+    assert sniff_cache.get((1, 3, 0, 0)) is True
+
+
+def test_sniff_cache_hit_is_not_saved(sniff_cache: type[SniffCache]) -> None:
+    sniff_cache.put((1, 0, 0, 0), True)
+    assert sniff_cache._dirty
+    sniff_cache._dirty = False
+    assert sniff_cache.get((1, 0, 0, 0)) is True
+    assert not sniff_cache._dirty
+
+
+@pytest.fixture
+def scan_cache(monkeypatch: pytest.MonkeyPatch) -> type[ScanCache]:
+    monkeypatch.setattr(ScanCache, "_entries", OrderedDict())
+    monkeypatch.setattr(ScanCache, "_item_count", 0)
+    monkeypatch.setattr(ScanCache, "MAX_ITEMS", 10)
+    return ScanCache
+
+
+def _scan_result(dir_path: Path, item_count: int) -> ScanDirColumns:
+    columns = ScanDirColumns(
+        scanned_dir=dir_path, managed_arg=False, sibling_count=item_count
+    )
+    for i in range(item_count):
+        columns.add_item(
+            f"file_{i}",
+            is_dir=False,
+            is_file=True,
+            is_symlink=False,
+            file_size=i,
+            matches_unwanted=False,
+        )
+    return columns
+
+
+def test_scan_cache_invalid_after_dir_mtime_change(
+    scan_cache: type[ScanCache],
+) -> None:
+    key = (Path("/dir"), False)
+    result = _scan_result(key[0], 3)
+    scan_cache.put(key, 1, result)
+    assert scan_cache.get(key, 1) is result
+    assert scan_cache.get(key, 2) is None
+    assert scan_cache.get(key, 1) is None  # the stale entry was removed
+    assert scan_cache._item_count == 0
+
+
+def test_scan_cache_evicts_by_item_count(scan_cache: type[ScanCache]) -> None:
+    keys = [(Path(f"/dir_{i}"), False) for i in range(3)]
+    for key in keys:
+        scan_cache.put(key, 1, _scan_result(key[0], 4))
+    # 12 items, the least recently used directory was evicted
+    assert scan_cache.get(keys[0], 1) is None
+    assert scan_cache.get(keys[1], 1) is not None
+    scan_cache.put((Path("/kind"), True), 1, PathKind.man_dir_not_exists)
+    scan_cache.put((Path("/dir_3"), False), 1, _scan_result(Path("/dir_3"), 2))
+    # dir_1 was used more recently than dir_2
+    assert scan_cache.get(keys[2], 1) is None
+    assert scan_cache.get(keys[1], 1) is not None
+    assert scan_cache._item_count == 7
+
+
+def test_scan_cache_skips_large_dirs(scan_cache: type[ScanCache]) -> None:
+    key = (Path("/large"), False)
+    scan_cache.put(key, 1, _scan_result(key[0], 11))
+    assert scan_cache.get(key, 1) is None
+    assert scan_cache._item_count == 0
+
+
+@pytest.fixture
+def content_cache(monkeypatch: pytest.MonkeyPatch) -> type[ContentCache]:
+    monkeypatch.setattr(ContentCache, "_entries", OrderedDict())
+    monkeypatch.setattr(ContentCache, "_total_bytes", 0)
+    monkeypatch.setattr(ContentCache, "max_bytes", ContentCache.max_bytes)
+    monkeypatch.setattr(ContentCache, "hits", 0)
+    monkeypatch.setattr(ContentCache, "misses", 0)
+    return ContentCache
+
+
+def test_content_cache_evicts_by_size(content_cache: type[ContentCache]) -> None:
+    texts = {Path(f"/file_{i}"): Text("x" * 1000) for i in range(4)}
+    entry_bytes = content_cache._estimate_size((texts[Path("/file_0")], None))
+    content_cache.set_max_bytes(entry_bytes * 3)
+    for path, text in texts.items():
+        content_cache.put((path, 1, 1), (text, None))
+    assert content_cache.get((Path("/file_0"), 1, 1)) is None
+    assert content_cache.get((Path("/file_1"), 1, 1)) is not None
+    assert content_cache._total_bytes == entry_bytes * 3
+    # a smaller budget evicts the least recently used entries
+    content_cache.set_max_bytes(entry_bytes)
+    assert content_cache.get((Path("/file_1"), 1, 1)) is not None
+    assert content_cache.get((Path("/file_3"), 1, 1)) is None
+    assert content_cache.hits == 2
+    assert content_cache.misses == 2
+
+
+def test_content_cache_replaces_and_skips_large_entries(
+    content_cache: type[ContentCache],
+) -> None:
+    key = (Path("/file"), 1)
+    small = Text("small")
+    content_cache.put(key, (small, None))
+    content_cache.put(key, (small, None))
+    assert content_cache._total_bytes == content_cache._estimate_size((small, None))
+    content_cache.set_max_bytes(content_cache._total_bytes * 2)
+    # too large to cache, also drops the previous entry for the key
+    content_cache.put(key, (Text("x" * 10_000), None))
+    assert content_cache.get(key) is None
+    assert content_cache._total_bytes == 0
@@ -0,0 +1,93 @@
+from chezmoi_mousse.diff_model import parse_diff
+from chezmoi_mousse.named_tuples import CommandResult
+from chezmoi_mousse.str_enums import DiffLineKind as Kind
+
+DIFF = """\
+diff --git a/.bashrc b/.bashrc
+index 1111111..2222222 100644
+--- a/.bashrc
++++ b/.bashrc
+@@ -1,3 +1,3 @@
+ export EDITOR=vim
+-alias ll='ls -l'
++alias ll='ls -la'
+ export PAGER=less
+diff --git a/.zshrc b/.zshrc
+deleted file mode 100644
+@@ -1 +0,0 @@
+-completely different
++nothing in common here
+\\ No newline at end of file
+"""
+
+
+def _result(std_out: str) -> CommandResult:
+    return CommandResult(
+        full_cmd="chezmoi diff",
+        path_arg=None,
+        pretty_cmd="chezmoi diff",
+        returncode=0,
+        std_err="",
+        std_out=std_out,
+        time_stamp="",
+    )
+
+
+def test_parse_diff_line_kinds() -> None:
+    parsed = parse_diff(_result(DIFF))
+    assert parsed.kinds == [
+        Kind.file_header,
+        Kind.header,
+        Kind.removed,
+        Kind.added,
+        Kind.hunk_header,
+        Kind.context,
+        Kind.removed,
+        Kind.added,
+        Kind.context,
+        Kind.file_header,
+        Kind.removed,
+        Kind.hunk_header,
+        Kind.removed,
+        Kind.added,
+        Kind.context,
+    ]
+    assert [parsed.line_text(i) for i in range(len(parsed))] == DIFF.splitlines()
+    assert [file.header for file in parsed.files] == [0, 9]
+    assert [(hunk.header, hunk.end) for hunk in parsed.files[0].hunks] == [(4, 9)]
+    assert [(hunk.header, hunk.end) for hunk in parsed.files[1].hunks] == [(11, 15)]
+    assert parsed.max_width == max(len(line) for line in DIFF.splitlines())
+
+
+def test_word_spans() -> None:
+    parsed = parse_diff(_result(DIFF))
+    # the changed words, after the +/- marker
+    old_line = parsed.line_text(6)
+    new_line = parsed.line_text(7)
+    [(old_start, old_end)] = parsed.word_spans(6)
+    [(new_start, new_end)] = parsed.word_spans(7)
+    assert old_line[old_start:old_end] == "l"
+    assert new_line[new_start:new_end] == "la"
+    # lines with too little in common are shown as completely changed
+    assert parsed.word_spans(12) == []
+    assert parsed.word_spans(13) == []
+    # headers and context lines have no spans
+    assert parsed.word_spans(2) == []
+    assert parsed.word_spans(5) == []
+
+
+def test_hunk_without_file_header() -> None:
+    parsed = parse_diff(_result("@@ -1 +1 @@\n-a b\n+a c\nnot in a hunk\n"))
+    assert parsed.kinds == [
+        Kind.hunk_header,
+        Kind.removed,
+        Kind.added,
+        Kind.unhandled,
+    ]
+    assert parsed.word_spans(2) == [(3, 4)]
+
+
+def test_line_text_strips_control_characters() -> None:
+    parsed = parse_diff(_result("@@ -1 +1 @@\n-a\x1b[31mred\n+a\tb\x07\n"))
+    assert parsed.line_text(1) == "-a[31mred"
+    assert parsed.line_text(2) == "+a      b"
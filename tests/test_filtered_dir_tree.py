@@ -0,0 +1,59 @@
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+from textual.app import App, ComposeResult
+
+from chezmoi_mousse.gui.common.filtered_dir_tree import FilteredDirTree
+
+
+class DirTreeApp(App[None]):
+    def __init__(self, dest_dir: Path, managed_paths: set[Path]) -> None:
+        super().__init__()
+        self.dest_dir = dest_dir
+        # the only attribute of ChezmoiGui.cmattr the tree uses
+        self.cmattr = SimpleNamespace(
+            paths=SimpleNamespace(managed_paths_set=managed_paths)
+        )
+
+    def compose(self) -> ComposeResult:
+        yield FilteredDirTree(dest_dir=self.dest_dir)
+
+
+def _child_names(tree: FilteredDirTree, dir_path: Path) -> list[str]:
+    for node in tree.root.children:
+        if node.data is not None and node.data.path == dir_path:
+            return [str(child.label) for child in node.children]
+    raise AssertionError(f"no node for {dir_path}")
+
+
+def test_toggle_shows_children_of_fully_filtered_dir(tmp_path: Path) -> None:
+    managed_dir = tmp_path / "managed_dir"
+    managed_dir.mkdir()
+    managed_file = managed_dir / "managed_file"
+    managed_file.write_text("managed\n")
+
+    async def run() -> None:
+        app = DirTreeApp(tmp_path, {managed_file})
+        async with app.run_test() as pilot:
+            tree = app.query_exactly_one(FilteredDirTree)
+            await pilot.pause(0.3)
+            dir_node = next(
+                node
+                for node in tree.root.children
+                if node.data is not None and node.data.path == managed_dir
+            )
+            dir_node.expand()
+            await pilot.pause(0.3)
+            # the only child is managed, hidden while show_managed is off
+            assert _child_names(tree, managed_dir) == []
+
+            tree.show_managed = True
+            await pilot.pause(0.3)
+            assert _child_names(tree, managed_dir) == ["managed_file"]
+
+            tree.show_managed = False
+            await pilot.pause(0.3)
+            assert _child_names(tree, managed_dir) == []
+
+    asyncio.run(run())
@@ -0,0 +1,36 @@
+from chezmoi_mousse.git_log_pages import GIT_LOG_PAGE_SIZE, GitLogPages
+from chezmoi_mousse.named_tuples import GitLogRow
+
+
+def _page(first: int, count: int) -> str:
+    # like git log --format=%ar%x1f%cn%x1f%s%x00, with a newline after each record
+    return "".join(
+        f"{i} hours ago\x1fCommitter\x1fUpdate file {i}\x00\n"
+        for i in range(first, first + count)
+    )
+
+
+def test_add_page() -> None:
+    pages = GitLogPages()
+    pages.add_page(_page(0, GIT_LOG_PAGE_SIZE))
+    assert len(pages.rows) == GIT_LOG_PAGE_SIZE
+    assert not pages.complete
+    assert pages.rows[1] == GitLogRow("1 hours ago", "Committer", "Update file 1")
+
+    pages.add_page(_page(GIT_LOG_PAGE_SIZE, 3))
+    assert len(pages.rows) == GIT_LOG_PAGE_SIZE + 3
+    assert pages.complete
+
+
+def test_add_empty_page() -> None:
+    pages = GitLogPages()
+    pages.add_page("")
+    assert pages.rows == []
+    assert pages.complete
+
+
+def test_subject_with_separators() -> None:
+    pages = GitLogPages()
+    pages.add_page("now\x1fCommitter\x1fsubject with \x1f in it\x00\n\x00")
+    assert pages.rows == [GitLogRow("now", "Committer", "subject with \x1f in it")]
+    assert pages.complete
@@ -0,0 +1,93 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from chezmoi_mousse import mapped_file
+from chezmoi_mousse.mapped_file import MappedFile
+
+
+def _index(file_path: Path) -> MappedFile:
+    mapped = MappedFile(file_path)
+    for _ in mapped.index_lines():
+        pass
+    return mapped
+
+
+@pytest.mark.parametrize("chunk_bytes", [1024 * 1024, 100, 7])
+@pytest.mark.parametrize("line_count", [0, 1, 63, 64, 65, 1000])
+@pytest.mark.parametrize("newline_at_end", [True, False])
+def test_index_and_read_lines(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    chunk_bytes: int,
+    line_count: int,
+    newline_at_end: bool,
+) -> None:
+    # small chunks split the STRIDE line groups over several reads
+    monkeypatch.setattr(mapped_file, "INDEX_CHUNK_BYTES", chunk_bytes)
+    rng = random.Random(line_count)
+    lines = ["x" * rng.randint(0, 50) for _ in range(line_count)]
+    data = "\n".join(lines)
+    if newline_at_end and lines:
+        data += "\n"
+    file_path = tmp_path / "file"
+    file_path.write_text(data)
+
+    expected = data.split("\n")
+    if expected[-1] == "":
+        expected.pop()  # the newline ends the last line
+
+    mapped = _index(file_path)
+    assert mapped.line_count == len(expected)
+    for first in {0, 1, 63, 64, 65, len(expected) // 2, len(expected) - 1}:
+        if first >= 0:
+            assert mapped.read_lines(first, 10) == expected[first : first + 10]
+    mapped.close()
+
+
+def test_index_progress(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(mapped_file, "INDEX_CHUNK_BYTES", 1024)
+    file_path = tmp_path / "file"
+    file_path.write_bytes(b"line\n" * 1000)
+    mapped = MappedFile(file_path)
+    progress = list(mapped.index_lines())
+    assert len(progress) > 1
+    assert progress == sorted(progress)
+    assert progress[-1] == 1000
+    mapped.close()
+
+
+def test_long_lines_and_control_characters(tmp_path: Path) -> None:
+    file_path = tmp_path / "file"
+    long_line = "a" * (mapped_file.MAX_LINE_BYTES * 2)
+    file_path.write_text(f"{long_line}\nred \x1b[31mtext\ttab\r\nlast")
+    mapped = _index(file_path)
+    assert mapped.line_count == 3
+    assert mapped.read_lines(0, 3) == [
+        "a" * mapped_file.MAX_LINE_BYTES,
+        "red [31mtext\ttab",
+        "last",
+    ]
+    mapped.close()
+
+
+def test_file_truncated_after_indexing(tmp_path: Path) -> None:
+    file_path = tmp_path / "file"
+    file_path.write_bytes(b"line\n" * 1000)
+    mapped = _index(file_path)
+    file_path.write_bytes(b"")
+    assert mapped.read_lines(500, 5) == []
+    mapped.close()
+    mapped.close()
+    assert mapped.read_lines(0, 5) == []
+
+
+def test_closed_while_indexing(tmp_path: Path) -> None:
+    file_path = tmp_path / "file"
+    file_path.write_bytes(b"line\n" * 1000)
+    mapped = MappedFile(file_path)
+    progress = mapped.index_lines()
+    next(progress)
+    mapped.close()
+    assert list(progress) == []
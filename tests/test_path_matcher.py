@@ -0,0 +1,97 @@
+import re
+from pathlib import Path
+
+import pytest
+
+from chezmoi_mousse.path_matcher import PathMatcher, _translate_doublestar
+
+
+@pytest.fixture(autouse=True)
+def _restore_patterns(monkeypatch: pytest.MonkeyPatch) -> None:
+    # the patterns are class attributes, changed in place by add_patterns
+    monkeypatch.setattr(PathMatcher, "_path_patterns", PathMatcher._path_patterns[:])
+    monkeypatch.setattr(PathMatcher, "_name_patterns", PathMatcher._name_patterns[:])
+    for name in (
+        "_path_re",
+        "_name_re",
+        "_dest_dir_prefix",
+        "_ignored_paths",
+        "_ignore_re",
+        "_not_ignore_re",
+    ):
+        monkeypatch.setattr(PathMatcher, name, getattr(PathMatcher, name))
+
+
+@pytest.mark.parametrize(
+    ("pattern", "matching", "not_matching"),
+    [
+        ("*.txt", ["a.txt", ".txt"], ["dir/a.txt", "a.txt.bak"]),
+        ("**/foo", ["foo", "a/foo", "a/b/foo"], ["afoo", "foo/a"]),
+        (".config/**", [".config", ".config/a", ".config/a/b"], [".configx"]),
+        ("a/**/b", ["a/b", "a/x/b", "a/x/y/b"], ["a/xb", "b"]),
+        ("a**", ["a", "abc", "a/b/c"], ["ba"]),
+        ("file?", ["file1"], ["file", "file12", "file/"]),
+        ("[!a]b", ["bb", "cb"], ["ab", "b"]),
+        ("[ab]c", ["ac", "bc"], ["cc"]),
+        ("{x,y/*}.md", ["x.md", "y/z.md"], ["z.md", "y/a/b.md"]),
+        ("a.b+c", ["a.b+c"], ["axb+c", "a.bbc"]),
+    ],
+)
+def test_translate_doublestar(
+    pattern: str, matching: list[str], not_matching: list[str]
+) -> None:
+    regex = re.compile(_translate_doublestar(pattern))
+    for target in matching:
+        assert regex.fullmatch(target), target
+    for target in not_matching:
+        assert not regex.fullmatch(target), target
+
+
+def test_is_ignored(tmp_path: Path) -> None:
+    dest_dir = tmp_path / "home"
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    (source_dir / ".chezmoiignore").write_text(
+        "\n".join(
+            [
+                "# a comment",
+                "*.log",
+                "docs/**",
+                "!docs/keep.md",
+                '{{ if eq .chezmoi.os "darwin" }}',
+                "templated",
+                "{{ end }}",
+            ]
+        )
+    )
+    PathMatcher.set_ignored(
+        dest_dir=dest_dir, source_dir=source_dir, ignored_targets=["ignored/dir", ""]
+    )
+
+    assert PathMatcher.is_ignored(dest_dir / "ignored" / "dir")
+    assert PathMatcher.is_ignored(dest_dir / "ignored" / "dir" / "file")
+    assert PathMatcher.is_ignored(dest_dir / "error.log")
+    assert PathMatcher.is_ignored(dest_dir / "docs" / "readme.md")
+    assert not PathMatcher.is_ignored(dest_dir / "docs" / "keep.md")
+    assert not PathMatcher.is_ignored(dest_dir / "dir" / "error.log")
+    # lines in template blocks depend on the template data
+    assert not PathMatcher.is_ignored(dest_dir / "templated")
+    assert not PathMatcher.is_ignored(dest_dir / "ignored")
+    assert not PathMatcher.is_ignored(tmp_path / "error.log")
+
+
+def test_unwanted_paths(tmp_path: Path) -> None:
+    assert PathMatcher.is_unwanted_dir_path(tmp_path / "node_modules")
+    assert PathMatcher.is_unwanted_dir_path(tmp_path / "Cache")
+    assert PathMatcher.is_unwanted_dir_path(tmp_path / "cache" / "dir")
+    assert not PathMatcher.is_unwanted_dir_path(tmp_path / "precached")
+    assert PathMatcher.is_unwanted_file_path(tmp_path / "id_rsa")
+    assert PathMatcher.is_unwanted_file_path(tmp_path / "archive.7z")
+    assert not PathMatcher.is_unwanted_file_path(tmp_path / "dot_bashrc")
+
+
+def test_add_patterns(tmp_path: Path) -> None:
+    PathMatcher.add_patterns(["*.swp", "", "build/out*"])
+    assert PathMatcher.is_unwanted_file_path(tmp_path / "file.swp")
+    assert PathMatcher.is_unwanted_file_path(tmp_path / "build" / "output")
+    assert not PathMatcher.is_unwanted_file_path(tmp_path / "out")
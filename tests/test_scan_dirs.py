@@ -0,0 +1,39 @@
+from pathlib import Path
+
+from chezmoi_mousse.functions import CheckPath
+from chezmoi_mousse.scan_columns import ScanDirColumns
+from chezmoi_mousse.str_enums import PathKind
+
+
+def test_scan_dirs_yields_each_dir(tmp_path: Path) -> None:
+    dir_paths = [tmp_path / f"dir_{i}" for i in range(20)]
+    for i, dir_path in enumerate(dir_paths):
+        dir_path.mkdir()
+        for j in range(i):
+            (dir_path / f"file_{j}").write_text("text\n")
+
+    results = dict(CheckPath.scan_dirs(dir_paths))
+
+    assert results.keys() == set(dir_paths)
+    for i, dir_path in enumerate(dir_paths):
+        result = results[dir_path]
+        assert isinstance(result, ScanDirColumns)
+        assert sorted(item.name for item in result) == sorted(
+            f"file_{j}" for j in range(i)
+        )
+
+
+def test_scan_dirs_missing_managed_dir(tmp_path: Path) -> None:
+    missing = tmp_path / "missing"
+    results = dict(CheckPath.scan_dirs([missing], managed_dir=True))
+    assert results == {missing: PathKind.man_dir_not_exists}
+
+
+def test_scan_dirs_stopped_early(tmp_path: Path) -> None:
+    dir_paths = [tmp_path / f"dir_{i}" for i in range(50)]
+    for dir_path in dir_paths:
+        dir_path.mkdir()
+    scans = CheckPath.scan_dirs(dir_paths)
+    first_dir, _ = next(scans)
+    scans.close()  # cancels the scans which didn't start yet
+    assert first_dir in dir_paths
@@ -0,0 +1,95 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from chezmoi_mousse.source_state import SourceState, _git_dirs
+
+
+@pytest.fixture
+def git_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    # the fingerprint is class state, each test starts without one
+    for name in ("_dir_mtimes", "_files_by_dir"):
+        monkeypatch.setattr(SourceState, name, {})
+    monkeypatch.setattr(SourceState, "cache_clears", [])
+    for name in (
+        "generation",
+        "_source_dir",
+        "_git_dir",
+        "_common_dir",
+        "_git_state",
+        "_walk_state",
+        "_last_walk",
+    ):
+        monkeypatch.setattr(SourceState, name, getattr(SourceState, name))
+    working_tree = tmp_path / "source"
+    git_dir = working_tree / ".git"
+    (git_dir / "refs" / "heads").mkdir(parents=True)
+    (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+    (git_dir / "refs" / "heads" / "main").write_text("a" * 40 + "\n")
+    (working_tree / "dot_bashrc").write_text("bashrc\n")
+    (working_tree / "private_dot_config").mkdir()
+    (working_tree / "private_dot_config" / "file").write_text("config\n")
+    SourceState.set_dirs(source_dir=working_tree, working_tree=working_tree)
+    return git_dir
+
+
+def _touch_later(path: Path) -> None:
+    # a later mtime, whatever the timestamp resolution of the file system
+    mtime_ns = path.stat().st_mtime_ns + 10**9
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_unchanged_source(git_dir: Path) -> None:
+    assert not SourceState.check(full=True)  # the initial fingerprint
+    assert not SourceState.check(full=True)
+    assert not SourceState.check()
+
+
+def test_file_edited_in_place(git_dir: Path) -> None:
+    cleared: list[bool] = []
+    SourceState.cache_clears.append(lambda: cleared.append(True))
+    SourceState.check(full=True)
+    generation = SourceState.generation
+    nested_file = git_dir.parent / "private_dot_config" / "file"
+    nested_file.write_text("changed\n")
+    _touch_later(nested_file)
+    # the source dir is only walked every WALK_INTERVAL without a full check
+    assert not SourceState.check()
+    assert SourceState.check(full=True)
+    assert SourceState.generation == generation + 1
+    assert cleared == [True]
+
+
+def test_file_added(git_dir: Path) -> None:
+    SourceState.check(full=True)
+    (git_dir.parent / "dot_zshrc").write_text("zshrc\n")
+    _touch_later(git_dir.parent)
+    assert SourceState.check(full=True)
+
+
+def test_git_head_moved(git_dir: Path) -> None:
+    SourceState.check(full=True)
+    (git_dir / "refs" / "heads" / "main").write_text("b" * 40 + "\n")
+    assert SourceState.check()
+    assert not SourceState.check()
+
+
+def test_git_index_changed(git_dir: Path) -> None:
+    (git_dir / "index").write_bytes(b"index")
+    SourceState.check(full=True)
+    _touch_later(git_dir / "index")
+    assert SourceState.check()
+
+
+def test_git_dirs_of_worktree(tmp_path: Path) -> None:
+    main_git_dir = tmp_path / "main" / ".git"
+    worktree_git_dir = main_git_dir / "worktrees" / "wt"
+    worktree_git_dir.mkdir(parents=True)
+    (worktree_git_dir / "commondir").write_text("../..\n")
+    working_tree = tmp_path / "wt"
+    working_tree.mkdir()
+    (working_tree / ".git").write_text(f"gitdir: {worktree_git_dir}\n")
+    assert _git_dirs(working_tree) == (worktree_git_dir, main_git_dir)
+    assert _git_dirs(tmp_path / "main") == (main_git_dir, main_git_dir)
+    assert _git_dirs(tmp_path / "not_a_repo") is None
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from chezmoi_mousse.task_graph import TaskGraph
+
+
+def _noop() -> None:
+    pass
+
+
+def test_cycle_is_rejected() -> None:
+    graph = TaskGraph()
+    graph.add("a", _noop)
+    graph.add("b", _noop, requires=["a", "d"])
+    graph.add("c", _noop, requires=["b"])
+    graph.add("d", _noop, requires=["c"])
+    with pytest.raises(ValueError, match="cyclic requirements: b, c, d"):
+        asyncio.run(graph.run())
+
+
+def test_unknown_requirement_is_rejected() -> None:
+    graph = TaskGraph()
+    graph.add("a", _noop, requires=["missing"])
+    with pytest.raises(ValueError, match="requires unknown 'missing'"):
+        asyncio.run(graph.run())
+
+
+def test_duplicate_task_is_rejected() -> None:
+    graph = TaskGraph()
+    graph.add("a", _noop)
+    with pytest.raises(ValueError, match="already added"):
+        graph.add("a", _noop)
+
+
+def test_run_order_and_results() -> None:
+    order: list[str] = []
+    results: dict[str, object] = {}
+
+    def task(name: str) -> str:
+        order.append(name)
+        return name.upper()
+
+    async def on_loop() -> str:
+        order.append("on_loop")
+        return "ON_LOOP"
+
+    graph = TaskGraph()
+    graph.add("c", lambda: task("c"), requires=["a", "b"])
+    graph.add("a", lambda: task("a"))
+    graph.add("b", lambda: task("b"), requires=["a"])
+    graph.add("on_loop", on_loop, requires=["c"], thread=False)
+    asyncio.run(graph.run(on_done=results.__setitem__))
+    assert order == ["a", "b", "c", "on_loop"]
+    assert results == {"a": "A", "b": "B", "c": "C", "on_loop": "ON_LOOP"}
+
+
+def test_max_concurrent() -> None:
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def task() -> None:
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+
+    graph = TaskGraph(max_concurrent=2)
+    for i in range(6):
+        graph.add(f"task_{i}", task)
+    asyncio.run(graph.run())
+    assert max_running == 2
+
+
+def test_critical_path() -> None:
+    graph = TaskGraph()
+    assert graph.critical_path() == []
+    graph.add("fast", lambda: time.sleep(0.01))
+    graph.add("slow", lambda: time.sleep(0.1))
+    graph.add("after_both", _noop, requires=["fast", "slow"])
+    graph.add("independent", lambda: time.sleep(0.02))
+    asyncio.run(graph.run())
+    assert graph.critical_path() == ["slow", "after_both"]
+    assert graph.durations["slow"] >= 0.1